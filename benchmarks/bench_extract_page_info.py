@@ -0,0 +1,105 @@
+"""
+Benchmark full vs targeted parsing of e3sm.org pages in the resource reviewer.
+
+Usage:
+    python -m benchmarks.bench_extract_page_info --corpus-dir DIR [--save N]
+
+`--save N` first downloads N pages listed in the e3sm.org sitemap into DIR.
+"""
+
+import argparse
+import hashlib
+import os
+from typing import List
+
+from bs4 import BeautifulSoup
+
+from benchmarks.utils import print_table, time_call
+from e3sm_comms.page_reviewer.utils_base import get_sitemap_urls
+from e3sm_comms.page_reviewer.utils_e3sm_org_page import (
+    extract_page_info,
+    extract_page_info_from_html,
+)
+from e3sm_comms.page_reviewer.utils_http import get_web_page
+from e3sm_comms.utils import IO_DIR
+
+SITEMAP_URL: str = "https://e3sm.org/sitemap_index.xml"
+
+
+def save_corpus(corpus_dir: str, num_pages: int):
+    os.makedirs(corpus_dir, exist_ok=True)
+    for url in get_sitemap_urls(SITEMAP_URL)[:num_pages]:
+        try:
+            content: bytes = get_web_page(url).content
+        except Exception as e:
+            print(f"  Could not access {url}: {e}")
+            continue
+        name: str = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        with open(os.path.join(corpus_dir, f"{name}.html"), "wb") as f:
+            f.write(content)
+
+
+def load_corpus(corpus_dir: str) -> List[bytes]:
+    corpus: List[bytes] = []
+    for filename in sorted(os.listdir(corpus_dir)):
+        if filename.endswith(".html"):
+            with open(os.path.join(corpus_dir, filename), "rb") as f:
+                corpus.append(f.read())
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--corpus-dir", default=f"{IO_DIR}/input/benchmarks/e3sm_org_pages/"
+    )
+    parser.add_argument("--save", type=int, default=0, metavar="N")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.save:
+        save_corpus(args.corpus_dir, args.save)
+    corpus: List[bytes] = load_corpus(args.corpus_dir)
+    if not corpus:
+        raise RuntimeError(f"No .html files in {args.corpus_dir}; use --save N")
+
+    # Both paths must agree before their timings mean anything.
+    for html_content in corpus:
+        full = extract_page_info(BeautifulSoup(html_content, "html.parser"))
+        if extract_page_info_from_html(html_content) != full:
+            raise RuntimeError(f"Targeted parse disagrees with full parse: {full}")
+
+    full_time: float = time_call(
+        lambda: [
+            extract_page_info(BeautifulSoup(html_content, "html.parser"))
+            for html_content in corpus
+        ],
+        args.repeat,
+    )
+    targeted_time: float = time_call(
+        lambda: [extract_page_info_from_html(html_content) for html_content in corpus],
+        args.repeat,
+    )
+    total_mb: float = sum(len(html_content) for html_content in corpus) / 1e6
+    print(f"{len(corpus)} pages, {total_mb:.1f} MB")
+    print_table(
+        ["path", "total (s)", "per page (ms)", "speedup"],
+        [
+            [
+                "full",
+                f"{full_time:.3f}",
+                f"{1000 * full_time / len(corpus):.2f}",
+                "1.0x",
+            ],
+            [
+                "targeted",
+                f"{targeted_time:.3f}",
+                f"{1000 * targeted_time / len(corpus):.2f}",
+                f"{full_time / targeted_time:.1f}x",
+            ],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark first-person detection: rewriting excluded text out of each paragraph
+vs skipping it by position with the compiled rules file.
+
+Usage:
+    python -m benchmarks.bench_first_person [--paragraphs N] [--rules-file FILE]
+
+The corpus is synthetic, so no input files or network access are needed.
+"""
+
+import argparse
+import random
+import re
+from typing import List, Set
+
+from benchmarks.utils import print_table, time_call
+from e3sm_comms.page_reviewer.utils_newsletter_reviewer import (
+    FIRST_PERSON_TERMS,
+    find_first_person_phrases,
+    load_context_exclusions,
+)
+
+HEROIC_BUG_FIXES: str = (
+    "Bugs are an inevitable part of any complex software project, and E3SM is no exception. A lot of time goes into finding and fixing bugs, the resulting impacts can rival major parameterization changes, but these efforts and their impacts frequently go unreported. Heroic Bug Fixes is a recurring column that celebrates the critical yet often overlooked work of debugging. We hope that by shining a well-deserved spotlight on this critical work we can inspire further debugging efforts across the community and provide the broader E3SM community with timely information about changes which could aid their own development and investigations."
+)
+WORDS: List[str] = (
+    "the model simulates ocean ice atmosphere land coupled resolution E3SM "
+    "we our us I my results show that improved bias precipitation"
+).split()
+PHRASES: List[str] = [
+    "the US Department of Energy",
+    "over the contiguous US",
+    "in Part I of the study",
+    "parallel I/O performance",
+]
+
+
+def generate_corpus(num_paragraphs: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    corpus: List[str] = []
+    for i in range(num_paragraphs):
+        sentences: List[str] = []
+        for _ in range(rng.randint(2, 6)):
+            words: List[str] = rng.choices(WORDS, k=rng.randint(8, 25))
+            if rng.random() < 0.3:
+                words.insert(rng.randrange(len(words)), rng.choice(PHRASES))
+            sentences.append(" ".join(words).capitalize() + ".")
+        if i % 50 == 0:
+            sentences.insert(0, HEROIC_BUG_FIXES)
+        corpus.append(" ".join(sentences))
+    return corpus
+
+
+def find_first_person_phrases_by_rewriting(paragraphs: List[str]) -> List[str]:
+    # The previous approach: rewrite excluded text, then tokenize what's left.
+    found_phrases: List[str] = []
+    for paragraph in paragraphs:
+        text: str = re.sub(HEROIC_BUG_FIXES, "", paragraph)
+        text = re.sub("contiguous US", "contiguous U.S.", text)
+        text = re.sub("US Department", "U.S. Department", text)
+        text = re.sub("Part I", "Part One", text)
+        text = re.sub("I/O", "input/output", text)
+        text = " ".join(text.split())
+        tokens: List[str] = re.findall(r"\w+(?:'\w+)?(?:\.\w+)*|[^\w\s]", text)
+        found_phrases += get_terms_in_context(tokens, FIRST_PERSON_TERMS)
+    return found_phrases
+
+
+def get_terms_in_context(tokens: List[str], term_set: Set[str]) -> List[str]:
+    found_phrases: List[str] = []
+    for idx, token in enumerate(tokens):
+        if token.lower() in term_set:
+            before = tokens[idx - 1] if idx > 0 else ""
+            after = tokens[idx + 1] if idx < len(tokens) - 1 else ""
+            found_phrases.append(f"{before} {token} {after}".strip())
+    return found_phrases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paragraphs", type=int, default=10000)
+    parser.add_argument("--rules-file", default="")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus: List[str] = generate_corpus(args.paragraphs)
+    exclusion_pattern: re.Pattern = load_context_exclusions(args.rules_file)
+
+    # Context wording differs ("U.S" vs "US"), but the same terms must be found.
+    rewritten: List[str] = find_first_person_phrases_by_rewriting(corpus)
+    skipped: List[str] = find_first_person_phrases(corpus, exclusion_pattern)
+    if len(rewritten) != len(skipped):
+        raise RuntimeError(
+            f"Found {len(skipped)} phrases with skip spans, {len(rewritten)} by rewriting"
+        )
+
+    rewrite_time: float = time_call(
+        lambda: find_first_person_phrases_by_rewriting(corpus), args.repeat
+    )
+    skip_time: float = time_call(
+        lambda: find_first_person_phrases(corpus, exclusion_pattern), args.repeat
+    )
+    total_mb: float = sum(len(paragraph) for paragraph in corpus) / 1e6
+    print(f"{len(corpus)} paragraphs, {total_mb:.1f} MB, {len(skipped)} phrases")
+    print_table(
+        ["path", "total (s)", "per paragraph (us)", "speedup"],
+        [
+            [
+                "rewrite",
+                f"{rewrite_time:.3f}",
+                f"{1e6 * rewrite_time / len(corpus):.1f}",
+                "1.0x",
+            ],
+            [
+                "skip spans",
+                f"{skip_time:.3f}",
+                f"{1e6 * skip_time / len(corpus):.1f}",
+                f"{rewrite_time / skip_time:.1f}x",
+            ],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
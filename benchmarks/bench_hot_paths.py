@@ -0,0 +1,174 @@
+"""
+Benchmark the CPU hot paths in page_reviewer over small, typical and very large pages.
+
+Usage:
+    python -m benchmarks.bench_hot_paths [--save FILE] [--compare BASELINE]
+        [--max-ratio R] [--sizes small typical large] [--repeat N]
+
+`--save` stores the results as JSON, e.g. one file per commit.
+`--compare` prints the change against a saved file and exits with status 1
+if any benchmark is more than `--max-ratio` times slower than in it.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.fake_confluence import ROOT_PAGE_ID, SyntheticSpace
+from benchmarks.utils import print_table, time_per_call
+from e3sm_comms.page_reviewer.utils_base import (
+    ParsedHTML,
+    find_sensitive_terms,
+    map_confluence_to_e3sm,
+    split_html,
+)
+from e3sm_comms.page_reviewer.utils_newsletter_reviewer import (
+    find_first_person_phrases,
+    get_acronyms,
+    get_image_mention_frequencies,
+)
+from e3sm_comms.page_reviewer.utils_storage_format import split_storage_format
+from e3sm_comms.page_reviewer.utils_website_reviewer import (
+    extract_confluence_table_to_dict,
+)
+
+# Page body size, in KB
+SIZES: Dict[str, int] = {"small": 1, "typical": 16, "large": 1024}
+NUM_SENSITIVE_TERMS: int = 200
+
+
+def get_sensitive_terms() -> List[str]:
+    # A few terms that occur in the generated pages, padded out with ones that don't
+    terms: List[str] = ["climate", "energy", "bias", "water cycle"]
+    terms += [f"synthetic term {i}" for i in range(NUM_SENSITIVE_TERMS - len(terms))]
+    return sorted(terms)
+
+
+def get_page_urls(num_urls: int) -> List[Tuple[str, str]]:
+    # (Confluence URL, page title) pairs, as seen by map_confluence_to_e3sm
+    return [
+        (
+            f"https://e3sm.atlassian.net/wiki/spaces/EPWCD/pages/{ROOT_PAGE_ID + i}",
+            f"E3SM v{i % 4}.{i % 10} Release: Ocean's Bias - Part {i}",
+        )
+        for i in range(num_urls)
+    ]
+
+
+def get_benchmarks(size_kb: int) -> Dict[str, Callable[[], object]]:
+    space = SyntheticSpace(1, body_kb=size_kb)
+    raw_html: str = space.get_body(1)
+    raw_xml: str = space.get_storage_body(1)
+    main_html, metadata_html = split_html(raw_html)
+    if metadata_html is None:
+        raise RuntimeError("Generated page has no metadata table")
+    terms: List[str] = get_sensitive_terms()
+    # Roughly one URL per KB, so the larger sizes map more URLs
+    urls: List[Tuple[str, str]] = get_page_urls(size_kb)
+    return {
+        "ParsedHTML": lambda: ParsedHTML(raw_html),
+        "split_html": lambda: split_html(raw_html),
+        "split_storage_format": lambda: split_storage_format(
+            raw_xml, str(ROOT_PAGE_ID + 1)
+        ),
+        "find_sensitive_terms": lambda: find_sensitive_terms(
+            terms, main_html.text_lowercase
+        ),
+        "find_first_person_phrases": lambda: find_first_person_phrases(
+            main_html.paragraphs
+        ),
+        "get_acronyms": lambda: get_acronyms(main_html.text),
+        "get_image_mention_frequencies": lambda: get_image_mention_frequencies(
+            main_html.text_lowercase, main_html.num_imgs
+        ),
+        "extract_confluence_table_to_dict": lambda: extract_confluence_table_to_dict(
+            metadata_html
+        ),
+        "map_confluence_to_e3sm": lambda: [
+            map_confluence_to_e3sm(url, title) for url, title in urls
+        ],
+    }
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(results: Dict[str, float], baseline_file: str, max_ratio: float) -> bool:
+    # Print each benchmark against the baseline. Return True if none regressed.
+    with open(baseline_file, "r", encoding="utf-8") as f:
+        baseline: Dict = json.load(f)
+    print(f"Compared to {baseline_file} (commit {baseline.get('commit') or '?'}):")
+    rows: List[List[str]] = []
+    regressions: List[str] = []
+    for name, seconds in results.items():
+        if name not in baseline["results"]:
+            continue
+        ratio: float = seconds / baseline["results"][name]
+        status: str = "REGRESSION" if ratio > max_ratio else ""
+        if status:
+            regressions.append(name)
+        rows.append(
+            [
+                name,
+                f"{1e6 * baseline['results'][name]:.1f}",
+                f"{1e6 * seconds:.1f}",
+                f"{ratio:.2f}x",
+                status,
+            ]
+        )
+    print_table(["benchmark", "baseline (us)", "now (us)", "ratio", ""], rows)
+    if regressions:
+        print(f"{len(regressions)} benchmarks are over {max_ratio}x slower")
+    return not regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", default="", metavar="FILE")
+    parser.add_argument("--compare", default="", metavar="BASELINE")
+    parser.add_argument("--max-ratio", type=float, default=1.5)
+    args = parser.parse_args()
+
+    # name/size -> best seconds per call
+    results: Dict[str, float] = {}
+    for size in args.sizes:
+        for name, func in get_benchmarks(SIZES[size]).items():
+            results[f"{name}/{size}"] = time_per_call(func, args.repeat)
+    print_table(
+        ["benchmark", "per call (us)"],
+        [[name, f"{1e6 * seconds:.1f}"] for name, seconds in results.items()],
+    )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "commit": get_commit(),
+                    "python": platform.python_version(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+    if args.compare and not compare(results, args.compare, args.max_ratio):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
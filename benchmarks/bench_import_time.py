@@ -0,0 +1,101 @@
+"""
+Time how long each console script in pyproject.toml takes to import its entry point,
+in a fresh interpreter each time, against a bare interpreter.
+
+Usage:
+    python -m benchmarks.bench_import_time [--repeat N] [--max-ms MS]
+
+Exits with status 1 if any entry point's import takes more than `--max-ms`
+on top of the bare interpreter.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+import tomllib
+from typing import Dict, List, Set, Tuple
+
+from benchmarks.utils import print_table
+
+# Packages that should only be imported on the code paths that need them
+HEAVY_PACKAGES: List[str] = ["requests", "urllib3", "bs4", "PIL", "pytz"]
+PYPROJECT: str = os.path.join(os.path.dirname(__file__), "..", "pyproject.toml")
+
+
+def get_console_scripts() -> Dict[str, str]:
+    # script name -> module of its entry point
+    with open(PYPROJECT, "rb") as f:
+        scripts: Dict[str, str] = tomllib.load(f)["project"]["scripts"]
+    return {name: target.split(":")[0] for name, target in scripts.items()}
+
+
+def time_import(code: str, repeat: int) -> float:
+    # Best wall time, in seconds, to start an interpreter and run `code`
+    best: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def get_imported_packages(module: str) -> Tuple[float, Set[str]]:
+    # (cumulative import time of `module` in seconds, top-level packages it imported)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    packages: Set[str] = set()
+    seconds: float = 0.0
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if not match:
+            continue
+        packages.add(match.group(3).split(".")[0])
+        if match.group(3) == module:
+            seconds = int(match.group(1)) / 1e6
+    return seconds, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    bare: float = time_import("pass", args.repeat)
+    rows: List[List[str]] = [["(bare interpreter)", "", f"{1000 * bare:.0f}", "", ""]]
+    too_slow: List[str] = []
+    for name, module in get_console_scripts().items():
+        wall: float = time_import(f"import {module}", args.repeat)
+        import_seconds, packages = get_imported_packages(module)
+        overhead_ms: float = 1000 * (wall - bare)
+        if overhead_ms > args.max_ms:
+            too_slow.append(name)
+        rows.append(
+            [
+                name,
+                f"{1000 * import_seconds:.0f}",
+                f"{1000 * wall:.0f}",
+                f"{overhead_ms:+.0f}",
+                " ".join(p for p in HEAVY_PACKAGES if p in packages),
+            ]
+        )
+    print_table(
+        ["script", "import (ms)", "wall (ms)", "vs bare (ms)", "heavy packages"],
+        rows,
+    )
+    if too_slow:
+        print(f"Over {args.max_ms} ms slower than a bare interpreter: {too_slow}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Track memory over a newsletter-mode review of many synthetic stories, served by
+benchmarks/fake_confluence.py. Newsletter mode keeps every page until the review
+table is written, so what each page retains bounds the run's memory.
+
+"retained" is what the pages kept so far (their findings, e.g. every first-person
+phrase, which the synthetic text is full of); "working set" is the peak above that,
+from the stories being processed, and should stay flat as the page count grows.
+
+Usage:
+    python -m benchmarks.bench_memory [--pages N] [--body-kb N] [--samples N]
+        [--max-kb-per-page KB]
+
+Exits with status 1 if the pages retain more than `--max-kb-per-page` each, on average.
+"""
+
+import argparse
+import contextlib
+import gc
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+from benchmarks.bench_walk import CONFLUENCE_URL, get_free_port, wait_for_port
+from benchmarks.fake_confluence import ROOT_PAGE_ID, SyntheticSpace, serve
+from benchmarks.utils import print_table
+from e3sm_comms.page_reviewer.confluence_page_reviewer import extract_data_from_stories
+from e3sm_comms.page_reviewer.utils_base import (
+    Config,
+    ConfluenceCredentials,
+    ConfluencePage,
+    split_html,
+)
+from e3sm_comms.page_reviewer.utils_http import RequestScheduler, set_scheduler
+from e3sm_comms.page_reviewer.utils_newsletter_reviewer import construct_markdown_table
+
+
+def get_parse_tree_kb(body_kb: int) -> float:
+    # What one page retained when pages kept their parsed HTML
+    raw_html: str = SyntheticSpace(1, body_kb=body_kb).get_body(0)
+    gc.collect()
+    start: int = tracemalloc.get_traced_memory()[0]
+    parsed = split_html(raw_html)
+    size: int = tracemalloc.get_traced_memory()[0] - start
+    del parsed
+    return size / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, default=10000)
+    parser.add_argument("--body-kb", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--max-kb-per-page", type=float, default=32.0)
+    args = parser.parse_args()
+
+    port: int = get_free_port()
+    server = multiprocessing.Process(
+        target=serve, args=(port, args.pages, 10, args.body_kb), daemon=True
+    )
+    server.start()
+    tracemalloc.start()
+    devnull = open(os.devnull, "w")
+    try:
+        wait_for_port(port)
+        parse_tree_kb: float = get_parse_tree_kb(args.body_kb)
+        with tempfile.TemporaryDirectory() as output_dir:
+            config = Config("newsletter")
+            config.output_dir = f"{output_dir}/"
+            config.requested_output = ["newsletter_review_table"]
+            config.list_sensitive_terms = ["bias", "climate", "water cycle"]
+            set_scheduler(
+                RequestScheduler(
+                    requests_per_second=1e6,
+                    burst=1000,
+                    url_rewrites={CONFLUENCE_URL: f"http://127.0.0.1:{port}"},
+                )
+            )
+            credentials = ConfluenceCredentials(prompt=False)
+            page_list: List[ConfluencePage] = []
+            rows: List[List[str]] = []
+            gc.collect()
+            baseline: int = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            start: float = time.perf_counter()
+            batch_size: int = max(1, args.pages // args.samples)
+            for first in range(0, args.pages, batch_size):
+                batch: List[ConfluencePage] = [
+                    ConfluencePage(
+                        f"{CONFLUENCE_URL}/wiki/spaces/EPWCD/pages/{ROOT_PAGE_ID + i}/"
+                    )
+                    for i in range(first, min(args.pages, first + batch_size))
+                ]
+                for page in batch:
+                    page.review_status = "Not started"
+                # Each story prints a few lines, which would swamp the results
+                with contextlib.redirect_stdout(devnull):
+                    extract_data_from_stories(config, credentials, batch)
+                page_list += batch
+                gc.collect()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                rows.append(
+                    [
+                        str(len(page_list)),
+                        f"{(current - baseline) / 1e6:.1f}",
+                        f"{(peak - current) / 1e6:.1f}",
+                        f"{time.perf_counter() - start:.0f}",
+                    ]
+                )
+            construct_markdown_table(config, page_list, {})
+    finally:
+        devnull.close()
+        server.terminate()
+        server.join()
+    print_table(["pages", "retained (MB)", "working set (MB)", "elapsed (s)"], rows)
+    kb_per_page: float = (current - baseline) / 1024 / len(page_list)
+    print(
+        f"Retained {kb_per_page:.1f} KB per page "
+        f"(parsed HTML alone would be {parse_tree_kb:.0f} KB per page)"
+    )
+    if kb_per_page > args.max_kb_per_page:
+        print(f"Over the {args.max_kb_per_page} KB per page limit")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark walk_page_and_child_pages (website mode) against benchmarks/fake_confluence.py.
+
+Usage:
+    python -m benchmarks.bench_walk [--sizes 1000 10000 50000] [--fan-out N]
+        [--body-kb N] [--latency-ms MS] [--error-rate P] [--max-rps N]
+        [--max-concurrency N] [--fetch-workers N] [--parse-workers N]
+
+Each size runs against a fresh fake server in a separate process,
+so the server doesn't compete with the crawler for the GIL.
+Compare `--fetch-workers 0 --parse-workers 0` (one page at a time) with the defaults
+to see what the fetch/parse pipeline gains.
+"""
+
+import argparse
+import contextlib
+import multiprocessing
+import os
+import socket
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.fake_confluence import ROOT_PAGE_ID, serve
+from benchmarks.utils import print_table
+from e3sm_comms.page_reviewer.confluence_page_reviewer import (
+    PageParser,
+    walk_page_and_child_pages,
+)
+from e3sm_comms.page_reviewer.utils_base import Config, ConfluenceCredentials
+from e3sm_comms.page_reviewer.utils_http import RequestScheduler, set_scheduler
+from e3sm_comms.page_reviewer.utils_metrics import METRICS
+
+CONFLUENCE_URL: str = "https://e3sm.atlassian.net"
+ROOT_PAGE_URL: str = f"{CONFLUENCE_URL}/wiki/spaces/EPWCD/pages/{ROOT_PAGE_ID}/"
+
+
+def get_free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10.0):
+    deadline: float = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Fake Confluence server did not start on port {port}")
+
+
+def run_walk(args: argparse.Namespace, num_pages: int) -> Dict:
+    port: int = get_free_port()
+    server = multiprocessing.Process(
+        target=serve,
+        args=(
+            port,
+            num_pages,
+            args.fan_out,
+            args.body_kb,
+            args.latency_ms,
+            args.error_rate,
+            args.max_rps,
+        ),
+        daemon=True,
+    )
+    server.start()
+    try:
+        wait_for_port(port)
+        with tempfile.TemporaryDirectory() as output_dir:
+            config = Config("website")
+            config.output_dir = f"{output_dir}/"
+            config.requested_output = ["hierarchical_outline", "missing_metadata"]
+            config.max_fetch_workers = args.fetch_workers
+            config.max_parse_workers = args.parse_workers
+            set_scheduler(
+                RequestScheduler(
+                    requests_per_second=1e6,
+                    burst=1000,
+                    max_concurrency_per_host=args.max_concurrency,
+                    url_rewrites={CONFLUENCE_URL: f"http://127.0.0.1:{port}"},
+                )
+            )
+            METRICS.enable()
+            start: float = time.perf_counter()
+            # Each page prints a line, which would swamp the results
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                with PageParser(config) as page_parser:
+                    walk_page_and_child_pages(
+                        config,
+                        ConfluenceCredentials(prompt=False),
+                        ROOT_PAGE_URL,
+                        parser=page_parser,
+                    )
+            seconds: float = time.perf_counter() - start
+            with open(f"{output_dir}/hierarchical_outline.txt", encoding="utf-8") as f:
+                num_walked: int = sum(1 for _ in f)
+    finally:
+        server.terminate()
+        server.join()
+    if num_walked != num_pages:
+        raise RuntimeError(f"Walked {num_walked} of {num_pages} pages")
+    summary: Dict = METRICS.to_dict()
+    statuses: Dict[str, int] = {}
+    for stats in summary["hosts"].values():
+        for status, count in stats["status_counts"].items():
+            statuses[status] = statuses.get(status, 0) + count
+    return {
+        "pages": num_pages,
+        "seconds": seconds,
+        "requests": sum(statuses.values()),
+        "rate_limited": statuses.get("429", 0),
+        "stages": summary["stages"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    # Keep fan-out above 1: the walk recurses once per level.
+    parser.add_argument("--fan-out", type=int, default=10)
+    parser.add_argument("--body-kb", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument(
+        "--fetch-workers", type=int, default=Config("website").max_fetch_workers
+    )
+    parser.add_argument(
+        "--parse-workers", type=int, default=Config("website").max_parse_workers
+    )
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    for num_pages in args.sizes:
+        print(f"Walking {num_pages} pages...")
+        results.append(run_walk(args, num_pages))
+    print_table(
+        ["pages", "total (s)", "pages/s", "requests", "429s", "top stages (s)"],
+        [
+            [
+                str(result["pages"]),
+                f"{result['seconds']:.1f}",
+                f"{result['pages'] / result['seconds']:.0f}",
+                str(result["requests"]),
+                str(result["rate_limited"]),
+                " ".join(
+                    f"{name}={stage['seconds']:.1f}"
+                    for name, stage in list(result["stages"].items())[:3]
+                ),
+            ]
+            for result in results
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
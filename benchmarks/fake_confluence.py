@@ -0,0 +1,677 @@
+"""
+Local stand-in for the subset of the Confluence REST API used by the reviewers.
+
+Serves a synthetic page tree:
+- /wiki/rest/api/content/{id}?expand=...
+- /wiki/rest/api/content/{id}/child/page
+- /wiki/rest/api/content/{id}/child/comment
+- /wiki/rest/api/content/{id}/child/attachment
+- /wiki/rest/api/content/{id}/version
+- /wiki/rest/api/content/{id}/version/{number}?expand=content.body.view (or .storage)
+- /wiki/rest/api/content/search?cql=...
+- /wiki/download/attachments/{id}/{filename}
+
+To simulate changes while a reviewer watches the space:
+- POST /_fake/edit/{id} adds a version of the page, with different text
+- POST /_fake/comment/{id} adds a comment to the page
+
+Usage:
+    python -m benchmarks.fake_confluence [--pages N] [--fan-out N] [--body-kb N]
+        [--latency-ms MS] [--error-rate P] [--max-rps N] [--port PORT]
+        [--export FILE]
+
+Point the reviewers at it with
+Config.url_rewrites = {"https://e3sm.atlassian.net": "http://127.0.0.1:PORT"}.
+The root page is https://e3sm.atlassian.net/wiki/spaces/EPWCD/pages/1000000000/
+
+With --export, writes the same space as a Confluence XML space export instead,
+for Config.confluence_export_file.
+"""
+
+import argparse
+import json
+import random
+import re
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+ROOT_PAGE_ID: int = 1000000000
+COMMENT_ID_OFFSET: int = 2000000000
+COMMENTS_PER_PAGE: int = 3
+# Every 10th page (index 3, 13, ...) has a long review thread, spanning several responses
+LONG_THREAD_COMMENTS: int = 40
+# Confluence's default page size for child and search results
+DEFAULT_LIMIT: int = 25
+MAX_LIMIT: int = 250
+LAST_MODIFIED: datetime = datetime(2026, 1, 1, tzinfo=timezone.utc)
+WORDS: List[str] = (
+    "the model simulates ocean ice atmosphere land coupled resolution E3SM "
+    "we our results show improved bias precipitation climate energy water cycle "
+    "DOE simulation campaign figure data analysis version release"
+).split()
+
+
+# Classes #####################################################################
+class SyntheticSpace(object):
+    """
+    A tree of `num_pages` pages, numbered breadth-first: the children of page i
+    are pages i * fan_out + 1 through i * fan_out + fan_out.
+
+    Everything is derived from the page index, so nothing is stored per page,
+    except for edits and comments added while serving.
+    """
+
+    def __init__(
+        self, num_pages: int, fan_out: int = 10, body_kb: int = 4, seed: int = 0
+    ):
+        self.num_pages: int = num_pages
+        self.fan_out: int = fan_out
+        self.body_kb: int = body_kb
+        self.seed: int = seed
+        # index -> times of edits, and of added comments
+        self.edits: Dict[int, List[datetime]] = {}
+        self.added_comments: Dict[int, List[datetime]] = {}
+
+    def edit(self, index: int):
+        self.edits.setdefault(index, []).append(datetime.now(timezone.utc))
+
+    def add_comment(self, index: int):
+        self.added_comments.setdefault(index, []).append(datetime.now(timezone.utc))
+
+    def get_index(self, page_id: str) -> Optional[int]:
+        if not page_id.isdigit():
+            return None
+        index: int = int(page_id) - ROOT_PAGE_ID
+        return index if 0 <= index < self.num_pages else None
+
+    def get_children(self, index: int) -> List[int]:
+        first: int = index * self.fan_out + 1
+        return list(range(first, min(self.num_pages, first + self.fan_out)))
+
+    def get_ancestors(self, index: int) -> List[int]:
+        ancestors: List[int] = []
+        while index > 0:
+            index = (index - 1) // self.fan_out
+            ancestors.insert(0, index)
+        return ancestors
+
+    def get_descendants(self, index: int) -> List[int]:
+        # Breadth-first; the list doubles as the queue
+        descendants: List[int] = self.get_children(index)
+        i: int = 0
+        while i < len(descendants):
+            descendants += self.get_children(descendants[i])
+            i += 1
+        return descendants
+
+    def get_original_version(self, index: int) -> int:
+        return 1 + index % 7
+
+    def get_version(self, index: int) -> int:
+        return self.get_original_version(index) + len(self.edits.get(index, []))
+
+    def get_last_modified(self, index: int) -> datetime:
+        if index in self.edits:
+            return self.edits[index][-1]
+        return LAST_MODIFIED - timedelta(days=index % 365, minutes=index % 1440)
+
+    def get_content(self, index: int, expand: Set[str]) -> Dict:
+        page_id: str = str(ROOT_PAGE_ID + index)
+        title: str = f"Synthetic Page {index}"
+        content: Dict = {
+            "id": page_id,
+            "type": "page",
+            "status": "current",
+            "title": title,
+            "space": {"key": "EPWCD"},
+            "version": {
+                "number": self.get_version(index),
+                "when": self.get_last_modified(index).isoformat(),
+            },
+            "_links": {
+                "webui": f"/spaces/EPWCD/pages/{page_id}/{title.replace(' ', '+')}"
+            },
+        }
+        body: Dict = {}
+        if "body.view" in expand:
+            body["view"] = {"value": self.get_body(index), "representation": "view"}
+        if "body.storage" in expand:
+            body["storage"] = {
+                "value": self.get_storage_body(index),
+                "representation": "storage",
+            }
+        if body:
+            content["body"] = body
+        if "ancestors" in expand:
+            content["ancestors"] = [
+                {"id": str(ROOT_PAGE_ID + i), "type": "page"}
+                for i in self.get_ancestors(index)
+            ]
+        return content
+
+    def get_versions(self, index: int) -> List[Dict]:
+        # Newest first, as Confluence lists them
+        original: int = self.get_original_version(index)
+        edits: List[datetime] = self.edits.get(index, [])
+        return [
+            {
+                "number": number,
+                "when": (
+                    edits[number - original - 1]
+                    if number > original
+                    else LAST_MODIFIED
+                    - timedelta(days=index % 365, minutes=index % 1440)
+                    - timedelta(days=7 * (7 - number))
+                ).isoformat(),
+            }
+            for number in range(self.get_version(index), 0, -1)
+        ]
+
+    def get_body(self, index: int, version: int = 0) -> str:
+        # Versions other than the original current version (older ones, and edits) have different text
+        rng = random.Random(self.seed * 1000003 + index)
+        if version == 0:
+            version = self.get_version(index)
+        if version != self.get_original_version(index):
+            rng = random.Random((self.seed * 1000003 + index) * 8 + version)
+        page_id: str = str(ROOT_PAGE_ID + index)
+        parts: List[str] = [f"<h3>Section {index}</h3>"]
+        size: int = 0
+        while size < self.body_kb * 1024:
+            paragraph: str = " ".join(rng.choices(WORDS, k=rng.randint(20, 60)))
+            paragraph = paragraph.capitalize() + "."
+            if rng.random() < 0.2:
+                paragraph += (
+                    f' See <a href="https://e3sm.org/{rng.choice(WORDS)}/">more</a>.'
+                )
+            parts.append(f"<p>{paragraph}</p>")
+            size += len(parts[-1])
+        parts.append(
+            f'<p><img src="/wiki/download/attachments/{page_id}/figure.png" /></p>'
+        )
+        # Most pages end with the metadata table the website reviewer looks for
+        if index % 10 != 0:
+            parts.append(
+                "<p><span>END OF e3sm.or page</span></p>"
+                '<table class="confluenceTable"><tbody>'
+                f"<tr><th>Page Owner</th><td>Owner {index % 17}</td></tr>"
+                f"<tr><th>Sync to WordPress</th><td>{'Yes' if index % 5 == 0 else 'No'}</td></tr>"
+                "</tbody></table>"
+            )
+        return "".join(parts)
+
+    def get_storage_body(self, index: int, version: int = 0) -> str:
+        # The same page as saved: images and tables are macros, without the rendered markup
+        page_id: str = str(ROOT_PAGE_ID + index)
+        return (
+            self.get_body(index, version)
+            .replace(
+                f'<img src="/wiki/download/attachments/{page_id}/figure.png" />',
+                '<ac:image><ri:attachment ri:filename="figure.png" /></ac:image>',
+            )
+            .replace('<table class="confluenceTable">', "<table>")
+        )
+
+    def get_comments(self, index: int) -> List[Dict]:
+        comments: List[Dict] = []
+        num_comments: int = (
+            LONG_THREAD_COMMENTS if index % 10 == 3 else COMMENTS_PER_PAGE
+        )
+        added: List[datetime] = self.added_comments.get(index, [])
+        for k in range(num_comments + len(added)):
+            comment_index: int = (index + k) % 4
+            when: datetime = (
+                added[k - num_comments] if k >= num_comments else LAST_MODIFIED
+            )
+            comments.append(
+                {
+                    "id": str(COMMENT_ID_OFFSET + index * 100 + k),
+                    "type": "comment",
+                    "title": f"Re: Synthetic Page {index}",
+                    "container": {"id": str(ROOT_PAGE_ID + index), "type": "page"},
+                    "version": {"number": 1, "when": when.isoformat()},
+                    "extensions": {
+                        "location": "inline" if comment_index < 2 else "footer",
+                        "resolution": {
+                            "status": "resolved" if comment_index % 2 else "open"
+                        },
+                    },
+                }
+            )
+        return comments
+
+
+class FakeConfluenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        space: SyntheticSpace,
+        latency_ms: float = 0.0,
+        error_rate: float = 0.0,
+        max_rps: float = 0.0,
+    ):
+        super().__init__(address, FakeConfluenceHandler)
+        self.space: SyntheticSpace = space
+        self.latency_ms: float = latency_ms
+        # Fraction of requests answered with a 429, at random
+        self.error_rate: float = error_rate
+        # If set, requests beyond this many per second are answered with a 429
+        self.max_rps: float = max_rps
+        self.lock = threading.Lock()
+        self.tokens: float = max_rps
+        self.last_refill: float = time.monotonic()
+        self.request_count: int = 0
+        self.rate_limited_count: int = 0
+
+    def is_rate_limited(self) -> bool:
+        with self.lock:
+            self.request_count += 1
+            limited: bool = random.random() < self.error_rate
+            if self.max_rps and not limited:
+                now: float = time.monotonic()
+                self.tokens = min(
+                    self.max_rps,
+                    self.tokens + (now - self.last_refill) * self.max_rps,
+                )
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                else:
+                    limited = True
+            if limited:
+                self.rate_limited_count += 1
+            return limited
+
+
+class FakeConfluenceHandler(BaseHTTPRequestHandler):
+    server: FakeConfluenceServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Far too noisy at 50k pages
+
+    def do_GET(self):
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        if self.server.is_rate_limited():
+            self.send_json(
+                429,
+                {"statusCode": 429, "message": "Rate limit exceeded"},
+                {"Retry-After": "1", "X-RateLimit-Remaining": "0"},
+            )
+            return
+        parsed = urlparse(self.path)
+        query: Dict[str, List[str]] = parse_qs(parsed.query)
+        path: str = parsed.path
+        match = re.fullmatch(r"(?:/wiki)+/download/attachments/(\d+)/[^/]+", path)
+        if match:
+            if self.server.space.get_index(match.group(1)) is None:
+                self.send_not_found(path)
+            else:
+                self.send_bytes(200, make_png(1024, 768), "image/png")
+            return
+        if path == "/wiki/rest/api/content/search":
+            self.search(query)
+            return
+        match = re.fullmatch(
+            r"/wiki/rest/api/content/(\d+)(?:/child/(page|comment|attachment)|/(version)(?:/(\d+))?)?/?",
+            path,
+        )
+        index: Optional[int] = (
+            self.server.space.get_index(match.group(1)) if match else None
+        )
+        if match is None or index is None:
+            self.send_not_found(path)
+            return
+        space: SyntheticSpace = self.server.space
+        expand: Set[str] = get_expand(query)
+        child_type: Optional[str] = match.group(2)
+        if match.group(3):
+            self.get_version(index, match.group(4), query, path)
+        elif child_type is None:
+            self.send_json(200, space.get_content(index, expand))
+        elif child_type == "page":
+            children: List[Dict] = [
+                space.get_content(child, expand) for child in space.get_children(index)
+            ]
+            self.send_json(200, paginate(children, query, path))
+        elif child_type == "comment":
+            self.send_json(200, paginate(space.get_comments(index), query, path))
+        else:
+            page_id: str = str(ROOT_PAGE_ID + index)
+            attachment: Dict = {
+                "id": f"att{page_id}",
+                "type": "attachment",
+                "title": "figure.png",
+                "_links": {"download": f"/download/attachments/{page_id}/figure.png"},
+            }
+            self.send_json(200, paginate([attachment], query, path))
+
+    def do_POST(self):
+        match = re.fullmatch(r"/_fake/(edit|comment)/(\d+)/?", urlparse(self.path).path)
+        index: Optional[int] = (
+            self.server.space.get_index(match.group(2)) if match else None
+        )
+        if match is None or index is None:
+            self.send_not_found(self.path)
+            return
+        with self.server.lock:
+            if match.group(1) == "edit":
+                self.server.space.edit(index)
+            else:
+                self.server.space.add_comment(index)
+        self.send_json(200, {"id": match.group(2)})
+
+    def get_version(
+        self,
+        index: int,
+        number: Optional[str],
+        query: Dict[str, List[str]],
+        path: str,
+    ):
+        space: SyntheticSpace = self.server.space
+        versions: List[Dict] = space.get_versions(index)
+        if number is None:
+            self.send_json(200, paginate(versions, query, path))
+            return
+        if not 0 < int(number) <= space.get_version(index):
+            self.send_not_found(path)
+            return
+        version: Dict = dict(versions[space.get_version(index) - int(number)])
+        expand: Set[str] = get_expand(query)
+        if expand & {"content", "content.body.view", "content.body.storage"}:
+            content: Dict = space.get_content(index, set())
+            content["version"] = {"number": int(number), "when": version["when"]}
+            if "content.body.storage" in expand:
+                content["body"] = {
+                    "storage": {
+                        "value": space.get_storage_body(index, int(number)),
+                        "representation": "storage",
+                    }
+                }
+            else:
+                content["body"] = {
+                    "view": {
+                        "value": space.get_body(index, int(number)),
+                        "representation": "view",
+                    }
+                }
+            version["content"] = content
+        self.send_json(200, version)
+
+    def search(self, query: Dict[str, List[str]]):
+        cql: str = query.get("cql", [""])[0]
+        try:
+            results: List[Dict] = run_cql(self.server.space, cql, get_expand(query))
+        except ValueError as e:
+            self.send_json(400, {"statusCode": 400, "message": str(e)})
+            return
+        self.send_json(200, paginate(results, query, "/wiki/rest/api/content/search"))
+
+    def send_not_found(self, path: str):
+        self.send_json(404, {"statusCode": 404, "message": f"No content at {path}"})
+
+    def send_json(self, status: int, data: Dict, headers: Dict[str, str] = {}):
+        self.send_bytes(
+            status, json.dumps(data).encode("utf-8"), "application/json", headers
+        )
+
+    def send_bytes(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: Dict[str, str] = {},
+    ):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# Functions ###################################################################
+def get_expand(query: Dict[str, List[str]]) -> Set[str]:
+    # "body.view.value,version" -> {"body.view", "version"}
+    expand: Set[str] = set()
+    for value in query.get("expand", []):
+        for item in value.split(","):
+            expand.add(item.strip().removesuffix(".value"))
+    return expand
+
+
+def paginate(items: List[Dict], query: Dict[str, List[str]], path: str) -> Dict:
+    start: int = int(query.get("start", ["0"])[0])
+    limit: int = min(MAX_LIMIT, int(query.get("limit", [str(DEFAULT_LIMIT)])[0]))
+    results: List[Dict] = items[start : start + limit]
+    data: Dict = {
+        "results": results,
+        "start": start,
+        "limit": limit,
+        "size": len(results),
+        "_links": {"base": "/wiki"},
+    }
+    if start + limit < len(items):
+        next_query: str = "&".join(
+            f"{key}={value}"
+            for key, values in query.items()
+            if key not in ["start", "limit"]
+            for value in values
+        )
+        data["_links"]["next"] = (
+            f"{path.removeprefix('/wiki')}?{next_query}&start={start + limit}&limit={limit}"
+        ).replace("?&", "?")
+    return data
+
+
+def run_cql(space: SyntheticSpace, cql: str, expand: Set[str]) -> List[Dict]:
+    """
+    Supports clauses joined by "and":
+    type = page|comment, space = EPWCD, id = N, id in (N, ...), ancestor = N,
+    ancestor in (N, ...), parent = N, container in (N, ...),
+    lastmodified > "YYYY-MM-DD[ HH:MM]" (UTC),
+    and a parenthesized group of the id, ancestor, parent and container clauses joined by "or".
+    """
+    content_type: str = "page"
+    indices: Set[int] = set(range(space.num_pages))
+    after: Optional[datetime] = None
+    for clause in re.split(r"\s+and\s+", cql.strip(), flags=re.IGNORECASE):
+        clause = clause.strip()
+        if clause.startswith("(") and clause.endswith(")"):
+            group: Set[int] = set()
+            for part in re.split(r"\s+or\s+", clause[1:-1], flags=re.IGNORECASE):
+                group |= match_clause(space, parse_clause(part))
+            indices &= group
+            continue
+        field, operator, values = parse_clause(clause)
+        if field == "type":
+            content_type = values[0]
+        elif field == "space":
+            if values[0] != "EPWCD":
+                indices = set()
+        elif field == "lastmodified" and operator == ">":
+            after = datetime.fromisoformat(values[0]).replace(tzinfo=timezone.utc)
+        else:
+            indices &= match_clause(space, (field, operator, values))
+    if content_type == "comment":
+        return [
+            comment
+            for i in sorted(indices)
+            for comment in space.get_comments(i)
+            if after is None
+            or datetime.fromisoformat(comment["version"]["when"]) > after
+        ]
+    return [
+        space.get_content(i, expand)
+        for i in sorted(indices)
+        if after is None or space.get_last_modified(i) > after
+    ]
+
+
+def parse_clause(clause: str) -> Tuple[str, str, List[str]]:
+    # 'id in (1, 2)' -> ("id", "in", ["1", "2"])
+    match = re.fullmatch(r"(\w+)\s*(=|>|in)\s*(.+)", clause.strip(), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Unsupported CQL clause: {clause}")
+    values: List[str] = [
+        v.strip().strip("\"'") for v in match.group(3).strip().strip("()").split(",")
+    ]
+    return match.group(1).lower(), match.group(2).lower(), values
+
+
+def match_clause(space: SyntheticSpace, clause: Tuple[str, str, List[str]]) -> Set[int]:
+    # The page indices an id, ancestor, parent or container clause matches
+    field, _, values = clause
+    indices: Set[int] = set()
+    for index in map(space.get_index, values):
+        if index is None:
+            continue
+        if field in ["id", "container"]:
+            indices.add(index)
+        elif field == "ancestor":
+            indices |= set(space.get_descendants(index))
+        elif field == "parent":
+            indices |= set(space.get_children(index))
+        else:
+            raise ValueError(f"Unsupported CQL clause: {field} {values}")
+    return indices
+
+
+def write_export(space: SyntheticSpace, path: str):
+    # A Confluence XML space export: entities.xml, with an old version of each page
+    # (which the reader must skip) and bodies in storage format.
+    def page_object(page_id: int, index: int, version: int, current: bool) -> str:
+        parent: str = (
+            f'<property name="parent" class="Page" package="{package}">'
+            f'<id name="id">{ROOT_PAGE_ID + (index - 1) // space.fan_out}</id></property>'
+            if index > 0
+            else ""
+        )
+        original: str = (
+            ""
+            if current
+            else f'<property name="originalVersion" class="Page" package="{package}">'
+            f'<id name="id">{ROOT_PAGE_ID + index}</id></property>'
+        )
+        return (
+            f'<object class="Page" package="{package}"><id name="id">{page_id}</id>'
+            f'<property name="title"><![CDATA[Synthetic Page {index}]]></property>'
+            f'<property name="version">{version}</property>'
+            f'<property name="position">{(index - 1) % space.fan_out}</property>'
+            f'<property name="contentStatus"><![CDATA[current]]></property>'
+            f"{parent}{original}</object>\n"
+        )
+
+    def body_object(body_id: int, page_id: int, body: str) -> str:
+        return (
+            f'<object class="BodyContent" package="{package}"><id name="id">{body_id}</id>'
+            f'<property name="body"><![CDATA[{body}]]></property>'
+            f'<property name="content" class="Page" package="{package}">'
+            f'<id name="id">{page_id}</id></property>'
+            f'<property name="bodyType">2</property></object>\n'
+        )
+
+    package: str = "com.atlassian.confluence.pages"
+    old_id_offset: int = 3 * ROOT_PAGE_ID
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("entities.xml", "w") as f:
+            f.write(b'<?xml version="1.0" encoding="UTF-8"?>\n<hibernate-generic>\n')
+            for index in range(space.num_pages):
+                page_id: int = ROOT_PAGE_ID + index
+                version: int = space.get_version(index)
+                body: str = space.get_body(index).replace(
+                    f'<img src="/wiki/download/attachments/{page_id}/figure.png" />',
+                    '<ac:image><ri:attachment ri:filename="figure.png" /></ac:image>',
+                )
+                objects: List[str] = [
+                    page_object(page_id, index, version, True),
+                    body_object(page_id, page_id, body),
+                ]
+                if version > 1:
+                    old_id: int = old_id_offset + index
+                    objects.append(page_object(old_id, index, version - 1, False))
+                    objects.append(body_object(old_id, old_id, "<p>Old version</p>"))
+                f.write("".join(objects).encode("utf-8"))
+            f.write(b"</hibernate-generic>\n")
+        archive.writestr("exportDescriptor.properties", "exportType=space\n")
+
+
+def make_png(width: int, height: int) -> bytes:
+    # A valid, highly compressible grayscale PNG, without needing PIL
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+        )
+
+    rows: bytes = (b"\x00" + b"\x80" * width) * height
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+def serve(
+    port: int,
+    num_pages: int,
+    fan_out: int = 10,
+    body_kb: int = 4,
+    latency_ms: float = 0.0,
+    error_rate: float = 0.0,
+    max_rps: float = 0.0,
+):
+    space = SyntheticSpace(num_pages, fan_out, body_kb)
+    server = FakeConfluenceServer(
+        ("127.0.0.1", port), space, latency_ms, error_rate, max_rps
+    )
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--fan-out", type=int, default=10)
+    parser.add_argument("--body-kb", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--export", default="", metavar="FILE")
+    args = parser.parse_args()
+    if args.export:
+        write_export(
+            SyntheticSpace(args.pages, args.fan_out, args.body_kb), args.export
+        )
+        print(f"Wrote {args.pages} synthetic pages to {args.export}")
+        return
+    print(f"Serving {args.pages} synthetic pages on http://127.0.0.1:{args.port}/wiki/")
+    serve(
+        args.port,
+        args.pages,
+        args.fan_out,
+        args.body_kb,
+        args.latency_ms,
+        args.error_rate,
+        args.max_rps,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import time
+from typing import Callable, List
+
+
+def time_call(func: Callable[[], object], repeat: int = 5) -> float:
+    # Return the best wall time, in seconds, of `repeat` calls to `func`.
+    best: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_table(header: List[str], rows: List[List[str]]):
+    widths: List[int] = [
+        max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))
+    ]
+    for row in [header] + rows:
+        cells: List[str] = [str(cell).ljust(width) for cell, width in zip(row, widths)]
+        print("  ".join(cells).rstrip())
+
+
+def time_per_call(
+    func: Callable[[], object], repeat: int = 5, min_seconds: float = 0.05
+) -> float:
+    # Return the best time per call, in seconds. Fast functions are called in a loop,
+    # enough times to take at least `min_seconds`, so timer resolution doesn't dominate.
+    number: int = 1
+    while True:
+        elapsed: float = time_call(lambda: [func() for _ in range(number)], 1)
+        if elapsed >= min_seconds:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_seconds / elapsed) + 1)
+    return min(
+        time_call(lambda: [func() for _ in range(number)], repeat) / number,
+        elapsed / number,
+    )
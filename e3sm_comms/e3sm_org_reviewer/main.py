@@ -1,27 +1,75 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from e3sm_comms.page_reviewer.utils_base import LinkedURLs
+from e3sm_comms.page_reviewer.utils_base import (
+    LinkedURLs,
+    get_sitemap_urls,
+    scan_web_pages_for_sensitive_terms,
+)
+from e3sm_comms.page_reviewer.utils_http import (
+    RequestScheduler,
+    RevalidationCache,
+    set_scheduler,
+)
 from e3sm_comms.utils import IO_DIR
 
 INPUT_E3SM_ORG_PATHS: str = f"{IO_DIR}/input/e3sm_org_reviewer/web_pages.txt"
 INPUT_SEARCH_PHRASES: str = f"{IO_DIR}/input/shared/sensitive_terms.txt"
 OUTPUT: str = f"{IO_DIR}/output/e3sm_org_reviewer/found_phrases.txt"
 
+# Set to True to discover every e3sm.org page from the sitemap, instead of reading INPUT_E3SM_ORG_PATHS
+USE_SITEMAP: bool = False
+SITEMAP_URL: str = "https://e3sm.org/sitemap_index.xml"
+# Only used if USE_SITEMAP is True
+MAX_WORKERS: int = 8
+MAX_REQUESTS_PER_HOST: int = 4
+# Set to a directory to revalidate pages with conditional GETs, rather than re-downloading them.
+# Unchanged pages then reuse their cached term counts, so repeated sweeps move almost no bytes.
+# Set to "" to disable.
+CACHE_DIR: str = f"{IO_DIR}/cache/e3sm_org_reviewer/"
+
 
 def main():
-    with open(INPUT_E3SM_ORG_PATHS, "r", encoding="utf-8") as f:
-        list_input_e3sm_org_paths: List[str] = [line.strip() for line in f]
     with open(INPUT_SEARCH_PHRASES, "r", encoding="utf-8") as f:
         terms: List[str] = [line.rstrip("\n").lower() for line in f]
         list_search_phrases: List[str] = sorted(terms)
+    cache: Optional[RevalidationCache] = (
+        RevalidationCache(CACHE_DIR) if CACHE_DIR else None
+    )
+
+    if USE_SITEMAP:
+        set_scheduler(RequestScheduler(max_concurrency_per_host=MAX_REQUESTS_PER_HOST))
+        sweep_sitemap(list_search_phrases, cache)
+        return
+
+    with open(INPUT_E3SM_ORG_PATHS, "r", encoding="utf-8") as f:
+        list_input_e3sm_org_paths: List[str] = [line.strip() for line in f]
 
     print(f"Checking {len(list_input_e3sm_org_paths)} e3sm.org pages")
     links = LinkedURLs(
         list_input_e3sm_org_paths,
         scan_links_for_sensitive_terms=True,
         list_sensitive_terms=list_search_phrases,
+        cache=cache,
     )
     relevant_links: Dict[str, Dict[str, int]] = links.links_with_sensitive_terms
     with open(OUTPUT, "w", encoding="utf-8") as f:
         for link in relevant_links:
             f.write(f"{link}: {relevant_links[link]}\n")
+
+
+def sweep_sitemap(
+    list_search_phrases: List[str], cache: Optional[RevalidationCache] = None
+):
+    e3sm_org_paths: List[str] = get_sitemap_urls(SITEMAP_URL)
+    print(f"Checking {len(e3sm_org_paths)} e3sm.org pages listed in {SITEMAP_URL}")
+    with open(OUTPUT, "w", encoding="utf-8") as f:
+        # Write results as pages finish, so partial results survive an interrupted sweep.
+        for link, sensitive_terms in scan_web_pages_for_sensitive_terms(
+            e3sm_org_paths,
+            list_search_phrases,
+            max_workers=MAX_WORKERS,
+            cache=cache,
+        ):
+            if sensitive_terms:
+                f.write(f"{link}: {sensitive_terms}\n")
+                f.flush()
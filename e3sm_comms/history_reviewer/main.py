@@ -0,0 +1,28 @@
+import argparse
+
+from e3sm_comms.page_reviewer.confluence_page_reviewer import run
+from e3sm_comms.page_reviewer.utils_base import Config
+from e3sm_comms.utils import IO_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="List the versions of each Confluence page that used sensitive terms."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted run from output_dir/crawl_journal.jsonl",
+    )
+    args = parser.parse_args()
+    c = Config("history")
+    c.file_input_confluence_paths = (
+        f"{IO_DIR}/input/website_reviewer/confluence_top_level_tabs_20260109.txt"
+    )
+    c.sensitive_terms_file = f"{IO_DIR}/input/shared/sensitive_terms.txt"
+    c.output_dir = f"{IO_DIR}/output/history_reviewer/"  # Must end with "/"
+    c.requested_output = ["sensitive_term_history"]
+    c.version_term_cache_file = f"{IO_DIR}/output/history_reviewer/version_terms.json"
+    c.resume = args.resume
+    c.read_input()
+    run(c)
@@ -1,9 +1,20 @@
+import argparse
+
 from e3sm_comms.page_reviewer.confluence_page_reviewer import run
 from e3sm_comms.page_reviewer.utils_base import Config
 from e3sm_comms.utils import IO_DIR
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Review the newsletter's stories.")
+    parser.add_argument(
+        "--watch",
+        type=float,
+        default=0,
+        metavar="SECONDS",
+        help="after the run, re-review stories modified or commented on since the last check, every SECONDS",
+    )
+    args = parser.parse_args()
     c = Config("newsletter")
     c.file_input_story_versions = (
         f"{IO_DIR}/input/newsletter_reviewer/2026_02_newsletter.csv"
@@ -16,5 +27,6 @@ def main():
     c.check_links_work = True
     c.scan_links_for_sensitive_terms = False
     c.confluence_api_comment_tracking_bug_exists = False
+    c.watch_interval_seconds = args.watch
     c.read_input()
     run(c)
@@ -1,101 +1,919 @@
 import re
-from typing import Dict, List
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
 from e3sm_comms.page_reviewer.utils_base import (
+    CONFLUENCE_WIKI_URL,
+    WALK_MODES,
     Config,
     ConfluenceCredentials,
     ConfluencePage,
+    CrawlJournal,
+    E3SMOrgSlugIndex,
     LinkedURLs,
+    PageFindings,
+    ParsedHTML,
+    TaggedStdout,
+    build_e3sm_org_slug_index,
     find_sensitive_terms,
+    get_all_results,
     get_json,
+    get_page_record,
     remove_output_files,
+    restore_page,
     split_html,
 )
+from e3sm_comms.page_reviewer.utils_confluence_export import ConfluenceExport
+from e3sm_comms.page_reviewer.utils_history_reviewer import (
+    sweep_page_versions,
+    write_term_history,
+)
+from e3sm_comms.page_reviewer.utils_http import (
+    Cassette,
+    RequestScheduler,
+    set_scheduler,
+)
+from e3sm_comms.page_reviewer.utils_metrics import METRICS, StageTimes
 from e3sm_comms.page_reviewer.utils_newsletter_reviewer import (
+    TextAnalysis,
+    analyze_text,
     construct_markdown_table,
     extract_data_from_comments_url,
     filter_acronyms,
-    find_double_spaces_after_periods,
-    find_first_person_phrases,
-    get_acronyms,
-    get_image_mention_frequencies,
+    get_comments_by_page,
     get_image_resolutions,
+    load_context_exclusions,
     process_newsletter,
     read_page_list,
     set_wordpress_keys,
     skip_newsletter_metadata_in_header,
 )
-from e3sm_comms.page_reviewer.utils_resource_reviewer import process_resource
+from e3sm_comms.page_reviewer.utils_pipeline import PagePipeline, PipelineNode
+from e3sm_comms.page_reviewer.utils_resource_reviewer import (
+    ResourceQueue,
+    process_resource,
+)
+from e3sm_comms.page_reviewer.utils_storage_format import split_storage_format
 from e3sm_comms.page_reviewer.utils_website_reviewer import (
     extract_confluence_table_to_dict,
+    write_repeat,
     write_results,
 )
 
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
 
 # Main functionality ##########################################################
 def run(config: Config):
+    started: datetime = datetime.now(timezone.utc)
     remove_output_files(config)
+    if config.collect_metrics:
+        METRICS.enable()
+    cassette: Optional[Cassette] = None
+    if config.cassette_mode:
+        cassette = Cassette(
+            config.cassette_file,
+            config.cassette_mode,
+            config.cassette_latency_seconds,
+            config.cassette_latency_scale,
+        )
+    set_scheduler(
+        RequestScheduler(
+            config.requests_per_second_per_host,
+            max_concurrency_per_host=config.max_concurrent_requests_per_host,
+            cassette=cassette,
+            url_rewrites=config.url_rewrites,
+        )
+    )
+    credentials = ConfluenceCredentials(prompt=needs_credentials(config))
+    parser = PageParser(config)
     try:
-        credentials = ConfluenceCredentials()
-        if config.mode in ["resource", "website"]:
-            for tab in config.list_input_confluence_paths:
-                walk_page_and_child_pages(config, credentials, tab)
-        if config.mode == "newsletter":
-            newsletter_page_list: List[ConfluencePage] = read_page_list(config)
-            for page in newsletter_page_list:
-                extract_data_from_page(config, credentials, page)
-            newsletter_dict: Dict[str, str]
+        if config.confluence_export_file:
+            with METRICS.stage("read_export"):
+                config.confluence_export = ConfluenceExport(
+                    config.confluence_export_file
+                )
+            set_export_top_level_pages(config, config.confluence_export)
+        newsletter_page_list: List[ConfluencePage] = []
+        newsletter_dict: Dict[str, str] = {}
+        # page_id -> record of each walked page (see get_page_record), shared by every top-level page
+        walk_results: Dict[str, Dict] = {}
+        if config.has_mode("newsletter"):
+            newsletter_page_list = read_page_list(config)
+            if len(config.modes) > 1:
+                # Keep the walk's content for the stories only, to bound memory
+                config.fetched_content = {
+                    page.page_id: None for page in newsletter_page_list
+                }
+        if config.has_mode(*WALK_MODES):
+            resource_queue: Optional[ResourceQueue] = (
+                ResourceQueue(config) if config.has_mode("resource") else None
+            )
+            journal = CrawlJournal(config)
+            try:
+                walk_page_trees(
+                    config, credentials, resource_queue, parser, journal, walk_results
+                )
+            finally:
+                journal.close()
+                if resource_queue:
+                    resource_queue.close()
+            journal.remove()
+        if config.has_mode("newsletter"):
+            if any(page.wordpress_version != 0 for page in newsletter_page_list):
+                config.e3sm_org_slug_index = get_e3sm_org_slug_index(config)
+            if config.bulk_comment_retrieval:
+                config.fetched_comments = get_comments_by_page(
+                    credentials, [page.page_id for page in newsletter_page_list]
+                )
+            extract_data_from_stories(config, credentials, newsletter_page_list, parser)
             if config.newsletter_test_link:
                 newsletter_dict = process_newsletter(
                     config.newsletter_test_link, config.list_sensitive_terms
                 )
-            else:
-                newsletter_dict = {}
             construct_markdown_table(config, newsletter_page_list, newsletter_dict)
+        if config.watch_interval_seconds:
+            watch_for_changes(
+                config,
+                credentials,
+                parser,
+                walk_results,
+                newsletter_page_list,
+                newsletter_dict,
+                started,
+            )
     finally:
         del credentials.api_token  # Clear the API token from memory, for added security
+        parser.close()
+        if cassette:
+            cassette.close()
+        if config.confluence_export:
+            config.confluence_export.close()
+        if config.version_term_cache:
+            config.version_term_cache.save()
+        if config.collect_metrics:
+            METRICS.write_summary(config.output_dir)
+
+
+def needs_credentials(config: Config) -> bool:
+    # Replayed responses and exported pages need no Confluence token.
+    # Newsletter comments and page versions are only available from the REST API.
+    if config.cassette_mode == "replay":
+        return False
+    return not config.confluence_export_file or config.has_mode("newsletter", "history")
+
+
+def set_export_top_level_pages(config: Config, export: ConfluenceExport):
+    # With no top-level pages given, walk the whole space
+    for mode, page_urls in config.list_input_confluence_paths_by_mode.items():
+        if not page_urls:
+            config.list_input_confluence_paths_by_mode[mode] = [
+                f"https://e3sm.atlassian.net/wiki/spaces/EPWCD/pages/{page_id}/"
+                for page_id in export.get_root_page_ids()
+            ]
+
+
+def get_e3sm_org_slug_index(config: Config) -> Optional[E3SMOrgSlugIndex]:
+    try:
+        return build_e3sm_org_slug_index(
+            config.e3sm_org_sitemap_url,
+            config.e3sm_org_slug_index_file,
+            config.e3sm_org_slug_index_max_age_hours,
+        )
+    except Exception as e:
+        # Fall back to probing each inferred URL
+        print(f"Could not read {config.e3sm_org_sitemap_url}: {e}")
+        return None
+
+
+# Parse page bodies in worker processes #######################################
+class ParseSettings(object):
+    # The parts of Config that parse_page_body needs. Config itself can't be sent
+    # to a worker process (e.g., it holds the open Confluence export).
+    __slots__ = (
+        "list_sensitive_terms",
+        "requested_output",
+        "first_person_exclusions_file",
+        "check_links_work",
+        "use_storage_format",
+    )
+
+    def __init__(self, config: Config):
+        self.list_sensitive_terms: List[str] = config.list_sensitive_terms
+        self.requested_output: List[str] = config.requested_output
+        self.first_person_exclusions_file: str = config.first_person_exclusions_file
+        self.check_links_work: bool = config.check_links_work
+        self.use_storage_format: bool = config.use_storage_format
+
+
+class ParsedBody(object):
+    # What parse_page_body returns: everything the page needs from its body,
+    # other than what takes requests (link, image and WordPress checks)
+    __slots__ = (
+        "findings",
+        "has_metadata",
+        "metadata",
+        "links",
+        "img_srcs",
+        "warnings",
+        "seconds",
+    )
+
+    def __init__(self, findings: PageFindings, has_metadata: bool):
+        self.findings: PageFindings = findings
+        self.has_metadata: bool = has_metadata
+        # The metadata table, if need_to_sync_wordpress was requested
+        self.metadata: Optional[Dict[str, str]] = None
+        self.links: List[str] = []
+        self.img_srcs: List[str] = []
+        # Printed by the caller, since parse_page_body can't print
+        self.warnings: List[str] = []
+        # stage -> seconds, for METRICS
+        self.seconds: Dict[str, float] = {}
+
+
+class PageParser(object):
+    """
+    Runs parse_page_body in max_parse_workers processes, or on the calling thread if 0.
+
+    BeautifulSoup's html.parser is pure Python and holds the GIL, so parsing on
+    the fetching threads doesn't run in parallel. Workers are spawned, not forked,
+    since forking a process with running threads (e.g., the fetch workers) is unsafe.
+    """
+
+    def __init__(self, config: Config):
+        self.settings = ParseSettings(config)
+        self.executor: Optional["ProcessPoolExecutor"] = None
+        if config.max_parse_workers > 0:
+            # Imported here, as they add to every CLI's start-up time
+            import concurrent.futures
+            import multiprocessing
+
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=config.max_parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def parse(
+        self, raw_html: str, page_url: str, modes: List[str], check_first_person: bool
+    ) -> ParsedBody:
+        if not self.executor:
+            return parse_page_body(
+                self.settings, raw_html, page_url, modes, check_first_person
+            )
+        return self.executor.submit(
+            parse_page_body,
+            self.settings,
+            raw_html,
+            page_url,
+            modes,
+            check_first_person,
+        ).result()
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown()
+
+    def __enter__(self) -> "PageParser":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parse_page_body(
+    settings: ParseSettings,
+    raw_html: str,
+    page_url: str,
+    modes: List[str],
+    check_first_person: bool,
+) -> ParsedBody:
+    # Runs in a worker process, so this must not print or send requests
+    times = StageTimes()
+    warnings: List[str] = []
+    with times.stage("parse"):
+        main_html: ParsedHTML
+        metadata_html: Optional[ParsedHTML]
+        if settings.use_storage_format:
+            # The <hr> may be inside a layout, so it's found while parsing
+            main_html, metadata_html = split_storage_format(
+                raw_html,
+                ConfluencePage(page_url).page_id,
+                skip_before_hr="newsletter" in modes,
+                warnings=warnings,
+            )
+        else:
+            if "newsletter" in modes:
+                raw_html = skip_newsletter_metadata_in_header(raw_html)
+            main_html, metadata_html = split_html(raw_html)
+    # Only the findings are returned; the parse trees are dropped here.
+    body = ParsedBody(PageFindings(main_html), metadata_html is not None)
+    body.warnings = warnings
+    findings: PageFindings = body.findings
+    if settings.check_links_work:
+        body.links = main_html.links
+    if ("sensitive_terms" in settings.requested_output) or (
+        "newsletter_review_table" in settings.requested_output
+    ):
+        with times.stage("sensitive_terms"):
+            findings.sensitive_terms = find_sensitive_terms(
+                settings.list_sensitive_terms, main_html.text_lowercase
+            )
+    if ("newsletter" in modes) and (
+        "newsletter_review_table" in settings.requested_output
+    ):
+        # Use original text, not lowercase text!!
+        with times.stage("text_analysis"):
+            analysis: TextAnalysis = analyze_text(
+                main_html.paragraphs,
+                main_html.text,
+                main_html.num_imgs,
+                check_first_person,
+                load_context_exclusions(settings.first_person_exclusions_file),
+            )
+        findings.first_person_phrases = analysis.first_person_phrases
+        findings.double_spaces_after_periods = analysis.double_spaces_after_periods
+        findings.img_mentions = analysis.img_mentions
+        findings.acronyms = filter_acronyms(page_url, analysis.acronyms)
+        body.img_srcs = main_html.img_srcs
+    if (
+        ("website" in modes)
+        and ("need_to_sync_wordpress" in settings.requested_output)
+        and metadata_html
+    ):
+        with times.stage("parse"):
+            body.metadata = extract_confluence_table_to_dict(metadata_html)
+    body.seconds = times.seconds
+    return body
 
 
 # Recurse through pages #######################################################
+class WalkItem(object):
+    # A page to walk, with mode -> depth below that mode's top-level page,
+    # for each mode that covers it
+    __slots__ = ("page_url", "current_depth", "mode_depths")
+
+    def __init__(self, page_url: str, current_depth: int, mode_depths: Dict[str, int]):
+        self.page_url: str = page_url
+        self.current_depth: int = current_depth
+        self.mode_depths: Dict[str, int] = mode_depths
+
+
+class WalkedPage(object):
+    # A walked page, the modes to handle it with, and every mode that covers it
+    # (modes is empty if every one of them already handled it)
+    __slots__ = ("page", "modes", "all_modes")
+
+    def __init__(self, page: ConfluencePage, modes: List[str]):
+        self.page: ConfluencePage = page
+        self.modes: List[str] = modes
+        self.all_modes: List[str] = list(modes)
+
+
+def walk_page_trees(
+    config: Config,
+    credentials: ConfluenceCredentials,
+    resource_queue: Optional[ResourceQueue] = None,
+    parser: Optional[PageParser] = None,
+    journal: Optional[CrawlJournal] = None,
+    results: Optional[Dict[str, Dict]] = None,
+):
+    # Walk the top-level pages of the history, resource and website modes in one pass.
+    # A page under the top-level pages of several is fetched once, and handled by each.
+    root_modes, root_urls = get_walk_roots(config)
+    walk_pages(
+        config,
+        credentials,
+        root_modes,
+        root_urls,
+        resource_queue,
+        parser,
+        journal,
+        results,
+    )
+
+
+def get_walk_roots(config: Config) -> Tuple[Dict[str, List[str]], Dict[str, str]]:
+    root_modes: Dict[str, List[str]] = {}  # page_id -> modes that start there
+    root_urls: Dict[str, str] = {}  # page_id -> url, in input order
+    for mode, page_urls in config.list_input_confluence_paths_by_mode.items():
+        for page_url in page_urls:
+            page_id: str = ConfluencePage(page_url).page_id
+            root_modes.setdefault(page_id, []).append(mode)
+            root_urls.setdefault(page_id, page_url)
+    return root_modes, root_urls
+
+
+def get_page_url(page_id: str) -> str:
+    return f"{CONFLUENCE_WIKI_URL}/spaces/EPWCD/pages/{page_id}/"
+
+
 def walk_page_and_child_pages(
     config: Config,
     credentials: ConfluenceCredentials,
     page_url: str,
-    current_depth: int = 0,
+    resource_queue: Optional[ResourceQueue] = None,
+    parser: Optional[PageParser] = None,
+):
+    # Walk one page tree, for every walk mode
+    page_id: str = ConfluencePage(page_url).page_id
+    modes: List[str] = [m for m in config.modes if m in WALK_MODES]
+    walk_pages(
+        config,
+        credentials,
+        {page_id: modes},
+        {page_id: page_url},
+        resource_queue,
+        parser,
+        None,
+    )
+
+
+def walk_pages(
+    config: Config,
+    credentials: ConfluenceCredentials,
+    root_modes: Dict[str, List[str]],
+    root_urls: Dict[str, str],
+    resource_queue: Optional[ResourceQueue],
+    parser: Optional[PageParser],
+    journal: Optional[CrawlJournal],
+    results: Optional[Dict[str, Dict]] = None,
 ):
-    current_page = ConfluencePage(page_url, current_depth)
-    extract_data_from_page(config, credentials, current_page)
-    if config.mode == "resource":
-        process_resource(config, current_page)
-    for child_page_id in current_page.child_page_ids:
-        child_page_url = (
-            f"https://e3sm.atlassian.net/wiki/spaces/EPWCD/pages/{child_page_id}/"
+    # Pages are fetched (and parsed, by `parser`) on max_fetch_workers threads,
+    # ahead of this thread, which writes the results in depth-first order,
+    # exactly as if the pages were walked one at a time.
+    # results: page_id -> record of each page written (see get_page_record). A page
+    # reached again, e.g. under a top-level page that is its ancestor, reuses its record
+    # and is listed as a repeat in the outline, rather than being walked again.
+    if results is None:
+        results = {}
+    walk_results: Dict[str, Dict] = results
+
+    def process(item: WalkItem) -> Tuple[WalkedPage, List[WalkItem]]:
+        return extract_data_from_walked_page(
+            config, credentials, item, root_modes, walk_results, parser, journal
         )
-        walk_page_and_child_pages(
-            config, credentials, child_page_url, current_depth=current_depth + 1
+
+    with PagePipeline(
+        process, config.max_fetch_workers, config.max_pages_in_flight
+    ) as pipeline:
+        for i, page_url in enumerate(root_urls.values()):
+            # Trees are written one at a time, so a top-level page already walked
+            # under an earlier one is in `results` by the time it's reached
+            root: PipelineNode[WalkItem] = pipeline.add(WalkItem(page_url, 0, {}), (i,))
+            write_page_tree(
+                config, pipeline, root, resource_queue, journal, walk_results
+            )
+
+
+def extract_data_from_walked_page(
+    config: Config,
+    credentials: ConfluenceCredentials,
+    item: WalkItem,
+    root_modes: Dict[str, List[str]],
+    results: Dict[str, Dict],
+    parser: Optional[PageParser],
+    journal: Optional[CrawlJournal],
+) -> Tuple[WalkedPage, List[WalkItem]]:
+    # Return (the page and the modes that handle it, its child pages to walk)
+    page = ConfluencePage(item.page_url, item.current_depth)
+    mode_depths: Dict[str, int] = dict(item.mode_depths)
+    for mode in root_modes.get(page.page_id, []):
+        mode_depths.setdefault(mode, 0)
+    # The outline is indented from the website's top-level pages
+    page.depth = mode_depths.get("website", item.current_depth)
+    modes: List[str] = list(mode_depths)
+    walked: WalkedPage = WalkedPage(page, modes)
+    prior: Optional[Dict] = results.get(page.page_id)
+    if prior is not None:
+        # Already walked: reuse its record, including its child pages, and only
+        # read what modes that didn't handle it then need
+        modes = walked.modes = [m for m in modes if m not in prior["modes"]]
+        restore_page(page, prior)
+        if not modes:
+            return walked, []
+        extract_data_for_new_modes(config, credentials, page, modes, parser)
+    # Pages written before an interrupted run are replayed from the journal
+    elif not (journal and journal.restore(page, modes)):
+        extract_data_from_page(config, credentials, page, modes, parser)
+    child_items: List[WalkItem] = [
+        WalkItem(
+            get_page_url(child_page_id),
+            item.current_depth + 1,
+            {mode: depth + 1 for mode, depth in mode_depths.items()},
         )
+        for child_page_id in page.child_page_ids
+    ]
+    return walked, child_items
+
+
+def write_page_tree(
+    config: Config,
+    pipeline: PagePipeline[WalkItem],
+    node: PipelineNode[WalkItem],
+    resource_queue: Optional[ResourceQueue],
+    journal: Optional[CrawlJournal],
+    results: Dict[str, Dict],
+):
+    walked: WalkedPage = pipeline.wait(node)
+    page: ConfluencePage = walked.page
+    modes: List[str] = walked.modes
+    with METRICS.page(page.page_id):
+        if "website" in modes:
+            with METRICS.stage("write_results"):
+                write_results(config, page)
+        elif "website" in walked.all_modes:
+            with METRICS.stage("write_results"):
+                write_repeat(config, page)
+        if "resource" in modes:
+            with METRICS.stage("resource"):
+                process_resource(config, page, resource_queue)
+        if "history" in modes:
+            with METRICS.stage("write_results"):
+                write_term_history(config, page)
+    if modes:
+        if journal:
+            journal.add(page, modes)
+        record: Dict = get_page_record(page, modes)
+        if page.page_id in results:
+            record["modes"] = results[page.page_id]["modes"] + modes
+        results[page.page_id] = record
+    children: List[PipelineNode[WalkItem]] = node.children
+    node.children = []
+    pipeline.release(node)
+    for child in children:
+        write_page_tree(config, pipeline, child, resource_queue, journal, results)
+
+
+# Process newsletter stories concurrently ####################################
+def extract_data_from_stories(
+    config: Config,
+    credentials: ConfluenceCredentials,
+    page_list: List[ConfluencePage],
+    parser: Optional[PageParser] = None,
+):
+    # Each story is independent, so process them on max_story_workers threads.
+    # Results are stored on each page, so page_list keeps its CSV order for the table.
+    with TaggedStdout(sys.stdout) as tagged_stdout:
+
+        def extract_data_from_story(
+            item: Tuple[int, ConfluencePage],
+        ) -> Tuple[None, List[Tuple[int, ConfluencePage]]]:
+            story_number, page = item
+            tagged_stdout.set_tag(f"[story {story_number}] ")
+            try:
+                extract_data_from_page(
+                    config, credentials, page, ["newsletter"], parser
+                )
+            finally:
+                tagged_stdout.clear_tag()
+            return None, []
+
+        with PagePipeline(
+            extract_data_from_story,
+            config.max_story_workers,
+            config.max_pages_in_flight,
+        ) as pipeline:
+            nodes: List[PipelineNode[Tuple[int, ConfluencePage]]] = [
+                pipeline.add((i + 1, page), (i,)) for i, page in enumerate(page_list)
+            ]
+            for node in nodes:
+                pipeline.wait(node)  # Re-raise any exception from the story
+                pipeline.release(node)
+
+
+# Watch for changes ###########################################################
+# CQL dates are to the minute, in the user's time zone, so each poll searches from
+# a day before the last one. Pages whose version hasn't changed are skipped.
+WATCH_SEARCH_OVERLAP: timedelta = timedelta(days=1)
+PAGES_PER_SEARCH: int = 100
+
+
+def watch_for_changes(
+    config: Config,
+    credentials: ConfluenceCredentials,
+    parser: Optional[PageParser],
+    records: Dict[str, Dict],
+    story_list: List[ConfluencePage],
+    newsletter_dict: Dict[str, str],
+    since: datetime,
+):
+    # Every watch_interval_seconds, re-read the pages (and stories' comments) modified
+    # since the last poll, and rewrite the outputs they change.
+    # records: page_id -> the walk's record of each page (see get_page_record)
+    # Pages deleted or moved out of the walked trees are only dropped by the next full run.
+    config.fetched_content = None  # Stories must be fetched again when they change
+    root_modes, root_urls = get_walk_roots(config)
+    polls: int = 0
+    print(
+        f"Watching for changes every {config.watch_interval_seconds} seconds (Ctrl-C to stop)"
+    )
+    # Set when a poll fails partway, as some pages may have been re-read but not written
+    rewrite_pending: bool = False
+    try:
+        while not config.watch_max_polls or polls < config.watch_max_polls:
+            time.sleep(config.watch_interval_seconds)
+            polls += 1
+            polled: datetime = datetime.now(timezone.utc)
+            try:
+                changed_walk, changed_stories = poll_for_changes(
+                    config,
+                    credentials,
+                    parser,
+                    records,
+                    root_modes,
+                    root_urls,
+                    story_list,
+                    since,
+                )
+                if (changed_walk or rewrite_pending) and config.has_mode("website"):
+                    with METRICS.stage("write_results"):
+                        rewrite_walk_results(config, records, root_modes, root_urls)
+                if (changed_stories or rewrite_pending) and story_list:
+                    construct_markdown_table(config, story_list, newsletter_dict)
+            except Exception as e:
+                # E.g., a server error: keep watching, and search this poll's window again next time
+                print(f"Poll {polls} failed, will retry: {e}")
+                rewrite_pending = True
+                continue
+            rewrite_pending = False
+            print(
+                f"Poll {polls}: re-read {len(changed_walk)} walked pages and {len(changed_stories)} stories"
+            )
+            since = polled
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+
+def poll_for_changes(
+    config: Config,
+    credentials: ConfluenceCredentials,
+    parser: Optional[PageParser],
+    records: Dict[str, Dict],
+    root_modes: Dict[str, List[str]],
+    root_urls: Dict[str, str],
+    story_list: List[ConfluencePage],
+    since: datetime,
+) -> Tuple[Set[str], Set[str]]:
+    # Return the page_ids of the walked pages and stories that were re-read.
+    # One search finds the modified pages, and (in newsletter mode) one the modified comments.
+    stories: Dict[str, ConfluencePage] = {page.page_id: page for page in story_list}
+    scopes: List[str] = [f"id in ({','.join(list(stories) + list(root_urls))})"]
+    if root_urls:
+        scopes.append(f"ancestor in ({','.join(root_urls)})")
+    modified: str = f'lastmodified > "{format_cql_date(since - WATCH_SEARCH_OVERLAP)}"'
+    results: List[Dict] = get_all_results(
+        credentials,
+        "search",
+        f"{CONFLUENCE_WIKI_URL}/rest/api/content/search",
+        params={
+            "cql": f"type=page and ({' or '.join(scopes)}) and {modified}",
+            "expand": "version,ancestors",
+            "limit": str(PAGES_PER_SEARCH),
+        },
+    )
+    changed_walk: Set[str] = set()
+    changed_stories: Set[str] = set()
+    # Parents first, so a new page's parent is in records by the time it's reached
+    for result in sorted(results, key=lambda result: len(result.get("ancestors", []))):
+        page_id: str = result["id"]
+        version: Optional[int] = result.get("version", {}).get("number")
+        if page_id in stories and stories[page_id].current_version != version:
+            changed_stories.add(page_id)
+        record: Optional[Dict] = records.get(page_id)
+        if record is not None:
+            if record["current_version"] != version:
+                changed_walk |= rewalk_pages(
+                    config, credentials, parser, records, [page_id], record["modes"]
+                )
+            continue
+        ancestors: List[Dict] = result.get("ancestors", [])
+        parent_record: Optional[Dict] = (
+            records.get(ancestors[-1]["id"]) if ancestors else None
+        )
+        if parent_record is not None:
+            # A new page: re-read its parent's child pages, and walk the new ones
+            parent = ConfluencePage(get_page_url(ancestors[-1]["id"]))
+            with METRICS.page(parent.page_id):
+                extract_data_from_child_pages_url(config, credentials, parent)
+            parent_record["child_page_ids"] = parent.child_page_ids
+            changed_walk.add(parent.page_id)
+            changed_walk |= rewalk_pages(
+                config,
+                credentials,
+                parser,
+                records,
+                [i for i in parent.child_page_ids if i not in records],
+                parent_record["modes"],
+            )
+    if stories and config.has_mode("newsletter"):
+        commented: Set[str] = find_commented_stories(credentials, list(stories), since)
+        if changed_stories | commented:
+            comments: Dict[str, List[Dict]] = get_comments_by_page(
+                credentials, sorted(changed_stories | commented)
+            )
+            config.fetched_comments = comments
+            for page in story_list:
+                if page.page_id in changed_stories:
+                    extract_data_from_page(
+                        config, credentials, page, ["newsletter"], parser
+                    )
+                elif page.page_id in commented:
+                    extract_data_from_comments_url(
+                        credentials, page, comments[page.page_id]
+                    )
+            changed_stories |= commented
+    return changed_walk, changed_stories
+
+
+def rewalk_pages(
+    config: Config,
+    credentials: ConfluenceCredentials,
+    parser: Optional[PageParser],
+    records: Dict[str, Dict],
+    page_ids: List[str],
+    modes: List[str],
+) -> Set[str]:
+    # Re-read the pages into records, along with any of their child pages that are new.
+    # Return the page_ids that were read.
+    read: Set[str] = set()
+    for page_id in page_ids:
+        page = ConfluencePage(get_page_url(page_id))
+        extract_data_from_page(config, credentials, page, modes, parser)
+        records[page_id] = get_page_record(page, modes)
+        read.add(page_id)
+        new_child_page_ids: List[str] = [
+            i for i in page.child_page_ids if i not in records
+        ]
+        read |= rewalk_pages(
+            config, credentials, parser, records, new_child_page_ids, modes
+        )
+    return read
+
+
+def find_commented_stories(
+    credentials: ConfluenceCredentials, page_ids: List[str], since: datetime
+) -> Set[str]:
+    # The stories with comments added or edited since `since`
+    comments: List[Dict] = get_all_results(
+        credentials,
+        "search",
+        f"{CONFLUENCE_WIKI_URL}/rest/api/content/search",
+        params={
+            "cql": f"type=comment and container in ({','.join(page_ids)}) and "
+            f'lastmodified > "{format_cql_date(since - WATCH_SEARCH_OVERLAP)}"',
+            "expand": "container,version",
+            "limit": str(PAGES_PER_SEARCH),
+        },
+    )
+    commented: Set[str] = set()
+    for comment in comments:
+        when: str = comment.get("version", {}).get("when", "")
+        # The search overlaps the last one, so check the exact time, if given
+        if when and datetime.fromisoformat(when.replace("Z", "+00:00")) <= since:
+            continue
+        commented.add(comment.get("container", {}).get("id", ""))
+    return commented & set(page_ids)
+
+
+def format_cql_date(when: datetime) -> str:
+    return when.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def rewrite_walk_results(
+    config: Config,
+    records: Dict[str, Dict],
+    root_modes: Dict[str, List[str]],
+    root_urls: Dict[str, str],
+):
+    # Write the website outputs again from the records,
+    # in the same order, at the same depths and with the same repeats as walk_pages
+    remove_output_files(config, ["website"])
+    written: Set[str] = set()
+
+    def write_tree(page_id: str, current_depth: int, mode_depths: Dict[str, int]):
+        record: Optional[Dict] = records.get(page_id)
+        if record is None:
+            return
+        mode_depths = dict(mode_depths)
+        for mode in root_modes.get(page_id, []):
+            mode_depths.setdefault(mode, 0)
+        page = ConfluencePage(get_page_url(page_id), current_depth)
+        restore_page(page, record)
+        page.depth = mode_depths.get("website", current_depth)
+        if page_id in written:
+            if "website" in mode_depths:
+                write_repeat(config, page)
+            return
+        written.add(page_id)
+        if "website" in mode_depths:
+            write_results(config, page)
+        for child_page_id in record["child_page_ids"]:
+            write_tree(
+                child_page_id,
+                current_depth + 1,
+                {mode: depth + 1 for mode, depth in mode_depths.items()},
+            )
+
+    for page_id in root_urls:
+        write_tree(page_id, 0, {})
 
 
 # Per page analysis ###############################################################
 def extract_data_from_page(
-    config: Config, credentials: ConfluenceCredentials, page: ConfluencePage
+    config: Config,
+    credentials: ConfluenceCredentials,
+    page: ConfluencePage,
+    modes: Optional[List[str]] = None,
+    parser: Optional[PageParser] = None,
 ):
-    extract_data_from_content_url(credentials, page)
-    if config.mode in ["newsletter", "website"]:
-        extract_data_from_content_url_body(config, credentials, page)
-    if config.mode == "newsletter":
-        extract_data_from_comments_url(credentials, page)
-    if config.mode in ["resource", "website"]:
-        extract_data_from_child_pages_url(credentials, page)
-    if config.mode == "website":
-        write_results(config, page)
+    # modes: the modes that handle this page (default: all of config.modes)
+    # parser: where to parse the body (default: on this thread)
+    # Results are written by the caller, so pages can be fetched out of order.
+    if modes is None:
+        modes = config.modes
+    needs_body: bool = ("newsletter" in modes) or ("website" in modes)
+    with METRICS.page(page.page_id):
+        data: Dict = get_content_data(config, credentials, page, modes)
+        extract_data_from_content_url(page, data)
+        if needs_body:
+            extract_data_from_content_url_body(
+                config, credentials, page, data, modes, parser
+            )
+        if "newsletter" in modes:
+            comments: Optional[List[Dict]] = (
+                config.fetched_comments.get(page.page_id)
+                if config.fetched_comments is not None
+                else None
+            )
+            extract_data_from_comments_url(credentials, page, comments)
+        if any(mode in WALK_MODES for mode in modes):
+            extract_data_from_child_pages_url(config, credentials, page)
+        if "history" in modes:
+            sweep_page_versions(config, credentials, page)
 
 
-# Functions used by all modes #################################################
-def extract_data_from_content_url(
-    credentials: ConfluenceCredentials, page: ConfluencePage
+def extract_data_for_new_modes(
+    config: Config,
+    credentials: ConfluenceCredentials,
+    page: ConfluencePage,
+    modes: List[str],
+    parser: Optional[PageParser] = None,
 ):
-    data = get_json(credentials, page.page_id, page.content_url)
+    # For a page restored from its record: the title, version and child pages are
+    # already known, so only the body (website) and versions (history) are read.
+    # The resource mode needs nothing more.
+    with METRICS.page(page.page_id):
+        if "website" in modes:
+            data: Dict = get_content_data(config, credentials, page, modes)
+            extract_data_from_content_url_body(
+                config, credentials, page, data, modes, parser
+            )
+        if "history" in modes:
+            sweep_page_versions(config, credentials, page)
+
+
+# Functions used by all modes #################################################
+def get_content_data(
+    config: Config,
+    credentials: ConfluenceCredentials,
+    page: ConfluencePage,
+    modes: List[str],
+) -> Dict:
+    # Title, version and (if needed) body, in one request
+    if config.confluence_export:
+        return config.confluence_export.get_content(page.page_id)
+    is_story: bool = "newsletter" in modes
+    if is_story and config.fetched_content:
+        # Each story is read once, so its content can be released now
+        fetched: Optional[Dict] = config.fetched_content.pop(page.page_id, None)
+        METRICS.record_cache("fetched_content", hit=fetched is not None)
+        if fetched is not None:
+            return fetched
+    needs_body: bool = is_story or ("website" in modes)
+    params: Dict[str, str] = (
+        {"expand": f"body.{get_body_format(config)}.value,version"}
+        if needs_body
+        else {}
+    )
+    data: Dict = get_json(credentials, page.page_id, page.content_url, params=params)
+    if (
+        needs_body
+        and config.fetched_content
+        and (page.page_id in config.fetched_content)
+    ):
+        config.fetched_content[page.page_id] = data
+    return data
+
+
+def get_body_format(config: Config) -> str:
+    return "storage" if config.use_storage_format else "view"
+
+
+def extract_data_from_content_url(page: ConfluencePage, data: Dict):
     if "title" not in data:
         raise RuntimeError(
             f"Response for page_id={page.page_id} does not contain 'title'. Full response: {data}"
@@ -112,73 +930,72 @@ def extract_data_from_content_url(
 
 # Functions used by newsletter, website modes ###################################
 def extract_data_from_content_url_body(
-    config: Config, credentials: ConfluenceCredentials, page: ConfluencePage
+    config: Config,
+    credentials: ConfluenceCredentials,
+    page: ConfluencePage,
+    data: Dict,
+    modes: List[str],
+    parser: Optional[PageParser] = None,
 ):
-    data = get_json(
-        credentials,
-        page.page_id,
-        page.content_url,
-        params={"expand": "body.view.value"},
-    )
     # print_json(data) # For debugging
-    raw_html = data.get("body", {}).get("view", {}).get("value", "")
-    if config.mode == "newsletter":
-        raw_html = skip_newsletter_metadata_in_header(raw_html)
-    page.main_html, page.metadata_html = split_html(raw_html)
-    if config.check_links_work:
-        page.main_html.linked_urls = LinkedURLs(
-            page.main_html.links,
-            config.scan_links_for_sensitive_terms,
-            config.list_sensitive_terms,
-        )
-    if ("sensitive_terms" in config.requested_output) or (
+    raw_html = data.get("body", {}).get(get_body_format(config), {}).get("value", "")
+    is_newsletter_review: bool = ("newsletter" in modes) and (
         "newsletter_review_table" in config.requested_output
-    ):
-        page.main_html.sensitive_terms = find_sensitive_terms(
-            config.list_sensitive_terms, page.main_html.text_lowercase
-        )
-
-    if "newsletter_review_table" in config.requested_output:
+    )
+    check_first_person: bool = False
+    if is_newsletter_review:
         if page.url not in config.list_first_person_urls:
             if any(page.page_id in url for url in config.list_first_person_urls):
                 print(
                     "  Skipping first-person review. Page ID is in the approved list."
                 )
             else:
-                page.main_html.first_person_phrases = find_first_person_phrases(
-                    page.main_html.paragraphs
-                )
+                check_first_person = True
         else:
             print("  Skipping first-person review. Page URL is in the approved list.")
-        page.main_html.double_spaces_after_periods = find_double_spaces_after_periods(
-            page.main_html.paragraphs
-        )
-        lowercase_text: str = page.main_html.text.lower()
-        page.main_html.img_mentions = get_image_mention_frequencies(
-            lowercase_text, page.main_html.num_imgs
-        )
-        page.main_html.img_resolutions = get_image_resolutions(
-            page.main_html.img_srcs, "https://e3sm.atlassian.net/wiki", credentials
+    if parser:
+        body: ParsedBody = parser.parse(raw_html, page.url, modes, check_first_person)
+    else:
+        body = parse_page_body(
+            ParseSettings(config), raw_html, page.url, modes, check_first_person
         )
-        acronyms = get_acronyms(
-            page.main_html.text
-        )  # Use original text, not lowercase_text!!
-        page.main_html.acronyms = filter_acronyms(page.url, acronyms)
-        set_wordpress_keys(page)
-    if "need_to_sync_wordpress" in config.requested_output:
-        if page.metadata_html:
-            table = extract_confluence_table_to_dict(page.metadata_html)
-            page.page_owner = table.get("Page Owner", "Unknown")
-            if table.get("Sync to WordPress", "").lower() == "yes":
-                page.need_to_sync_wordpress = True
-
-
-# Functions used by resource, website modes ###################################
+    for warning in body.warnings:
+        print(f"  {warning}")
+    for stage, seconds in body.seconds.items():
+        METRICS.record_stage(stage, seconds)
+    page.findings = findings = body.findings
+    page.has_metadata = body.has_metadata
+    if config.check_links_work:
+        with METRICS.stage("link_checks"):
+            findings.linked_urls = LinkedURLs(
+                body.links,
+                config.scan_links_for_sensitive_terms,
+                config.list_sensitive_terms,
+            )
+    if is_newsletter_review:
+        with METRICS.stage("image_checks"):
+            findings.img_resolutions = get_image_resolutions(
+                body.img_srcs, "https://e3sm.atlassian.net/wiki", credentials
+            )
+        with METRICS.stage("wordpress_check"):
+            set_wordpress_keys(page, config.e3sm_org_cache, config.e3sm_org_slug_index)
+    if body.metadata is not None:
+        page.page_owner = body.metadata.get("Page Owner", "Unknown")
+        if body.metadata.get("Sync to WordPress", "").lower() == "yes":
+            page.need_to_sync_wordpress = True
+
+
+# Functions used by history, resource, website modes ##########################
 def extract_data_from_child_pages_url(
-    credentials: ConfluenceCredentials, page: ConfluencePage
+    config: Config, credentials: ConfluenceCredentials, page: ConfluencePage
 ):
-    data = get_json(credentials, page.page_id, page.child_pages_url)
-    page.child_page_ids = [page["id"] for page in data.get("results", [])]
+    results: List[Dict]
+    if config.confluence_export:
+        results = config.confluence_export.get_child_pages(page.page_id)["results"]
+    else:
+        # Pages with more than 25 children span several responses
+        results = get_all_results(credentials, page.page_id, page.child_pages_url)
+    page.child_page_ids = [page["id"] for page in results]
     count = len(page.child_page_ids)
     if count:
         print(f"  Found {count} child pages: {page.child_page_ids}")
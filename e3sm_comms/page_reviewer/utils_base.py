@@ -1,32 +1,71 @@
+import difflib
 import getpass
 import html
 import json
 import os
 import re
-from typing import Dict, List, Optional, Tuple
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 from urllib.parse import quote, unquote, urlparse
 
-import requests  # type: ignore
-from bs4 import BeautifulSoup
-from requests.auth import HTTPBasicAuth  # type: ignore
+from e3sm_comms.page_reviewer.utils_confluence_export import (
+    CONFLUENCE_WIKI_URL,
+    ConfluenceExport,
+)
+from e3sm_comms.page_reviewer.utils_http import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_CONFLUENCE_API,
+    RevalidationCache,
+    WebPage,
+    get_terms_key,
+    get_web_page,
+    http_get,
+    write_atomically,
+)
+from e3sm_comms.page_reviewer.utils_metrics import METRICS
+
+# Modes that walk page trees from top-level pages
+WALK_MODES: List[str] = ["history", "resource", "website"]
+# Website pages end with this, followed by their metadata table
+METADATA_MARKER: str = "END OF e3sm.or page"
 
 
 # Classes #####################################################################
-# Set these values in newsletter_review/main.py, resource_reviewer/main.py, website_reviewer/main.py
+# Set these values in history_reviewer/main.py, newsletter_review/main.py, resource_reviewer/main.py, website_reviewer/main.py
 class Config(object):
-    def __init__(self, mode: str):
-        self.mode = mode
-        if mode not in ["newsletter", "resource", "website"]:
-            raise RuntimeError(f"Invalid Config mode={mode}")
+    # Pass a list of modes, e.g. ["website", "resource"], to run them together:
+    # each page is then fetched and parsed once, and handled by every mode that covers it.
+    def __init__(self, mode: Union[str, List[str]]):
+        self.modes: List[str] = [mode] if isinstance(mode, str) else list(mode)
+        if not self.modes:
+            raise RuntimeError("Config needs at least one mode")
+        for m in self.modes:
+            if m not in ["newsletter"] + WALK_MODES:
+                raise RuntimeError(f"Invalid Config mode={m}")
 
         # Input:
         self.file_input_confluence_paths: str = ""
+        # mode -> file of top-level pages for that mode, when the resource and website
+        # modes run together but start from different pages. Other modes use file_input_confluence_paths.
+        self.file_input_confluence_paths_by_mode: Dict[str, str] = {}
         self.file_input_story_versions: str = ""
         self.sensitive_terms_file: str = ""
         self.first_person_file: str = ""
+        # Rules for text that is not first-person (e.g., "US Department").
+        # Set to "" to use page_reviewer/first_person_exclusions.txt
+        self.first_person_exclusions_file: str = ""
         self.newsletter_test_link = ""
+        # Set to a Confluence XML space export (.zip) to read pages from it, rather than the REST API.
+        # The resource and website modes then need no credentials.
+        # Leave file_input_confluence_paths empty to walk every top-level page in the export.
+        self.confluence_export_file: str = ""
         # These will be set by read_input():
         self.list_input_confluence_paths: List[str] = []
+        self.list_input_confluence_paths_by_mode: Dict[str, List[str]] = {}
         self.list_sensitive_terms: List[str] = []
         self.list_first_person_urls: List[str] = []
 
@@ -36,6 +75,7 @@ class Config(object):
         # newsletter: "newsletter_review_table"
         # resource: "resource_spreadsheet"
         # website: "hierarchical_outline", "sensitive_terms", "missing_metadata", "need_to_sync_wordpress"
+        # history: "sensitive_term_history"
         self.requested_output: List[str] = []
 
         # Flags:
@@ -45,14 +85,111 @@ class Config(object):
         # NOTE: This requires CHECK_LINKS_WORK to be True
         self.scan_links_for_sensitive_terms: bool = False
         self.confluence_api_comment_tracking_bug_exists: bool = True
+        # Set to True to read the comments on every story with a few CQL searches
+        # (`type=comment and container in (...)`), rather than a request per story
+        self.bulk_comment_retrieval: bool = False
+        # Set to True to fetch page bodies in storage format (the XHTML that pages are saved as),
+        # rather than the rendered view format, which is larger and slower to parse.
+        # They're parsed with expat, with images, links and tables read from Confluence's macros.
+        self.use_storage_format: bool = False
+        # Number of stories to process concurrently in newsletter mode
+        self.max_story_workers: int = 4
+        # Number of pages to fetch concurrently in the resource and website modes
+        self.max_fetch_workers: int = 8
+        # Number of processes to parse page bodies in (0 to parse on the fetching threads).
+        # Parsing holds the GIL, so it only runs in parallel in separate processes.
+        # By default, one core is left for fetching and writing.
+        self.max_parse_workers: int = max(0, (os.cpu_count() or 1) - 1)
+        # Most pages fetched but not yet written, to bound memory
+        self.max_pages_in_flight: int = 64
+        # Number of versions of each page to read concurrently in history mode
+        self.max_version_workers: int = 4
+        # Number of e3sm.org pages to read concurrently in resource mode
+        self.max_e3sm_org_workers: int = 8
+        # Set to True to update an existing resource_spreadsheet.csv, rather than regenerating it.
+        # Only pages that are new or whose Confluence version changed are re-read;
+        # existing rows keep their resource IDs and add dates.
+        self.merge_resource_spreadsheet: bool = False
+        # Set to True to resume an interrupted resource/website run. Pages recorded in
+        # output_dir's crawl_journal.jsonl are replayed, rather than fetched again.
+        self.resume: bool = False
+        # Set to a number of seconds to keep watching after the run (newsletter and website modes):
+        # every interval, pages modified since the last poll are found with a CQL search,
+        # and only those are re-read, to update the outputs in place. Stop with Ctrl-C.
+        self.watch_interval_seconds: float = 0
+        # Stop watching after this many polls (0 to watch until interrupted)
+        self.watch_max_polls: int = 0
+        # Limits for all outgoing requests, per host. Concurrency is lowered automatically on 429s.
+        self.requests_per_second_per_host: float = 10.0
+        self.max_concurrent_requests_per_host: int = 8
+        # Set to True to time each stage of each page, and count requests and cache hits.
+        # Written to metrics.json and metrics.txt in output_dir at the end of the run.
+        self.collect_metrics: bool = False
+
+        # Record/replay:
+        # Set cassette_mode to "record" to save every response to cassette_file (a .jsonl.gz file),
+        # or to "replay" to serve responses from it, with no network access or Confluence token.
+        self.cassette_file: str = ""
+        self.cassette_mode: str = ""
+        # Delay for each replayed response: cassette_latency_seconds plus
+        # cassette_latency_scale times the latency that was recorded for it
+        self.cassette_latency_seconds: float = 0.0
+        self.cassette_latency_scale: float = 0.0
+        # URL prefix -> replacement for every outgoing request, e.g.
+        # {"https://e3sm.atlassian.net": "http://127.0.0.1:8090"} for benchmarks/fake_confluence.py
+        self.url_rewrites: Dict[str, str] = {}
+
+        # Cache:
+        # Set to a directory to revalidate e3sm.org pages with conditional GETs (ETag/Last-Modified),
+        # rather than re-downloading them on every run.
+        self.e3sm_org_cache_dir: str = ""
+        # This will be set by read_input():
+        self.e3sm_org_cache: Optional[RevalidationCache] = None
+        # Inferred e3sm.org URLs are checked against every slug in this sitemap.
+        self.e3sm_org_sitemap_url: str = "https://e3sm.org/sitemap_index.xml"
+        # Set to a file to reuse the slug index across runs, until it's older than max_age_hours.
+        self.e3sm_org_slug_index_file: str = ""
+        self.e3sm_org_slug_index_max_age_hours: float = 24
+        # This will be set by run(), in newsletter mode:
+        self.e3sm_org_slug_index: Optional[E3SMOrgSlugIndex] = None
+
+        # Set to a file to keep the sensitive terms found in each page version across runs,
+        # so history mode only reads versions created since the last run.
+        self.version_term_cache_file: str = ""
+        # This will be set by read_input(), in history mode:
+        self.version_term_cache: Optional[VersionTermCache] = None
+
+        # This will be set by run(), if confluence_export_file is set:
+        self.confluence_export: Optional[ConfluenceExport] = None
+        # Story pages fetched by the walk, by page_id (None until fetched), for the newsletter mode to reuse.
+        # This will be set by run(), when the newsletter mode runs with another mode.
+        self.fetched_content: Optional[Dict[str, Optional[Dict]]] = None
+        # Comments on each story, by page_id. This will be set by run(), if bulk_comment_retrieval is set.
+        self.fetched_comments: Optional[Dict[str, List[Dict]]] = None
 
         # Counter:
         self.resource_counter: int = 0
 
+    def has_mode(self, *modes: str) -> bool:
+        return any(mode in self.modes for mode in modes)
+
     def read_input(self):
         if self.file_input_confluence_paths:
             with open(self.file_input_confluence_paths, "r", encoding="utf-8") as f:
                 self.list_input_confluence_paths = [line.strip() for line in f]
+        for mode in self.modes:
+            if mode not in WALK_MODES:
+                continue
+            if mode in self.file_input_confluence_paths_by_mode:
+                with open(
+                    self.file_input_confluence_paths_by_mode[mode],
+                    "r",
+                    encoding="utf-8",
+                ) as f:
+                    paths: List[str] = [line.strip() for line in f]
+            else:
+                paths = self.list_input_confluence_paths
+            self.list_input_confluence_paths_by_mode[mode] = paths
         if self.sensitive_terms_file:
             with open(self.sensitive_terms_file, "r", encoding="utf-8") as f:
                 terms: List[str] = [line.rstrip("\n").lower() for line in f]
@@ -61,19 +198,60 @@ class Config(object):
             with open(self.first_person_file, "r", encoding="utf-8") as f:
                 urls: List[str] = [line.rstrip("\n").lower() for line in f]
                 self.list_first_person_urls = sorted(urls)
+        if self.e3sm_org_cache_dir:
+            self.e3sm_org_cache = RevalidationCache(self.e3sm_org_cache_dir)
+        if self.watch_interval_seconds and (
+            self.has_mode("history", "resource") or self.confluence_export_file
+        ):
+            raise RuntimeError(
+                "watch_interval_seconds is only supported for the newsletter and website modes, with the REST API"
+            )
+        if self.has_mode("history"):
+            self.version_term_cache = VersionTermCache(
+                self.version_term_cache_file, self.list_sensitive_terms
+            )
 
 
 class ConfluenceCredentials(object):
-    def __init__(self):
+    def __init__(self, prompt: bool = True):
+        if not prompt:
+            # E.g., when replaying recorded responses, no request is actually sent.
+            self.email: str = ""
+            self.api_token = ""
+            return
         print(
             "If you do not have a Confluence API token, create one at https://id.atlassian.com/manage-profile/security/api-tokens. That page states 'Your API tokens need to be treated as securely as any other password.' Note that scopes will not work!! Even selecting all the classic read scopes, the request will fail with 401 Unauthorized. For added security, you can revoke your token after running this script."
         )
 
-        self.email: str = input("Confluence email: ")
+        self.email = input("Confluence email: ")
         self.api_token = getpass.getpass("Confluence API token: ")
 
 
 class ConfluencePage(object):
+    # Pages are kept until the end of a newsletter run, so they hold only what the outputs need.
+    __slots__ = (
+        "url",
+        "depth",
+        "page_id",
+        "reviewed_version",
+        "wordpress_version",
+        "review_status",
+        "title",
+        "current_version",
+        "findings",
+        "has_metadata",
+        "need_to_sync_wordpress",
+        "raw_wordpress_url",
+        "display_wordpress_url",
+        "page_owner",
+        "inline_resolved_comments",
+        "inline_open_comments",
+        "footer_resolved_comments",
+        "footer_open_comments",
+        "child_page_ids",
+        "term_versions",
+    )
+
     def __init__(self, url: str, depth: int = 0):
         self.url: str = url
         self.depth: int = depth
@@ -87,11 +265,6 @@ class ConfluencePage(object):
         else:
             raise RuntimeError(f"Could not extract `page_id` from url={url}")
 
-        base_url: str = "https://e3sm.atlassian.net/wiki"
-        self.content_url: str = f"{base_url}/rest/api/content/{page_id}"
-        self.comments_url: str = f"{base_url}/rest/api/content/{page_id}/child/comment"
-        self.child_pages_url = f"{base_url}/rest/api/content/{page_id}/child/page"
-
         # Set by read_page_list
         self.reviewed_version: int = 0
         self.wordpress_version: int = 0
@@ -102,8 +275,8 @@ class ConfluencePage(object):
         self.current_version: int = 0
 
         # Set by extract_data_from_content_url_body
-        self.main_html: Optional[ParsedHTML] = None
-        self.metadata_html: Optional[ParsedHTML] = None
+        self.findings: Optional[PageFindings] = None
+        self.has_metadata: bool = False
         self.need_to_sync_wordpress: bool = False
         self.raw_wordpress_url: Optional[str] = None
         self.display_wordpress_url: str = ""
@@ -118,30 +291,93 @@ class ConfluencePage(object):
         # Set by extract_data_from_child_pages_url
         self.child_page_ids: List[str] = []
 
+        # Set by sweep_page_versions: sensitive term -> versions it appears in, in order
+        self.term_versions: Dict[str, List[int]] = {}
+
+    @property
+    def content_url(self) -> str:
+        return f"https://e3sm.atlassian.net/wiki/rest/api/content/{self.page_id}"
+
+    @property
+    def comments_url(self) -> str:
+        return f"{self.content_url}/child/comment"
+
+    @property
+    def child_pages_url(self) -> str:
+        return f"{self.content_url}/child/page"
+
 
 class ParsedHTML(object):
-    def __init__(self, raw_html: str):
-        self.raw_html: str = raw_html
+    # Only lives while a page is being analyzed; the findings are kept in PageFindings.
+    __slots__ = (
+        "soup",
+        "text",
+        "text_lowercase",
+        "paragraphs",
+        "headers",
+        "links",
+        "img_srcs",
+        "num_imgs",
+        "table",
+    )
+
+    def __init__(self, raw_html: Optional[str] = None):
+        # raw_html is None for a page body in storage format: the fields are then
+        # filled in by utils_storage_format.StorageFormatParser, and soup stays None
+        self.soup: Optional[Any] = None
+        self.text: str = ""
+        self.text_lowercase: str = ""
+        self.paragraphs: List[str] = []
+        self.headers: List[str] = []
+        self.links: List[str] = []
+        self.img_srcs: List[str] = []
+        self.num_imgs: int = 0
+        # The first table's rows, in storage format (the view format's are read from soup)
+        self.table: Dict[str, str] = {}
+        if raw_html is None:
+            return
+
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(raw_html, "html.parser")
         self.soup = soup
 
         text = soup.get_text(separator="")
         self.text = html.unescape(text)
-        self.text_lowercase: str = self.text.lower()
+        self.text_lowercase = self.text.lower()
 
         p_tags = soup.find_all("p")
-        self.paragraphs: List[str] = [p.get_text(separator="") for p in p_tags]
+        self.paragraphs = [p.get_text(separator="") for p in p_tags]
 
         h3_tags = soup.find_all("h3")
-        self.headers: List[str] = [h3.get_text(separator="") for h3 in h3_tags]
+        self.headers = [h3.get_text(separator="") for h3 in h3_tags]
 
         a_tags = soup.find_all("a")
-        self.links: List[str] = [a.get("href") for a in a_tags if a.get("href")]
+        self.links = [a.get("href") for a in a_tags if a.get("href")]
 
         img_tags = soup.find_all("img")
-        img_srcs: List[str] = [img.get("src") for img in img_tags if img.get("src")]
-        self.img_srcs: List[str] = img_srcs
-        self.num_imgs = len(img_srcs)
+        self.img_srcs = [img.get("src") for img in img_tags if img.get("src")]
+        self.num_imgs = len(self.img_srcs)
+
+
+class PageFindings(object):
+    # What the outputs need from a page's main content, once its ParsedHTML is dropped
+    __slots__ = (
+        "headers",
+        "num_imgs",
+        "sensitive_terms",
+        "first_person_phrases",
+        "double_spaces_after_periods",
+        "img_mentions",
+        "img_resolutions",
+        "acronyms",
+        "linked_urls",
+    )
+
+    def __init__(self, main_html: Optional[ParsedHTML] = None):
+        # main_html is None for a page restored from a CrawlJournal
+        self.headers: List[str] = main_html.headers if main_html else []
+        self.num_imgs: int = main_html.num_imgs if main_html else 0
 
         # To be set later:
         self.sensitive_terms: Dict[str, int] = {}
@@ -154,12 +390,21 @@ class ParsedHTML(object):
 
 
 class LinkedURLs(object):
+    __slots__ = (
+        "links_with_sensitive_terms",
+        "e3sm_org_links_not_whitelisted",
+        "other_inaccessible_links",
+    )
+
     def __init__(
         self,
         links: List[str],
         scan_links_for_sensitive_terms: bool,
         list_sensitive_terms: List[str] = [],
+        cache: Optional[RevalidationCache] = None,
     ):
+        import requests  # type: ignore
+
         links_with_sensitive_terms: Dict[str, Dict[str, int]] = {}
         e3sm_org_links_not_whitelisted: List[str] = []
         other_inaccessible_links: List[str] = []
@@ -182,14 +427,14 @@ class LinkedURLs(object):
                     break
             if not known_inaccessible:
                 try:
-                    response = requests.get(link_url, timeout=10)
-                    response.raise_for_status()  # Raises HTTPError for 4xx/5xx responses
+                    web_page: WebPage = get_web_page(
+                        link_url, cache, priority=PRIORITY_BACKGROUND
+                    )
                     if scan_links_for_sensitive_terms:
-                        html_content = response.content
-                        soup = BeautifulSoup(html_content, "html.parser")
-                        text_content = soup.get_text(separator=" ", strip=True)
-                        sensitive_terms: Dict[str, int] = find_sensitive_terms(
-                            list_sensitive_terms, text_content.lower()
+                        sensitive_terms: Dict[str, int] = (
+                            find_sensitive_terms_in_web_page(
+                                web_page, list_sensitive_terms, cache
+                            )
                         )
                         if sensitive_terms:
                             links_with_sensitive_terms[link_url] = sensitive_terms
@@ -207,7 +452,6 @@ class LinkedURLs(object):
                 except Exception:
                     other_inaccessible_links.append(link_url)
 
-        self.all_links: List[str] = links
         self.links_with_sensitive_terms: Dict[str, Dict[str, int]] = (
             links_with_sensitive_terms
         )
@@ -215,26 +459,180 @@ class LinkedURLs(object):
         self.other_inaccessible_links: List[str] = other_inaccessible_links
 
 
+class TaggedStdout(object):
+    """
+    Stands in for sys.stdout while pages are processed concurrently.
+
+    Each line printed by a thread that has called set_tag() is prefixed with
+    that tag, and lines from different threads are never interleaved mid-line.
+    Threads without a tag (e.g., the main thread) print as usual.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def set_tag(self, tag: str):
+        self.local.tag = tag
+        self.local.buffer = ""
+
+    def clear_tag(self):
+        # Print any unfinished line, then stop tagging this thread's output.
+        if getattr(self.local, "buffer", ""):
+            self.write("\n")
+        self.local.tag = ""
+
+    def write(self, text: str) -> int:
+        tag: str = getattr(self.local, "tag", "")
+        if not tag:
+            with self.lock:
+                return self.stream.write(text)
+        # Only write complete lines, so each one can be tagged.
+        lines: List[str] = (self.local.buffer + text).split("\n")
+        self.local.buffer = lines.pop()
+        if lines:
+            with self.lock:
+                for line in lines:
+                    self.stream.write(f"{tag}{line}\n")
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __enter__(self) -> "TaggedStdout":
+        sys.stdout = self
+        return self
+
+    def __exit__(self, *exc_info):
+        sys.stdout = self.stream
+
+
+class CrawlJournal(object):
+    """
+    Every page a resource/website walk has written, appended to crawl_journal.jsonl
+    in output_dir as it's written, so an interrupted run can be resumed (Config.resume).
+
+    A resumed run replays journaled pages from their records, rather than fetching them,
+    so its outputs are identical to an uninterrupted run's. The pending frontier is
+    the children of journaled pages that aren't journaled themselves.
+    The first line records the settings the outputs depend on, which must match to resume.
+    """
+
+    def __init__(self, config: Config):
+        self.path: str = f"{config.output_dir}crawl_journal.jsonl"
+        self.records: Dict[str, Dict] = {}  # page_id -> record
+        header: Dict = {
+            "modes": config.modes,
+            "top_level_pages": config.list_input_confluence_paths_by_mode,
+            "requested_output": config.requested_output,
+            "sensitive_terms": config.list_sensitive_terms,
+            "confluence_export_file": config.confluence_export_file,
+        }
+        if config.resume and os.path.exists(self.path):
+            self.read(header)
+            print(f"Resuming from {self.path}: {len(self.records)} pages already done")
+        else:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(header) + "\n")
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def read(self, header: Dict):
+        with open(self.path, "rb") as f:
+            lines: List[bytes] = f.readlines()
+        if not lines or json.loads(lines[0]) != json.loads(json.dumps(header)):
+            raise RuntimeError(
+                f"{self.path} is from a run with different settings; remove it, or set resume = False"
+            )
+        good_bytes: int = len(lines[0])
+        for line in lines[1:]:
+            try:
+                record: Dict = json.loads(line)
+            except ValueError:
+                break  # A record cut off when the run was interrupted
+            self.records[record["page_id"]] = record
+            good_bytes += len(line)
+        # Drop anything after the last complete record, so new records follow it
+        with open(self.path, "r+b") as f:
+            f.truncate(good_bytes)
+
+    def restore(self, page: ConfluencePage, modes: List[str]) -> bool:
+        # Fill in `page` from its record, if it was written by the same modes
+        record: Optional[Dict] = self.records.get(page.page_id)
+        if not record or record["modes"] != modes:
+            return False
+        restore_page(page, record)
+        return True
+
+    def add(self, page: ConfluencePage, modes: List[str]):
+        # Call once the page's results are written. Pages restored from the journal
+        # are already in it; new records are only written, as the walk keeps its own.
+        if page.page_id in self.records:
+            return
+        self.file.write(json.dumps(get_page_record(page, modes)) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def remove(self):
+        # Once the walk is finished, there is nothing to resume
+        self.close()
+        os.remove(self.path)
+
+
 # Functions used by all modes #################################################
+def get_page_record(page: ConfluencePage, modes: List[str]) -> Dict:
+    # What the walk modes' outputs need from a page, as JSON
+    return {
+        "page_id": page.page_id,
+        "modes": modes,
+        "title": page.title,
+        "current_version": page.current_version,
+        "child_page_ids": page.child_page_ids,
+        "has_metadata": page.has_metadata,
+        "need_to_sync_wordpress": page.need_to_sync_wordpress,
+        "page_owner": page.page_owner,
+        "sensitive_terms": page.findings.sensitive_terms if page.findings else {},
+        "term_versions": page.term_versions,
+    }
+
+
+def restore_page(page: ConfluencePage, record: Dict):
+    # The reverse of get_page_record
+    page.title = record["title"]
+    page.current_version = record["current_version"]
+    page.child_page_ids = record["child_page_ids"]
+    page.has_metadata = record["has_metadata"]
+    page.need_to_sync_wordpress = record["need_to_sync_wordpress"]
+    page.page_owner = record["page_owner"]
+    page.findings = PageFindings()
+    page.findings.sensitive_terms = record["sensitive_terms"]
+    page.term_versions = record["term_versions"]
+
+
 def get_json(
     credentials: ConfluenceCredentials,
     page_id: str,
     url: str,
     params: Dict[str, str] = {},
 ) -> Dict:
-    if params:
-        resp = requests.get(
+    # Confluence API calls go ahead of any link or image checks waiting on the same host.
+    with METRICS.stage("confluence_api"):
+        resp = http_get(
             url,
-            auth=HTTPBasicAuth(credentials.email, credentials.api_token),
+            PRIORITY_CONFLUENCE_API,
+            auth=(credentials.email, credentials.api_token),  # HTTP basic auth
             params=params,
         )
-    else:
-        resp = requests.get(
-            url, auth=HTTPBasicAuth(credentials.email, credentials.api_token)
+    if resp.status_code == 429:
+        # The scheduler already retried, so give up rather than parse the error body.
+        raise RuntimeError(
+            f"Rate limited by Confluence on url={url} for page_id={page_id}, even after retrying"
         )
     try:
         data = resp.json()
-    except RuntimeError as e:
+    except ValueError as e:
         print(f"Response from url={url} for page_id={page_id} is not valid JSON!")
         print("Status code:", resp.status_code)
         print("Response text:", resp.text)
@@ -242,10 +640,30 @@ def get_json(
     return data
 
 
+def get_all_results(
+    credentials: ConfluenceCredentials,
+    page_id: str,
+    url: str,
+    params: Dict[str, str] = {},
+) -> List[Dict]:
+    # Confluence returns lists a page at a time (25 results by default),
+    # so follow `_links.next` until every result is read.
+    data: Dict = get_json(credentials, page_id, url, params=params)
+    results: List[Dict] = data.get("results", [])
+    while data.get("_links", {}).get("next"):
+        data = get_json(
+            credentials, page_id, f"{CONFLUENCE_WIKI_URL}{data['_links']['next']}"
+        )
+        results += data.get("results", [])
+    return results
+
+
 def split_html(raw_html: str) -> Tuple[ParsedHTML, Optional[ParsedHTML]]:
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(raw_html, "html.parser")
     # Find the span with the unique marker text
-    marker_span = soup.find("span", string=lambda s: s and "END OF e3sm.or page" in s)
+    marker_span = soup.find("span", string=lambda s: s and METADATA_MARKER in s)
 
     if marker_span:
         marker_str = str(marker_span)
@@ -271,13 +689,49 @@ def find_sensitive_terms(
     return result
 
 
-def remove_output_files(config: Config):
+def find_sensitive_terms_in_html(
+    html_content: bytes, list_sensitive_terms: List[str]
+) -> Dict[str, int]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    text_content = soup.get_text(separator=" ", strip=True)
+    return find_sensitive_terms(list_sensitive_terms, text_content.lower())
+
+
+def find_sensitive_terms_in_web_page(
+    web_page: WebPage,
+    list_sensitive_terms: List[str],
+    cache: Optional[RevalidationCache] = None,
+) -> Dict[str, int]:
+    terms_key: str = get_terms_key(list_sensitive_terms)
+    if web_page.not_modified and terms_key in web_page.term_counts:
+        # The page hasn't changed since we last counted, so skip parsing entirely.
+        METRICS.record_cache("term_counts", hit=True)
+        return web_page.term_counts[terms_key]
+    if cache:
+        METRICS.record_cache("term_counts", hit=False)
+    sensitive_terms: Dict[str, int] = find_sensitive_terms_in_html(
+        web_page.content, list_sensitive_terms
+    )
+    if cache:
+        web_page.term_counts[terms_key] = sensitive_terms
+        cache.save(web_page, save_content=not web_page.not_modified)
+    return sensitive_terms
+
+
+def remove_output_files(config: Config, modes: Optional[List[str]] = None):
+    # modes: only remove these modes' outputs (default: every output of the run)
+    remove_all: bool = modes is None
+    if modes is None:
+        modes = config.modes
     files_to_remove: List[str] = []
-    if config.mode == "newsletter":
+    if "newsletter" in modes:
         files_to_remove.append(f"{config.output_dir}version_check_results.md")
-    if config.mode == "resource":
+    if ("resource" in modes) and not config.merge_resource_spreadsheet:
         files_to_remove.append(f"{config.output_dir}resource_spreadsheet.csv")
-    if config.mode == "website":
+        files_to_remove.append(f"{config.output_dir}resource_spreadsheet_versions.json")
+    if "website" in modes:
         if "hierarchical_outline" in config.requested_output:
             files_to_remove.append(f"{config.output_dir}hierarchical_outline.txt")
         if "sensitive_terms" in config.requested_output:
@@ -286,6 +740,12 @@ def remove_output_files(config: Config):
             files_to_remove.append(f"{config.output_dir}missing_metadata.txt")
         if "need_to_sync_wordpress" in config.requested_output:
             files_to_remove.append(f"{config.output_dir}need_to_sync_wordpress.txt")
+    if "history" in modes:
+        if "sensitive_term_history" in config.requested_output:
+            files_to_remove.append(f"{config.output_dir}sensitive_term_history.txt")
+    if config.collect_metrics and remove_all:
+        files_to_remove.append(f"{config.output_dir}metrics.json")
+        files_to_remove.append(f"{config.output_dir}metrics.txt")
     for filename in files_to_remove:
         try:
             if os.path.exists(filename):
@@ -348,11 +808,185 @@ def map_confluence_to_e3sm(url: str, page_title: str = "") -> str:
     return new_url
 
 
+# Functions used by e3sm_org_reviewer ########################################
+def get_sitemap_urls(sitemap_url: str, visited: Optional[Set[str]] = None) -> List[str]:
+    """
+    Return every page URL listed in a sitemap.
+
+    Sitemap indexes (e.g., https://e3sm.org/sitemap_index.xml) are followed recursively.
+    """
+    if visited is None:
+        visited = set()
+    if sitemap_url in visited:
+        return []
+    visited.add(sitemap_url)
+    response = http_get(sitemap_url, timeout=10)
+    response.raise_for_status()  # Raises HTTPError for 4xx/5xx responses
+    root = ET.fromstring(response.content)
+    # Tags are namespaced, e.g. "{http://www.sitemaps.org/schemas/sitemap/0.9}loc".
+    # Only look at <url><loc> and <sitemap><loc>, not nested ones like <image:image><image:loc>.
+    locs: List[str] = [
+        element.text.strip()
+        for entry in root
+        for element in entry
+        if element.tag.split("}")[-1] == "loc" and element.text
+    ]
+    page_urls: List[str] = []
+    if root.tag.endswith("sitemapindex"):
+        for nested_sitemap_url in locs:
+            page_urls += get_sitemap_urls(nested_sitemap_url, visited)
+    else:
+        page_urls = locs
+    # Remove duplicates, preserving order
+    return list(dict.fromkeys(page_urls))
+
+
+def find_sensitive_terms_on_web_page(
+    url: str,
+    list_sensitive_terms: List[str],
+    cache: Optional[RevalidationCache] = None,
+) -> Dict[str, int]:
+    web_page: WebPage = get_web_page(url, cache)
+    return find_sensitive_terms_in_web_page(web_page, list_sensitive_terms, cache)
+
+
+def scan_web_pages_for_sensitive_terms(
+    urls: List[str],
+    list_sensitive_terms: List[str],
+    max_workers: int = 8,
+    cache: Optional[RevalidationCache] = None,
+) -> Iterator[Tuple[str, Dict[str, int]]]:
+    """
+    Fetch pages concurrently, yielding (url, sensitive_terms) as each page finishes.
+
+    Pages that cannot be accessed yield an empty dict.
+    Requests per host are limited by the scheduler in utils_http (see set_scheduler).
+    """
+
+    def scan(url: str) -> Dict[str, int]:
+        try:
+            return find_sensitive_terms_on_web_page(url, list_sensitive_terms, cache)
+        except Exception as e:
+            print(f"  Could not access {url}: {e}")
+            return {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(scan, url): url for url in urls}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+# e3sm.org slug index, used by newsletter mode ################################
+class E3SMOrgSlugIndex(object):
+    """
+    Every live e3sm.org page, keyed by slug (the last segment of its path).
+
+    Built once per run from the sitemap, so checking an inferred e3sm.org URL
+    is a dictionary lookup rather than a request.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.urls_by_slug: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        for url in urls:
+            self.add(url)
+
+    def add(self, url: str):
+        slug: str = get_slug(url)
+        if slug:
+            with self.lock:
+                self.urls_by_slug.setdefault(slug, url)
+
+    def get_url(self, url: str) -> Optional[str]:
+        return self.urls_by_slug.get(get_slug(url))
+
+    def get_closest_urls(self, url: str, n: int = 3) -> List[str]:
+        with self.lock:
+            slugs: List[str] = list(self.urls_by_slug)
+        matches: List[str] = difflib.get_close_matches(get_slug(url), slugs, n=n)
+        return [self.urls_by_slug[slug] for slug in matches]
+
+
+def get_slug(url: str) -> str:
+    segments: List[str] = [
+        segment for segment in urlparse(url).path.split("/") if segment
+    ]
+    return unquote(segments[-1]).lower() if segments else ""
+
+
+def build_e3sm_org_slug_index(
+    sitemap_url: str, index_file: str = "", max_age_hours: float = 24
+) -> E3SMOrgSlugIndex:
+    # `index_file` is optional. If it's recent enough, the sitemap isn't read at all.
+    if index_file and os.path.exists(index_file):
+        age_hours: float = (time.time() - os.path.getmtime(index_file)) / 3600
+        if age_hours < max_age_hours:
+            try:
+                with open(index_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("sitemap_url") == sitemap_url:
+                    return E3SMOrgSlugIndex(data.get("urls", []))
+            except (OSError, ValueError):
+                pass  # Rebuild it
+    urls: List[str] = get_sitemap_urls(sitemap_url)
+    if index_file:
+        os.makedirs(os.path.dirname(index_file) or ".", exist_ok=True)
+        data = {"sitemap_url": sitemap_url, "urls": urls}
+        write_atomically(index_file, json.dumps(data).encode("utf-8"))
+    return E3SMOrgSlugIndex(urls)
+
+
+# Version term cache, used by history mode ####################################
+class VersionTermCache(object):
+    """
+    The sensitive terms found in each page version already read, by page_id and version,
+    saved to Config.version_term_cache_file between runs.
+
+    A version never changes once it's saved, so later runs only read newer versions.
+    Counts are only valid for the list of terms they were found with,
+    so the cache starts over if the list changes.
+    """
+
+    def __init__(self, path: str, list_sensitive_terms: List[str]):
+        self.path: str = path
+        self.terms_key: str = get_terms_key(list_sensitive_terms)
+        # page_id -> version -> term -> count
+        self.pages: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("terms_key") == self.terms_key:
+                    self.pages = data.get("pages", {})
+            except (OSError, ValueError):
+                pass  # Start over
+
+    def get(self, page_id: str, version: int) -> Optional[Dict[str, int]]:
+        with self.lock:
+            return self.pages.get(page_id, {}).get(str(version))
+
+    def set(self, page_id: str, version: int, term_counts: Dict[str, int]):
+        with self.lock:
+            self.pages.setdefault(page_id, {})[str(version)] = term_counts
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            data: Dict = {"terms_key": self.terms_key, "pages": self.pages}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            write_atomically(self.path, json.dumps(data).encode("utf-8"))
+
+
 # Debugging ###################################################################
 def print_json(data: Dict):
     print(json.dumps(data, indent=4))
 
 
 def print_html(html: ParsedHTML):
+    if html.soup is None:
+        print(html.text)  # Parsed from storage format
+        return
     pretty_html: str = html.soup.prettify()
     print(pretty_html)
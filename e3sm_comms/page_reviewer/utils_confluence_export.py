@@ -0,0 +1,225 @@
+import re
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+import zipfile
+from html import escape, unescape
+from typing import IO, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote, quote_plus
+
+CONFLUENCE_WIKI_URL: str = "https://e3sm.atlassian.net/wiki"
+# Name of the object graph inside a Confluence XML space export
+ENTITIES_FILE: str = "entities.xml"
+# An image or link macro in storage format, e.g.
+# <ac:image><ri:attachment ri:filename="figure.png" /></ac:image>
+STORAGE_MACRO_PATTERN = re.compile(r"<(ac:image|ac:link)\b[^>]*>(.*?)</\1>", re.DOTALL)
+# The macro's resource identifier: its first ri: element
+STORAGE_RESOURCE_PATTERN = re.compile(r"<(ri:[\w-]+)\b([^>]*)>")
+STORAGE_ATTRIBUTE_PATTERN = re.compile(r'([\w:-]+)="([^"]*)"')
+# Markup around a link macro's text
+STORAGE_LINK_MARKUP_PATTERN = re.compile(
+    r"<ri:[^>]*>|</ri:[\w-]+>|</?ac:(?:plain-text-)?link-body\b[^>]*>"
+)
+STORAGE_CDATA_PATTERN = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.DOTALL)
+
+
+# Classes #####################################################################
+class ExportedPage(object):
+    __slots__ = ("page_id", "title", "version", "parent_id", "position")
+
+    def __init__(self, page_id: str, title: str, version: int, parent_id: str):
+        self.page_id: str = page_id
+        self.title: str = title
+        self.version: int = version
+        self.parent_id: str = parent_id
+        # Manual ordering among siblings, if the page was moved in the page tree
+        self.position: Optional[int] = None
+
+
+class ConfluenceExport(object):
+    """
+    The current pages of a Confluence XML space export (a zip containing entities.xml),
+    so a space can be reviewed without any REST calls or credentials.
+
+    entities.xml is streamed out of the zip, not extracted. Page titles, versions
+    and the page tree are kept in memory; bodies are spooled to a temporary file
+    and read back one page at a time.
+
+    Bodies are in storage format rather than the rendered (view) format,
+    so image macros are rewritten as <img> tags, with the same src as a rendered page.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self.pages: Dict[str, ExportedPage] = {}
+        # parent page_id -> child page_ids, in Confluence's order
+        self.children: Dict[str, List[str]] = {}
+        self.body_file: IO[bytes] = tempfile.TemporaryFile()
+        # content id -> (offset, length) in body_file
+        self.body_spans: Dict[str, Tuple[int, int]] = {}
+        self.lock = threading.Lock()
+        with zipfile.ZipFile(path) as archive:
+            if ENTITIES_FILE not in archive.namelist():
+                raise RuntimeError(
+                    f"{path} has no {ENTITIES_FILE}; only XML space exports are supported"
+                )
+            with archive.open(ENTITIES_FILE) as f:
+                self.read_entities(f)
+        for page in self.pages.values():
+            if page.parent_id in self.pages:
+                self.children.setdefault(page.parent_id, []).append(page.page_id)
+        for child_page_ids in self.children.values():
+            # Manually ordered pages first, then alphabetically, as in Confluence
+            child_page_ids.sort(key=self.get_sort_key)
+        print(f"Read {len(self.pages)} pages from {path}")
+
+    def read_entities(self, f: IO[bytes]):
+        # Page versions that are not current: history, drafts and trash
+        skipped_ids: Set[str] = set()
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event != "end" or elem.tag != "object":
+                continue
+            object_class: str = elem.get("class", "")
+            if object_class == "Page":
+                page: Optional[ExportedPage] = read_page(elem)
+                if page:
+                    self.pages[page.page_id] = page
+                else:
+                    skipped_ids.add(get_id(elem))
+            elif object_class == "BodyContent":
+                content_id, body = read_body(elem)
+                if content_id and content_id not in skipped_ids:
+                    self.spool_body(content_id, body)
+            # Objects are independent, so nothing needs to stay in the tree
+            root.clear()
+
+    def spool_body(self, content_id: str, body: str):
+        data: bytes = body.encode("utf-8")
+        offset: int = self.body_file.seek(0, 2)
+        self.body_file.write(data)
+        self.body_spans[content_id] = (offset, len(data))
+
+    def get_body(self, page_id: str) -> str:
+        if page_id not in self.body_spans:
+            return ""
+        offset, length = self.body_spans[page_id]
+        with self.lock:
+            self.body_file.seek(offset)
+            data: bytes = self.body_file.read(length)
+        return storage_to_view(data.decode("utf-8"), page_id)
+
+    def get_sort_key(self, page_id: str) -> Tuple[int, int, str]:
+        page: ExportedPage = self.pages[page_id]
+        if page.position is None:
+            return (1, 0, page.title.lower())
+        return (0, page.position, page.title.lower())
+
+    # Responses shaped like the REST API's, so pages are handled the same either way
+    def get_content(self, page_id: str) -> Dict:
+        if page_id not in self.pages:
+            raise RuntimeError(f"page_id={page_id} is not in {self.path}")
+        page: ExportedPage = self.pages[page_id]
+        body: Dict[str, str] = {"value": self.get_body(page_id)}
+        return {
+            "id": page_id,
+            "type": "page",
+            "title": page.title,
+            "version": {"number": page.version},
+            # Exports hold the storage format, which the view format's parser also reads
+            "body": {"storage": body, "view": body},
+        }
+
+    def get_child_pages(self, page_id: str) -> Dict:
+        return {"results": [{"id": i} for i in self.children.get(page_id, [])]}
+
+    def get_root_page_ids(self) -> List[str]:
+        # Pages without a parent, e.g. the space's home page
+        root_page_ids: List[str] = [
+            page.page_id
+            for page in self.pages.values()
+            if page.parent_id not in self.pages
+        ]
+        return sorted(root_page_ids, key=self.get_sort_key)
+
+    def close(self):
+        self.body_file.close()
+
+
+# Functions ###################################################################
+def get_id(elem: ET.Element) -> str:
+    id_elem: Optional[ET.Element] = elem.find("id")
+    return (id_elem.text or "").strip() if id_elem is not None else ""
+
+
+def get_properties(elem: ET.Element) -> Dict[str, ET.Element]:
+    return {prop.get("name", ""): prop for prop in elem.findall("property")}
+
+
+def read_page(elem: ET.Element) -> Optional[ExportedPage]:
+    # Return None unless this is the current version of a page
+    properties: Dict[str, ET.Element] = get_properties(elem)
+    if "originalVersion" in properties:
+        return None
+    status: ET.Element = properties.get("contentStatus", ET.Element("property"))
+    if (status.text or "current").strip() != "current":
+        return None
+    page = ExportedPage(
+        get_id(elem),
+        get_property_text(properties, "title"),
+        int(get_property_text(properties, "version") or 1),
+        get_id(properties["parent"]) if "parent" in properties else "",
+    )
+    position: str = get_property_text(properties, "position")
+    if position:
+        page.position = int(position)
+    return page
+
+
+def read_body(elem: ET.Element) -> Tuple[str, str]:
+    # Return (content id, storage-format body), or ("", "") if not a page body
+    properties: Dict[str, ET.Element] = get_properties(elem)
+    content: Optional[ET.Element] = properties.get("content")
+    if content is None or content.get("class") != "Page":
+        return "", ""
+    return get_id(content), get_property_text(properties, "body")
+
+
+def get_property_text(properties: Dict[str, ET.Element], name: str) -> str:
+    prop: Optional[ET.Element] = properties.get(name)
+    return (prop.text or "") if prop is not None else ""
+
+
+def get_resource_url(tag: str, attrs: Dict[str, str], page_id: str) -> str:
+    # The URL the view format would use for a storage-format resource identifier
+    # (attribute values unescaped), or "" if there's none
+    if tag == "ri:url":
+        return attrs.get("ri:value", "")
+    if tag == "ri:attachment" and attrs.get("ri:filename"):
+        return f"/wiki/download/attachments/{page_id}/{quote(attrs['ri:filename'])}"
+    if tag == "ri:page" and attrs.get("ri:content-title"):
+        space: str = attrs.get("ri:space-key", "EPWCD")
+        return f"{CONFLUENCE_WIKI_URL}/display/{space}/{quote_plus(attrs['ri:content-title'])}"
+    return ""
+
+
+def storage_to_view(body: str, page_id: str) -> str:
+    # Image and link macros are the only storage-format constructs the reviewers need rewritten:
+    # everything else they read (paragraphs, headers, tables) is plain XHTML.
+    def replace_macro(match: re.Match) -> str:
+        url: str = ""
+        resource = STORAGE_RESOURCE_PATTERN.search(match.group(2))
+        if resource:
+            attrs: Dict[str, str] = {
+                name: unescape(value)
+                for name, value in STORAGE_ATTRIBUTE_PATTERN.findall(resource.group(2))
+            }
+            url = escape(get_resource_url(resource.group(1), attrs, page_id))
+        if match.group(1) == "ac:image":
+            return f'<img src="{url}" />' if url else ""
+        text: str = STORAGE_LINK_MARKUP_PATTERN.sub("", match.group(2))
+        text = STORAGE_CDATA_PATTERN.sub(lambda cdata: escape(cdata.group(1)), text)
+        return f'<a href="{url}">{text}</a>' if url else text
+
+    return STORAGE_MACRO_PATTERN.sub(replace_macro, body)
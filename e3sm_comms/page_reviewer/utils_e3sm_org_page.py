@@ -0,0 +1,88 @@
+from typing import Any, Dict, Set
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+
+# Classes #####################################################################
+class E3SMOrgPageStrainer(SoupStrainer):
+    """
+    Only builds the elements that extract_page_info reads.
+
+    Everything else on an e3sm.org page (theme markup, scripts, footers, the
+    article body) is tokenized but never turned into BeautifulSoup objects.
+    """
+
+    classes_by_tag: Dict[str, Set[str]] = {
+        "div": {"breadcrumb"},
+        "h1": {"entry-title"},
+        "li": {"id", "categories"},
+    }
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        # Only called for top-level tags; descendants of an allowed tag are always kept.
+        if not attrs:
+            return False
+        if name in self.classes_by_tag:
+            classes = attrs.get("class") or ""
+            if isinstance(classes, str):
+                classes = classes.split()
+            return not self.classes_by_tag[name].isdisjoint(classes)
+        if name == "a":
+            href = attrs.get("href")
+            return isinstance(href, str) and "mailchi.mp" in href
+        return False
+
+    def allow_string_creation(self, string) -> bool:
+        # Top-level strings are never read.
+        return False
+
+
+# Functions ###################################################################
+def extract_page_info_from_html(html_content) -> Dict[str, Any]:
+    # Equivalent to extract_page_info(BeautifulSoup(html_content, "html.parser")), but much faster.
+    soup = BeautifulSoup(html_content, "html.parser", parse_only=E3SMOrgPageStrainer())
+    return extract_page_info(soup)
+
+
+def extract_page_info(soup) -> Dict[str, Any]:
+    info: Dict[str, Any] = {
+        "hierarchy_parts": None,
+        "title": None,
+        "publication_date": None,
+        "categories": [],
+        "newsletter_edition": None,
+    }
+
+    # Extract page hierarchy from breadcrumb
+    breadcrumb = soup.find("div", class_="breadcrumb")
+    if breadcrumb:
+        # Get all span texts from breadcrumb links
+        spans = breadcrumb.find_all("span")
+        hierarchy_parts = [span.get_text(strip=True) for span in spans]
+        info["hierarchy_parts"] = hierarchy_parts
+
+    # Extract title
+    title_tag = soup.find("h1", class_="entry-title")
+    if title_tag:
+        info["title"] = title_tag.get_text(strip=True)
+
+    # Extract publication date
+    date_li = soup.find("li", class_="id")
+    if date_li:
+        info["publication_date"] = date_li.get_text(strip=True)
+
+    # Extract categories
+    categories_li = soup.find("li", class_="categories")
+    if categories_li:
+        category_links = categories_li.find_all("a")
+        info["categories"] = [
+            link.get_text(strip=True).lower() for link in category_links
+        ]
+
+    # Extract newsletter edition
+    # Look for links containing "E3SM Floating Points" or similar newsletter text
+    newsletter_link = soup.find("a", href=lambda x: x and "mailchi.mp" in x)
+    if newsletter_link:
+        info["newsletter_edition"] = newsletter_link.get_text(strip=True)
+
+    return info
@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from e3sm_comms.page_reviewer.utils_base import (
+    Config,
+    ConfluenceCredentials,
+    ConfluencePage,
+    ParsedHTML,
+    VersionTermCache,
+    find_sensitive_terms,
+    get_all_results,
+    get_json,
+    split_html,
+)
+from e3sm_comms.page_reviewer.utils_metrics import METRICS
+from e3sm_comms.page_reviewer.utils_storage_format import split_storage_format
+
+
+# Functions: reading versions #################################################
+def sweep_page_versions(
+    config: Config, credentials: ConfluenceCredentials, page: ConfluencePage
+):
+    # Find the sensitive terms in every version of the page, reading only versions
+    # that aren't cached yet, concurrently. Sets page.term_versions.
+    cache: VersionTermCache = config.version_term_cache or VersionTermCache(
+        "", config.list_sensitive_terms
+    )
+    versions: List[int] = list_versions(credentials, page)
+    unread: List[int] = [v for v in versions if cache.get(page.page_id, v) is None]
+    for v in versions:
+        METRICS.record_cache("version_terms", hit=v not in unread)
+    if unread:
+        print(f"  Reading {len(unread)} of {len(versions)} versions")
+
+        def read_version(version: int):
+            with METRICS.page(page.page_id):
+                cache.set(
+                    page.page_id,
+                    version,
+                    find_sensitive_terms_in_version(config, credentials, page, version),
+                )
+
+        with ThreadPoolExecutor(max_workers=config.max_version_workers) as executor:
+            # Re-raise any exception from reading a version
+            list(executor.map(read_version, unread))
+    term_versions: Dict[str, List[int]] = {}
+    for v in sorted(versions):
+        for term in cache.get(page.page_id, v) or {}:
+            term_versions.setdefault(term, []).append(v)
+    page.term_versions = term_versions
+
+
+def list_versions(
+    credentials: ConfluenceCredentials, page: ConfluencePage
+) -> List[int]:
+    # Includes the current version
+    results: List[Dict] = get_all_results(
+        credentials, page.page_id, f"{page.content_url}/version"
+    )
+    return [result["number"] for result in results if "number" in result]
+
+
+def find_sensitive_terms_in_version(
+    config: Config,
+    credentials: ConfluenceCredentials,
+    page: ConfluencePage,
+    version: int,
+) -> Dict[str, int]:
+    body_format: str = "storage" if config.use_storage_format else "view"
+    data: Dict = get_json(
+        credentials,
+        page.page_id,
+        f"{page.content_url}/version/{version}",
+        params={"expand": f"content.body.{body_format}"},
+    )
+    content: Optional[Dict] = data.get("content")
+    if content is None:
+        raise RuntimeError(
+            f"Response for page_id={page.page_id} version={version} does not contain 'content'. Full response: {data}"
+        )
+    raw_html: str = content.get("body", {}).get(body_format, {}).get("value", "")
+    main_html: ParsedHTML
+    with METRICS.stage("parse"):
+        if config.use_storage_format:
+            main_html, _ = split_storage_format(raw_html, page.page_id)
+        else:
+            main_html, _ = split_html(raw_html)
+    # Same as the website mode's sensitive_terms, for the current version
+    with METRICS.stage("sensitive_terms"):
+        return find_sensitive_terms(
+            config.list_sensitive_terms, main_html.text_lowercase
+        )
+
+
+# Functions: output ###########################################################
+def write_term_history(config: Config, page: ConfluencePage):
+    if "sensitive_term_history" in config.requested_output:
+        # Append if sensitive terms were ever found.
+        if page.term_versions:
+            line_id: str = f"{page.page_id}: {page.title}"
+            with open(
+                f"{config.output_dir}sensitive_term_history.txt", "a", encoding="utf-8"
+            ) as f:
+                for term, versions in sorted(page.term_versions.items()):
+                    f.write(
+                        f"{line_id} -- {term}: first in version {versions[0]}, last in version {versions[-1]} "
+                        f"(current version: {page.current_version})\n"
+                    )
@@ -0,0 +1,525 @@
+import base64
+import gzip
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Heavy third-party packages are imported where they're used, not at module level,
+# so the CLIs start quickly (see benchmarks/bench_import_time.py).
+if TYPE_CHECKING:
+    import requests  # type: ignore
+
+from e3sm_comms.page_reviewer.utils_metrics import METRICS
+
+
+# Classes #####################################################################
+class WebPage(object):
+    def __init__(
+        self, url: str, content: bytes, etag: str = "", last_modified: str = ""
+    ):
+        self.url: str = url
+        self.content: bytes = content
+        # Validators sent back to the server on the next request
+        self.etag: str = etag
+        self.last_modified: str = last_modified
+        # Results computed from `content`, keyed by get_terms_key(list_sensitive_terms)
+        self.term_counts: Dict[str, Dict[str, int]] = {}
+        # True if the server answered 304 Not Modified, i.e., `content` came from the cache
+        self.not_modified: bool = False
+
+
+class RevalidationCache(object):
+    """
+    On-disk cache of web pages, revalidated with conditional GETs.
+
+    Each page is stored as two files named by the hash of its URL:
+    `<hash>.body` holds the raw content, `<hash>.json` holds the validators
+    (ETag, Last-Modified) and any term counts computed from that content.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir: str = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_path(self, url: str, extension: str) -> str:
+        key: str = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.{extension}")
+
+    def load(self, url: str) -> Optional[WebPage]:
+        try:
+            with open(self.get_path(url, "json"), "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            with open(self.get_path(url, "body"), "rb") as f:
+                content: bytes = f.read()
+        except (OSError, ValueError):
+            return None
+        page = WebPage(
+            url, content, metadata.get("etag", ""), metadata.get("last_modified", "")
+        )
+        page.term_counts = metadata.get("term_counts", {})
+        return page
+
+    def save(self, page: WebPage, save_content: bool = True):
+        if not (page.etag or page.last_modified):
+            # Without validators, the page can never be revalidated, so don't bother storing it.
+            return
+        if save_content:
+            write_atomically(self.get_path(page.url, "body"), page.content)
+        metadata = {
+            "url": page.url,
+            "etag": page.etag,
+            "last_modified": page.last_modified,
+            "term_counts": page.term_counts,
+        }
+        write_atomically(
+            self.get_path(page.url, "json"), json.dumps(metadata).encode("utf-8")
+        )
+
+
+# Request scheduling ##########################################################
+# Priorities for http_get, lowest first
+PRIORITY_CONFLUENCE_API: int = 0
+PRIORITY_DEFAULT: int = 1
+PRIORITY_BACKGROUND: int = 2  # Link and image checks
+
+
+class HostState(object):
+    # Rate and concurrency limits for one host. Only accessed with RequestScheduler.condition held.
+    def __init__(self, requests_per_second: float, burst: int, max_concurrency: int):
+        # Token bucket
+        self.requests_per_second: float = requests_per_second
+        self.burst: int = burst
+        self.tokens: float = burst
+        self.last_refill: float = time.monotonic()
+        # AIMD concurrency limit: halved on a 429, grown back by about 1 per `limit` successes
+        self.limit: float = max_concurrency
+        self.in_flight: int = 0
+        self.last_decrease: float = 0.0
+        # Set from Retry-After and X-RateLimit-* headers
+        self.blocked_until: float = 0.0
+        # Heap of (priority, sequence number) for the requests waiting on this host
+        self.waiting: List[Tuple[int, int]] = []
+
+    def refill(self, now: float):
+        elapsed: float = now - self.last_refill
+        self.tokens = min(self.burst, self.tokens + elapsed * self.requests_per_second)
+        self.last_refill = now
+
+
+class RequestScheduler(object):
+    """
+    Schedules all outgoing HTTP requests, per host.
+
+    Each host has a token bucket (`requests_per_second`, up to `burst` at once)
+    and a concurrency limit that is halved on a 429 and grows back while requests succeed.
+    `Retry-After` and `X-RateLimit-*` headers pause the host for every caller.
+    Waiting requests are sent in priority order (see PRIORITY_*).
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = 10.0,
+        burst: int = 10,
+        max_concurrency_per_host: int = 8,
+        min_concurrency_per_host: int = 1,
+        max_retries: int = 5,
+        max_backoff_seconds: float = 60.0,
+        cassette: Optional["Cassette"] = None,
+        url_rewrites: Optional[Dict[str, str]] = None,
+    ):
+        self.requests_per_second: float = requests_per_second
+        self.burst: int = burst
+        self.max_concurrency: int = max_concurrency_per_host
+        self.min_concurrency: int = min_concurrency_per_host
+        self.max_retries: int = max_retries
+        self.max_backoff_seconds: float = max_backoff_seconds
+        # If set, responses are recorded to it, or replayed from it instead of using the network.
+        self.cassette: Optional[Cassette] = cassette
+        # URL prefix -> replacement, applied just before a request goes out,
+        # e.g. to send Confluence API calls to a local test server
+        self.url_rewrites: Dict[str, str] = url_rewrites or {}
+        self.condition = threading.Condition()
+        self.hosts: Dict[str, HostState] = {}
+        self.sequence = itertools.count()
+
+    def request(
+        self, method: str, url: str, priority: int = PRIORITY_DEFAULT, **kwargs
+    ) -> "requests.Response":
+        # Like requests.request, but 429 responses are retried up to max_retries times.
+        host: str = urlparse(url).netloc
+        attempt: int = 0
+        while True:
+            self.acquire(host, priority)
+            start: float = time.perf_counter()
+            try:
+                response = self.send(method, url, **kwargs)
+            except Exception as e:
+                METRICS.record_request(
+                    host, time.perf_counter() - start, 0, type(e).__name__
+                )
+                raise
+            finally:
+                self.release(host)
+            METRICS.record_request(
+                host,
+                time.perf_counter() - start,
+                len(response.content),
+                str(response.status_code),
+            )
+            rate_limited: bool = response.status_code == 429
+            self.update(host, response, rate_limited, attempt)
+            if not rate_limited or attempt >= self.max_retries:
+                return response
+            attempt += 1
+
+    def send(self, method: str, url: str, **kwargs) -> "requests.Response":
+        import requests
+
+        if self.cassette and self.cassette.mode == "replay":
+            return self.cassette.replay(method, url, kwargs.get("params"))
+        start: float = time.perf_counter()
+        try:
+            response = requests.request(method, self.rewrite_url(url), **kwargs)
+        except requests.exceptions.RequestException as e:
+            if self.cassette:
+                self.cassette.record_error(
+                    method, url, kwargs.get("params"), e, time.perf_counter() - start
+                )
+            raise
+        if self.cassette:
+            self.cassette.record(
+                method, url, kwargs.get("params"), response, time.perf_counter() - start
+            )
+        return response
+
+    def rewrite_url(self, url: str) -> str:
+        for prefix, replacement in self.url_rewrites.items():
+            if url.startswith(prefix):
+                return replacement + url[len(prefix) :]
+        return url
+
+    def acquire(self, host: str, priority: int):
+        with self.condition:
+            state: HostState = self.get_host_state(host)
+            entry: Tuple[int, int] = (priority, next(self.sequence))
+            heapq.heappush(state.waiting, entry)
+            while True:
+                timeout: Optional[float] = None
+                # Only the highest-priority waiter may go; the rest wait their turn.
+                if state.waiting[0] == entry and state.in_flight < int(state.limit):
+                    now: float = time.monotonic()
+                    state.refill(now)
+                    timeout = max(
+                        state.blocked_until - now,
+                        (1 - state.tokens) / state.requests_per_second,
+                    )
+                    if timeout <= 0:
+                        heapq.heappop(state.waiting)
+                        state.tokens -= 1
+                        state.in_flight += 1
+                        self.condition.notify_all()  # Let the next waiter check
+                        return
+                self.condition.wait(timeout)
+
+    def release(self, host: str):
+        with self.condition:
+            self.hosts[host].in_flight -= 1
+            self.condition.notify_all()
+
+    def update(
+        self, host: str, response: "requests.Response", rate_limited: bool, attempt: int
+    ):
+        with self.condition:
+            state: HostState = self.hosts[host]
+            now: float = time.monotonic()
+            wait: float = get_wait_seconds(response.headers)
+            if rate_limited:
+                if not wait:
+                    # Exponential backoff with jitter
+                    wait = min(self.max_backoff_seconds, 2**attempt) * random.uniform(
+                        0.5, 1.0
+                    )
+                # Concurrent requests all see the same 429, so only decrease once per second.
+                if now - state.last_decrease > 1:
+                    state.limit = max(self.min_concurrency, state.limit / 2)
+                    state.last_decrease = now
+            elif response.headers.get("X-RateLimit-NearLimit", "").lower() == "true":
+                if now - state.last_decrease > 1:
+                    state.limit = max(self.min_concurrency, state.limit * 0.75)
+                    state.last_decrease = now
+            elif state.limit < self.max_concurrency:
+                state.limit = min(self.max_concurrency, state.limit + 1 / state.limit)
+            if wait:
+                state.blocked_until = max(state.blocked_until, now + wait)
+            self.condition.notify_all()
+
+    def get_host_state(self, host: str) -> HostState:
+        if host not in self.hosts:
+            self.hosts[host] = HostState(
+                self.requests_per_second, self.burst, self.max_concurrency
+            )
+        return self.hosts[host]
+
+
+class Cassette(object):
+    """
+    Every request/response made through the scheduler, as gzipped JSON lines.
+
+    In "record" mode, responses (and connection errors) are appended as they arrive.
+    In "replay" mode, they are served back by method and URL, so a full run needs
+    no network access. Repeated requests for the same URL are replayed in recorded
+    order, with the last one repeated once they run out. Each replayed response is
+    delayed by `latency_seconds` plus `latency_scale` times its recorded latency.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str,
+        latency_seconds: float = 0.0,
+        latency_scale: float = 0.0,
+    ):
+        if mode not in ["record", "replay"]:
+            raise RuntimeError(f"Invalid cassette mode={mode}")
+        self.path: str = path
+        self.mode: str = mode
+        self.latency_seconds: float = latency_seconds
+        self.latency_scale: float = latency_scale
+        self.lock = threading.Lock()
+        self.file = None
+        # Request key -> recorded entries not yet replayed, in recorded order
+        self.entries: Dict[str, List[Dict]] = {}
+        if mode == "record":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.file = gzip.open(path, "wt", encoding="utf-8")
+        else:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    entry: Dict = json.loads(line)
+                    key: str = get_request_key(entry["method"], entry["url"])
+                    self.entries.setdefault(key, []).append(entry)
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict],
+        response: "requests.Response",
+        elapsed: float,
+    ):
+        body: str
+        try:
+            body, body_encoding = response.content.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body = base64.b64encode(response.content).decode("ascii")
+            body_encoding = "base64"
+        self.write(
+            {
+                "method": method,
+                "url": get_full_url(method, url, params),
+                "status": response.status_code,
+                "reason": response.reason,
+                # Never store cookies
+                "headers": {
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() != "set-cookie"
+                },
+                "body": body,
+                "body_encoding": body_encoding,
+                "elapsed": round(elapsed, 4),
+            }
+        )
+
+    def record_error(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict],
+        error: Exception,
+        elapsed: float,
+    ):
+        self.write(
+            {
+                "method": method,
+                "url": get_full_url(method, url, params),
+                "error": type(error).__name__,
+                "message": str(error),
+                "elapsed": round(elapsed, 4),
+            }
+        )
+
+    def write(self, entry: Dict):
+        with self.lock:
+            if self.file:
+                self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def replay(
+        self, method: str, url: str, params: Optional[Dict] = None
+    ) -> "requests.Response":
+        import requests
+
+        full_url: str = get_full_url(method, url, params)
+        with self.lock:
+            recorded: List[Dict] = self.entries.get(
+                get_request_key(method, full_url), []
+            )
+            if not recorded:
+                raise requests.exceptions.ConnectionError(
+                    f"No recorded response for {method} {full_url} in {self.path}"
+                )
+            entry: Dict = recorded.pop(0) if len(recorded) > 1 else recorded[0]
+        delay: float = self.latency_seconds + self.latency_scale * entry["elapsed"]
+        if delay > 0:
+            time.sleep(delay)
+        if "error" in entry:
+            error_class = getattr(requests.exceptions, entry["error"], None)
+            if not (
+                isinstance(error_class, type)
+                and issubclass(error_class, requests.exceptions.RequestException)
+            ):
+                error_class = requests.exceptions.ConnectionError
+            raise error_class(entry["message"])
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.url = full_url
+        response.headers = requests.structures.CaseInsensitiveDict(entry["headers"])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        if entry["body_encoding"] == "base64":
+            response._content = base64.b64decode(entry["body"])
+        else:
+            response._content = entry["body"].encode("utf-8")
+        return response
+
+    def close(self):
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+
+
+SCHEDULER: RequestScheduler = RequestScheduler()
+
+
+def set_scheduler(scheduler: RequestScheduler):
+    # Replace the scheduler used by http_get, e.g. with different limits
+    global SCHEDULER
+    SCHEDULER = scheduler
+
+
+def http_get(
+    url: str, priority: int = PRIORITY_DEFAULT, **kwargs
+) -> "requests.Response":
+    # All outgoing GETs go through here, so every request shares the same per-host limits.
+    return SCHEDULER.request("GET", url, priority, **kwargs)
+
+
+def get_full_url(method: str, url: str, params: Optional[Dict] = None) -> str:
+    # The URL requests would actually send, with `params` encoded into the query string
+    import requests
+
+    return requests.Request(method, url, params=params).prepare().url or url
+
+
+def get_request_key(method: str, full_url: str) -> str:
+    return f"{method} {full_url}"
+
+
+def get_wait_seconds(headers) -> float:
+    # Seconds the server asked us to wait, from Retry-After or X-RateLimit-Remaining/Reset
+    retry_after: str = headers.get("Retry-After", "")
+    if retry_after:
+        return max(0.0, parse_time_header(retry_after, relative=True))
+    if headers.get("X-RateLimit-Remaining", "").strip() == "0":
+        reset: str = headers.get("X-RateLimit-Reset", "")
+        if reset:
+            return max(0.0, parse_time_header(reset, relative=False))
+    return 0.0
+
+
+def parse_time_header(value: str, relative: bool) -> float:
+    # Headers give delays in seconds, epoch seconds, or dates (HTTP or ISO 8601).
+    # Return seconds from now, or 0 if the value can't be parsed.
+    value = value.strip()
+    try:
+        seconds: float = float(value)
+        if relative or seconds < 1e9:
+            return seconds
+        return seconds - time.time()
+    except ValueError:
+        pass
+    try:
+        when: datetime = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            when = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return 0.0
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return (when - datetime.now(timezone.utc)).total_seconds()
+
+
+# Functions ###################################################################
+def get_web_page(
+    url: str,
+    cache: Optional[RevalidationCache] = None,
+    timeout: int = 10,
+    priority: int = PRIORITY_DEFAULT,
+) -> WebPage:
+    # Raises requests exceptions (including HTTPError for 4xx/5xx responses), like requests.get
+    cached_page: Optional[WebPage] = cache.load(url) if cache else None
+    headers: Dict[str, str] = {}
+    if cached_page:
+        if cached_page.etag:
+            headers["If-None-Match"] = cached_page.etag
+        if cached_page.last_modified:
+            headers["If-Modified-Since"] = cached_page.last_modified
+    response = http_get(url, priority, headers=headers, timeout=timeout)
+    if cached_page and response.status_code == 304:
+        METRICS.record_cache("revalidation", hit=True)
+        cached_page.not_modified = True
+        return cached_page
+    if cache:
+        METRICS.record_cache("revalidation", hit=False)
+    response.raise_for_status()  # Raises HTTPError for 4xx/5xx responses
+    page = WebPage(
+        url,
+        response.content,
+        response.headers.get("ETag", ""),
+        response.headers.get("Last-Modified", ""),
+    )
+    if cache:
+        cache.save(page)
+    return page
+
+
+def get_terms_key(list_sensitive_terms: List[str]) -> str:
+    # Cached term counts are only valid for the exact list of terms they were computed with.
+    joined_terms: str = "\n".join(list_sensitive_terms)
+    return hashlib.sha256(joined_terms.encode("utf-8")).hexdigest()
+
+
+def write_atomically(path: str, data: bytes):
+    # Write to a temporary file first, so readers never see a partially-written file.
+    directory: str = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
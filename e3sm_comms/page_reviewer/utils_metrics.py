@@ -0,0 +1,258 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Upper bounds, in seconds, of the request latency histogram buckets
+LATENCY_BUCKETS: List[float] = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float("inf")]
+
+
+# Classes #####################################################################
+class HostStats(object):
+    def __init__(self):
+        self.requests: int = 0
+        self.bytes: int = 0
+        self.seconds: float = 0.0
+        self.status_counts: Dict[str, int] = {}
+        self.latency_histogram: List[int] = [0] * len(LATENCY_BUCKETS)
+
+    def to_dict(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "status_counts": self.status_counts,
+            "latency_histogram": {
+                get_bucket_label(bound): count
+                for bound, count in zip(LATENCY_BUCKETS, self.latency_histogram)
+            },
+        }
+
+
+class StageTimes(object):
+    # Stage wall times for one page, recorded where METRICS is not available
+    # (e.g., in a worker process), then added with METRICS.record_stage
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds: float = time.perf_counter() - start
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+
+class Metrics(object):
+    """
+    Wall time per stage for each page, per-host request stats, and cache hit rates.
+
+    Disabled by default; recording is a no-op until `enable()` is called
+    (see Config.collect_metrics). Safe to use from multiple threads.
+    """
+
+    def __init__(self):
+        self.enabled: bool = False
+        self.lock = threading.Lock()
+        self.local = threading.local()  # Page being processed on each thread
+        self.start_time: float = time.monotonic()
+        # page -> stage -> seconds
+        self.stage_seconds: Dict[str, Dict[str, float]] = {}
+        self.host_stats: Dict[str, HostStats] = {}
+        # cache name -> {"hits": n, "misses": n}
+        self.cache_counts: Dict[str, Dict[str, int]] = {}
+
+    def enable(self):
+        # Also resets anything recorded so far
+        with self.lock:
+            self.enabled = True
+            self.start_time = time.monotonic()
+            self.stage_seconds = {}
+            self.host_stats = {}
+            self.cache_counts = {}
+
+    @contextmanager
+    def page(self, page_id: str) -> Iterator[None]:
+        # Stages timed inside this block are recorded against `page_id`
+        previous: Optional[str] = getattr(self.local, "page_id", None)
+        self.local.page_id = page_id
+        try:
+            yield
+        finally:
+            self.local.page_id = previous
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start)
+
+    def record_stage(self, name: str, seconds: float):
+        # E.g., for stages timed in a worker process, with StageTimes
+        if not self.enabled:
+            return
+        page_id: str = getattr(self.local, "page_id", None) or "(no page)"
+        with self.lock:
+            stages: Dict[str, float] = self.stage_seconds.setdefault(page_id, {})
+            stages[name] = stages.get(name, 0.0) + seconds
+
+    def record_request(self, host: str, seconds: float, num_bytes: int, status: str):
+        if not self.enabled:
+            return
+        with self.lock:
+            stats: HostStats = self.host_stats.setdefault(host, HostStats())
+            stats.requests += 1
+            stats.bytes += num_bytes
+            stats.seconds += seconds
+            stats.status_counts[status] = stats.status_counts.get(status, 0) + 1
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats.latency_histogram[i] += 1
+                    break
+
+    def record_cache(self, name: str, hit: bool):
+        if not self.enabled:
+            return
+        with self.lock:
+            counts: Dict[str, int] = self.cache_counts.setdefault(
+                name, {"hits": 0, "misses": 0}
+            )
+            counts["hits" if hit else "misses"] += 1
+
+    def get_stage_totals(self) -> Dict[str, Dict[str, float]]:
+        totals: Dict[str, Dict[str, float]] = {}
+        for stages in self.stage_seconds.values():
+            for name, seconds in stages.items():
+                total = totals.setdefault(
+                    name, {"pages": 0, "seconds": 0.0, "max": 0.0}
+                )
+                total["pages"] += 1
+                total["seconds"] += seconds
+                total["max"] = max(total["max"], seconds)
+        return dict(sorted(totals.items(), key=lambda item: -item[1]["seconds"]))
+
+    def to_dict(self) -> Dict:
+        with self.lock:
+            return {
+                "wall_seconds": round(time.monotonic() - self.start_time, 3),
+                "stages": {
+                    name: {key: round(value, 3) for key, value in total.items()}
+                    for name, total in self.get_stage_totals().items()
+                },
+                "hosts": {
+                    host: stats.to_dict() for host, stats in self.host_stats.items()
+                },
+                "caches": {
+                    name: dict(counts, hit_rate=round(get_hit_rate(counts), 3))
+                    for name, counts in self.cache_counts.items()
+                },
+                "pages": {
+                    page_id: {name: round(value, 3) for name, value in stages.items()}
+                    for page_id, stages in self.stage_seconds.items()
+                },
+            }
+
+    def write_summary(self, output_dir: str):
+        # Write metrics.json and metrics.txt to output_dir, and print the table
+        summary: Dict = self.to_dict()
+        with open(f"{output_dir}metrics.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        table: str = format_summary(summary)
+        with open(f"{output_dir}metrics.txt", "w", encoding="utf-8") as f:
+            f.write(table)
+        print(table)
+
+
+# Functions ###################################################################
+def get_bucket_label(bound: float) -> str:
+    return "inf" if bound == float("inf") else f"<={bound}s"
+
+
+def get_hit_rate(counts: Dict[str, int]) -> float:
+    total: int = counts["hits"] + counts["misses"]
+    return counts["hits"] / total if total else 0.0
+
+
+def format_summary(summary: Dict, num_slowest_pages: int = 10) -> str:
+    lines: List[str] = [f"Wall time: {summary['wall_seconds']:.1f} s", ""]
+    lines += format_table(
+        ["stage", "pages", "total (s)", "mean (ms)", "max (ms)"],
+        [
+            [
+                name,
+                f"{total['pages']:.0f}",
+                f"{total['seconds']:.2f}",
+                f"{1000 * total['seconds'] / total['pages']:.1f}",
+                f"{1000 * total['max']:.1f}",
+            ]
+            for name, total in summary["stages"].items()
+        ],
+    )
+    lines.append("")
+    lines += format_table(
+        ["host", "requests", "MB", "mean (ms)", "statuses", "latency histogram"],
+        [
+            [
+                host,
+                str(stats["requests"]),
+                f"{stats['bytes'] / 1e6:.2f}",
+                f"{1000 * stats['seconds'] / stats['requests']:.0f}",
+                " ".join(f"{k}:{v}" for k, v in sorted(stats["status_counts"].items())),
+                " ".join(
+                    f"{label}:{count}"
+                    for label, count in stats["latency_histogram"].items()
+                    if count
+                ),
+            ]
+            for host, stats in sorted(
+                summary["hosts"].items(), key=lambda item: -item[1]["requests"]
+            )
+        ],
+    )
+    lines.append("")
+    lines += format_table(
+        ["cache", "hits", "misses", "hit rate"],
+        [
+            [name, str(c["hits"]), str(c["misses"]), f"{100 * c['hit_rate']:.0f}%"]
+            for name, c in summary["caches"].items()
+        ],
+    )
+    slowest = sorted(summary["pages"].items(), key=lambda item: -sum(item[1].values()))[
+        :num_slowest_pages
+    ]
+    if slowest:
+        lines.append("")
+        lines += format_table(
+            ["slowest pages", "total (s)", "slowest stage"],
+            [
+                [
+                    page_id,
+                    f"{sum(stages.values()):.2f}",
+                    max(stages, key=lambda name: stages[name]),
+                ]
+                for page_id, stages in slowest
+            ],
+        )
+    return "\n".join(lines) + "\n"
+
+
+def format_table(header: List[str], rows: List[List[str]]) -> List[str]:
+    widths: List[int] = [
+        max(len(row[i]) for row in [header] + rows) for i in range(len(header))
+    ]
+    return [
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in [header] + rows
+    ]
+
+
+# Shared by every module, so all stages and requests end up in one summary.
+METRICS: Metrics = Metrics()
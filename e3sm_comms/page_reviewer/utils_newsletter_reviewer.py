@@ -1,23 +1,33 @@
 import csv
+import os
 import re
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
-from typing import Any, Dict, List, Optional, Set
-
-import pytz  # type: ignore
-import requests  # type: ignore
-from bs4 import BeautifulSoup
-from PIL import Image
-from requests.auth import HTTPBasicAuth  # type: ignore
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from e3sm_comms.page_reviewer.utils_base import (
+    CONFLUENCE_WIKI_URL,
     Config,
     ConfluenceCredentials,
     ConfluencePage,
+    E3SMOrgSlugIndex,
     find_sensitive_terms,
-    get_json,
+    get_all_results,
     map_confluence_to_e3sm,
 )
+from e3sm_comms.page_reviewer.utils_http import (
+    PRIORITY_BACKGROUND,
+    RevalidationCache,
+    get_web_page,
+    http_get,
+)
+from e3sm_comms.page_reviewer.utils_metrics import METRICS
+
+# Stories per CQL search for their comments, to keep the URL short
+STORIES_PER_COMMENT_SEARCH: int = 50
+COMMENTS_PER_REQUEST: int = 100
 
 # These functions are only called in newsletter_reviewer mode #################
 
@@ -69,97 +79,314 @@ def skip_newsletter_metadata_in_header(raw_html: str):
     return main_html
 
 
-def find_first_person_phrases(paragraphs: List[str]) -> List[str]:
-    # Subject Pronoun, Object Pronoun, Posessive Adjective, Posessive Pronoun, Reflexive Pronoun
-    first_person_terms: Set[str] = set(
-        [
-            "i",
-            "me",
-            "my",
-            "mine",
-            "myself",
-            "we",
-            "us",
-            "our",
-            "ours",
-            "ourselves",
-        ]
-    )
-    found_first_person_phrases: List[str] = []
+# Text analysis ###############################################################
+# Subject Pronoun, Object Pronoun, Posessive Adjective, Posessive Pronoun, Reflexive Pronoun
+FIRST_PERSON_TERMS: Set[str] = set(
+    [
+        "i",
+        "me",
+        "my",
+        "mine",
+        "myself",
+        "we",
+        "us",
+        "our",
+        "ours",
+        "ourselves",
+    ]
+)
+
+# Rules file used when Config.first_person_exclusions_file is not set
+DEFAULT_CONTEXT_EXCLUSIONS_FILE: str = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "first_person_exclusions.txt"
+)
+# Words with optional apostrophes or periods, or standalone punctuation
+TOKEN_PATTERN = re.compile(r"\w+(?:'\w+)?(?:\.\w+)*|[^\w\s]")
+# Tokens never contain these, see strip_whitespace_from_spans
+WHITESPACE_PATTERN = re.compile(r"\s")
+# Literally matching spaces
+# We don't care about other whitespace characters that `\s` catches
+DOUBLE_SPACE_PATTERN = re.compile(r"(\w+\.  \w+)")
+# The only words analyze_words needs to look at: possible acronyms (2+ uppercase
+# letters/numbers) and "fig"/"figure" (any case), optionally with a number attached
+CANDIDATE_WORD_PATTERN = re.compile(
+    r"(?<!\w)(?:[A-Z0-9]{2,}|[Ff][Ii][Gg](?:[Uu][Rr][Ee])?[0-9]*)(?!\w)"
+)
+ACRONYM_PATTERN = re.compile(r"[A-Z0-9]{2,}")
+FIGURE_WORD_PATTERN = re.compile(r"(?:fig|figure)([0-9]*)")
+# What follows "fig"/"figure": optional period, optional whitespace, then the number
+FIGURE_NUMBER_PATTERN = re.compile(r"\.?\s*(\w+)")
+# List of explicit acronym exclusions
+ACRONYM_EXCLUSIONS: Set[str] = {
+    "CAPTION",
+    "E3SM",
+    "TBD",
+    "V1",
+    "V2",
+    "V3",
+    "V4",
+    "V5",
+    "V6",
+    "V7",
+    "V8",
+    "V9",
+}
+# Set of Roman numerals to exclude (add more as needed)
+ROMAN_NUMERALS: Set[str] = {"I", "II", "III"}
+
+
+class TextAnalysis(object):
+    def __init__(self):
+        self.first_person_phrases: List[str] = []
+        self.double_spaces_after_periods: List[str] = []
+        self.img_mentions: List[int] = []
+        self.acronyms: List[str] = []  # Undefined acronyms only
+
+
+def analyze_text(
+    paragraphs: List[str],
+    text: str,
+    num_images: int,
+    check_first_person: bool = True,
+    exclusion_pattern: Optional[re.Pattern] = None,
+) -> TextAnalysis:
+    """
+    Run every newsletter text check with one tokenization of each paragraph and one
+    scan of the words in `text` (the original text, not lowercased).
+
+    Equivalent to calling find_first_person_phrases, find_double_spaces_after_periods,
+    get_image_mention_frequencies and get_acronyms separately.
+    `exclusion_pattern` defaults to the rules in DEFAULT_CONTEXT_EXCLUSIONS_FILE.
+    """
+    if exclusion_pattern is None:
+        exclusion_pattern = load_context_exclusions()
+    analysis = TextAnalysis()
     for paragraph in paragraphs:
-        text = ignore_terms_based_on_context(paragraph)
-        tokens: List[str] = tokenize(text)
-        found_first_person_phrases += get_terms_in_context(tokens, first_person_terms)
-    return found_first_person_phrases
+        first_person_phrases, double_spaces = analyze_paragraph(
+            paragraph, check_first_person, exclusion_pattern
+        )
+        analysis.first_person_phrases += first_person_phrases
+        analysis.double_spaces_after_periods += double_spaces
+    analysis.img_mentions, analysis.acronyms = analyze_words(text, num_images)
+    return analysis
+
+
+def analyze_paragraph(
+    paragraph: str,
+    check_first_person: bool = True,
+    exclusion_pattern: Optional[re.Pattern] = None,
+) -> Tuple[List[str], List[str]]:
+    # Return (first-person phrases in context, double spaces after periods)
+    first_person_phrases: List[str] = []
+    if check_first_person:
+        if exclusion_pattern is None:
+            exclusion_pattern = load_context_exclusions()
+        first_person_phrases = find_first_person_in_paragraph(
+            paragraph, exclusion_pattern
+        )
+    # Markdown collapses double spaces, so let's just do that here.
+    # In the table, we'll say "change to: " and then show the match with a single space.
+    double_spaces: List[str] = [
+        match.replace("  ", " ") for match in DOUBLE_SPACE_PATTERN.findall(paragraph)
+    ]
+    return first_person_phrases, double_spaces
 
 
-def ignore_terms_based_on_context(text: str) -> str:
-    # Ignore Heroic Bug Fixes header
-    heroic_bug_fixes = "Bugs are an inevitable part of any complex software project, and E3SM is no exception. A lot of time goes into finding and fixing bugs, the resulting impacts can rival major parameterization changes, but these efforts and their impacts frequently go unreported. Heroic Bug Fixes is a recurring column that celebrates the critical yet often overlooked work of debugging. We hope that by shining a well-deserved spotlight on this critical work we can inspire further debugging efforts across the community and provide the broader E3SM community with timely information about changes which could aid their own development and investigations."
-    text = re.sub(heroic_bug_fixes, "", text)
-    # us
-    text = re.sub("contiguous US", "contiguous U.S.", text)
-    text = re.sub("US Department", "U.S. Department", text)
-    # i
-    text = re.sub("Part I", "Part One", text)
-    text = re.sub("I/O", "input/output", text)
-    return text
+def find_first_person_in_paragraph(
+    paragraph: str, exclusion_pattern: re.Pattern
+) -> List[str]:
+    # Excluded text is skipped by position, rather than rewritten out of the paragraph,
+    # so phrases keep the page's original wording as context.
+    skip_spans: List[Tuple[int, int]] = [
+        match.span()
+        for match in exclusion_pattern.finditer(paragraph)
+        if match.end() > match.start()
+    ]
+    tokens: List[str] = TOKEN_PATTERN.findall(paragraph)
+    candidates: List[int] = [
+        idx for idx, token in enumerate(tokens) if token.lower() in FIRST_PERSON_TERMS
+    ]
+    if skip_spans and candidates:
+        # Tokens cover every non-whitespace character, in order, so a token's offset
+        # in the paragraph with whitespace removed is the total length of the tokens
+        # before it. Moving the few skip spans to those offsets avoids locating every token.
+        token_starts: List[int] = list(accumulate(map(len, tokens), initial=0))
+        stripped_spans: List[Tuple[int, int]] = strip_whitespace_from_spans(
+            paragraph, skip_spans
+        )
+        kept: List[int] = []
+        span_index: int = 0
+        for idx in candidates:
+            start, end = token_starts[idx], token_starts[idx + 1]
+            # Spans and candidates are both in order, so each span is passed at most once.
+            while (
+                span_index < len(stripped_spans)
+                and stripped_spans[span_index][1] <= start
+            ):
+                span_index += 1
+            if not (
+                span_index < len(stripped_spans) and stripped_spans[span_index][0] < end
+            ):
+                kept.append(idx)
+        candidates = kept
+    found_phrases: List[str] = []
+    for idx in candidates:
+        before = tokens[idx - 1] if idx > 0 else ""
+        after = tokens[idx + 1] if idx < len(tokens) - 1 else ""
+        found_phrases.append(f"{before} {tokens[idx]} {after}".strip())
+    return found_phrases
+
+
+def strip_whitespace_from_spans(
+    text: str, spans: List[Tuple[int, int]]
+) -> List[Tuple[int, int]]:
+    # Map ordered, non-overlapping (start, end) offsets in `text`
+    # to offsets in `text` with all whitespace removed
+    stripped_spans: List[Tuple[int, int]] = []
+    num_whitespace: int = 0
+    previous_end: int = 0
+    for start, end in spans:
+        num_whitespace += len(WHITESPACE_PATTERN.findall(text, previous_end, start))
+        stripped_start: int = start - num_whitespace
+        num_whitespace += len(WHITESPACE_PATTERN.findall(text, start, end))
+        stripped_spans.append((stripped_start, end - num_whitespace))
+        previous_end = end
+    return stripped_spans
+
+
+@lru_cache(maxsize=None)
+def load_context_exclusions(rules_file: str = "") -> re.Pattern:
+    """
+    Compile a context-exclusion rules file into one combined pattern.
+
+    Each rule is a line of the form `literal: <text>` or `regex: <pattern>`;
+    blank lines and `#` comments are ignored. Compiled once per file.
+    """
+    rules_file = rules_file or DEFAULT_CONTEXT_EXCLUSIONS_FILE
+    patterns: List[str] = []
+    with open(rules_file, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            kind, _, value = line.partition(": ")
+            if kind == "literal" and value:
+                patterns.append(re.escape(value))
+            elif kind == "regex" and value:
+                try:
+                    re.compile(value)
+                except re.error as e:
+                    raise RuntimeError(
+                        f"Invalid regex on line {line_number} of {rules_file}: {e}"
+                    )
+                patterns.append(f"(?:{value})")
+            else:
+                raise RuntimeError(
+                    f"Invalid rule on line {line_number} of {rules_file}: {line}"
+                )
+    if not patterns:
+        return re.compile(r"(?!)")  # Never matches
+    return re.compile("|".join(patterns))
+
+
+def analyze_words(text: str, num_images: int) -> Tuple[List[int], List[str]]:
+    """
+    Return (image mention frequencies, undefined acronyms) from a single pass over
+    the candidate words (maximal runs of word characters) in `text`.
+
+    Both checks only ever match whole words:
+    - An acronym is a word of 2+ uppercase letters/numbers. It is defined if it
+      appears at least once in parentheses, e.g., `(E3SM)`.
+    - A figure mention is "fig"/"figure" (any case) followed by an optional period,
+      optional whitespace, and then the figure number as its own word,
+      or else with the number attached, e.g., "fig1".
+    """
+    if num_images and len(text.lower()) != len(text):
+        # Rarely, lowercasing changes the length (e.g., "İ" -> "i̇"), which can move word
+        # boundaries. Figure mentions have always been matched on lowercased text,
+        # so count them there instead.
+        return (
+            analyze_words(text.lower(), num_images)[0],
+            analyze_words(text, 0)[1],
+        )
+    frequencies: List[int] = [0] * num_images
+    found_acronyms: Set[str] = set()
+    defined_acronyms: Set[str] = set()
+    for match in CANDIDATE_WORD_PATTERN.finditer(text):
+        word: str = match.group()
+        start, end = match.span()
+        if num_images:
+            figure_match = FIGURE_WORD_PATTERN.fullmatch(word.lower())
+            if figure_match and figure_match.group(1):
+                count_figure_mention(figure_match.group(1), frequencies)
+            elif figure_match:
+                number_match = FIGURE_NUMBER_PATTERN.match(text, end)
+                if number_match:
+                    count_figure_mention(number_match.group(1), frequencies)
+        if ACRONYM_PATTERN.fullmatch(word):
+            found_acronyms.add(word)
+            if text[start - 1 : start] == "(" and text[end : end + 1] == ")":
+                defined_acronyms.add(word)
+    filtered = [
+        m
+        for m in found_acronyms
+        if m not in ACRONYM_EXCLUSIONS and not m.isdigit() and m not in ROMAN_NUMERALS
+    ]
+    # Now, we only care about acronyms that are not defined in the text.
+    undefined_acronyms: List[str] = [
+        acronym for acronym in sorted(filtered) if acronym not in defined_acronyms
+    ]
+    return frequencies, undefined_acronyms
 
 
-def tokenize(text: str) -> List[str]:
-    text = " ".join(text.split())
-    # Regex for tokens: words with optional apostrophes or periods, or standalone punctuation
-    token_pattern = r"\w+(?:'\w+)?(?:\.\w+)*|[^\w\s]"
-    tokens = re.findall(token_pattern, text)
-    return tokens
+def count_figure_mention(number: str, frequencies: List[int]):
+    # Account for the fact there is no Fig. 0
+    # Only exact numbers count, e.g. "01" is not Fig. 1
+    if number.isascii() and number.isdigit() and number == str(int(number)):
+        figure_number: int = int(number)
+        if 1 <= figure_number <= len(frequencies):
+            frequencies[figure_number - 1] += 1
 
 
-def get_terms_in_context(tokens: List[str], term_set: Set[str]) -> List[str]:
-    found_phrases: List[str] = []
-    for idx, token in enumerate(tokens):
-        if token.lower() in term_set:
-            before = tokens[idx - 1] if idx > 0 else ""
-            after = tokens[idx + 1] if idx < len(tokens) - 1 else ""
-            phrase = f"{before} {token} {after}".strip()
-            found_phrases.append(phrase)
-    return found_phrases
+def find_first_person_phrases(
+    paragraphs: List[str], exclusion_pattern: Optional[re.Pattern] = None
+) -> List[str]:
+    if exclusion_pattern is None:
+        exclusion_pattern = load_context_exclusions()
+    found_first_person_phrases: List[str] = []
+    for paragraph in paragraphs:
+        found_first_person_phrases += find_first_person_in_paragraph(
+            paragraph, exclusion_pattern
+        )
+    return found_first_person_phrases
 
 
 def find_double_spaces_after_periods(paragraphs: List[str]) -> List[str]:
     matches: List[str] = []
     for paragraph in paragraphs:
-        # Literally matching spaces
-        # We don't care about other whitespace characters that `\s` catches
-        match_list: List[str] = re.findall(r"(\w+\.  \w+)", paragraph)
-        matches.extend(match_list)
-    # Markdown collapses double spaces, so let's just do that here.
-    # In the table, we'll say "change to: " and then show the match with a single space.
-    return [re.sub("  ", " ", match) for match in matches]
+        matches += analyze_paragraph(paragraph, check_first_person=False)[1]
+    return matches
 
 
 def get_image_mention_frequencies(lowercase_text: str, num_images: int) -> List[int]:
-    frequencies: List[int] = [0] * num_images
-    # Account for the fact there is no Fig. 0
-    for i in range(1, num_images + 1):
-        # Match "fig 1", "fig. 1", "figure 1", "figure. 1"
-        # \b = word boundary, \.? = optional period, \s* = optional whitespace
-        pattern = rf"\b(fig|figure)\.?\s*{i}\b"
-        matches = re.findall(pattern, lowercase_text)
-        count = len(matches)
-        frequencies[i - 1] = count
-    return frequencies
+    # Match "fig 1", "fig. 1", "figure 1", "figure. 1"
+    return analyze_words(lowercase_text, num_images)[0]
 
 
 def get_image_resolutions(
     img_srcs: List[str], confluence_url: str, credentials: ConfluenceCredentials
 ) -> List[str]:
+    from PIL import Image
+
     image_resolutions: List[str] = []
     for src in img_srcs:
         # Ensure full URL if src is relative
         if src.startswith("/"):
             src = confluence_url + src
-        img_resp = requests.get(
-            src, auth=HTTPBasicAuth(credentials.email, credentials.api_token)
+        img_resp = http_get(
+            src,
+            PRIORITY_BACKGROUND,
+            auth=(credentials.email, credentials.api_token),  # HTTP basic auth
         )
         if img_resp.status_code == 200:
             img = Image.open(BytesIO(img_resp.content))
@@ -196,39 +423,8 @@ def get_image_resolutions(
 
 
 def get_acronyms(text: str) -> List[str]:
-    # Regex matches 2+ uppercase letters/numbers
-    pattern = r"\b[A-Z0-9]{2,}\b"
-    matches = set(re.findall(pattern, text))
-    # List of explicit exclusions
-    exclusions = {
-        "CAPTION",
-        "E3SM",
-        "TBD",
-        "V1",
-        "V2",
-        "V3",
-        "V4",
-        "V5",
-        "V6",
-        "V7",
-        "V8",
-        "V9",
-    }
-    # Set of Roman numerals to exclude (add more as needed)
-    roman_numerals = {"I", "II", "III"}
-    filtered = [
-        m
-        for m in matches
-        if m not in exclusions and not m.isdigit() and m not in roman_numerals
-    ]
-    found_acronyms = sorted(filtered)
-    # Now, we only care about acronyms that are not defined in the text.
-    # We can infer that an acronym is defined if it appears at least once in parentheses, e.g., `(E3SM)`.
-    undefined_acronyms: List[str] = []
-    for acronym in found_acronyms:
-        if not re.search(rf"\({acronym}\)", text):
-            undefined_acronyms.append(acronym)
-    return undefined_acronyms
+    # Use original text, not lowercase text!!
+    return analyze_words(text, 0)[1]
 
 
 def filter_acronyms(
@@ -245,21 +441,46 @@ def filter_acronyms(
     return filtered_acronyms
 
 
-def set_wordpress_keys(page: ConfluencePage):
+def set_wordpress_keys(
+    page: ConfluencePage,
+    cache: Optional[RevalidationCache] = None,
+    slug_index: Optional[E3SMOrgSlugIndex] = None,
+):
     if page.wordpress_version != 0:
         wp_url = map_confluence_to_e3sm(page.url)
-        wp_is_accessible = check_wp_is_accessible(wp_url)
         page.raw_wordpress_url = wp_url
+        if slug_index:
+            in_index: bool = slug_index.get_url(wp_url) is not None
+            METRICS.record_cache("e3sm_org_slug_index", hit=in_index)
+            if in_index:
+                page.display_wordpress_url = wp_url
+                return
+        # Only probe e3sm.org for slugs missing from the index (e.g., published after the sitemap was read)
+        wp_is_accessible = check_wp_is_accessible(wp_url, cache)
         if wp_is_accessible:
+            if slug_index:
+                slug_index.add(wp_url)
             page.display_wordpress_url = wp_url
         else:
             page.display_wordpress_url = f"Inferred {wp_url} but could not access it."
+            if slug_index:
+                closest_urls: List[str] = slug_index.get_closest_urls(wp_url)
+                if closest_urls:
+                    page.display_wordpress_url += (
+                        f" Closest e3sm.org pages: {', '.join(closest_urls)}"
+                    )
 
 
-def check_wp_is_accessible(wp_url):
+def check_wp_is_accessible(
+    wp_url, cache: Optional[RevalidationCache] = None, timeout: int = 10
+):
     try:
-        response = requests.get(wp_url)
-        response.raise_for_status()  # Raises HTTPError for 4xx/5xx responses
+        if cache:
+            # A 304 Not Modified means the page is still there, without re-downloading it.
+            get_web_page(wp_url, cache, timeout, PRIORITY_BACKGROUND)
+        else:
+            response = http_get(wp_url, PRIORITY_BACKGROUND, timeout=timeout)
+            response.raise_for_status()  # Raises HTTPError for 4xx/5xx responses
         return True
     except Exception:
         return False
@@ -267,15 +488,19 @@ def check_wp_is_accessible(wp_url):
 
 # extract_data_from_comments_url ##############################################
 def extract_data_from_comments_url(
-    credentials: ConfluenceCredentials, page: ConfluencePage
+    credentials: ConfluenceCredentials,
+    page: ConfluencePage,
+    comments: Optional[List[Dict]] = None,
 ):
-    data = get_json(
-        credentials,
-        page.page_id,
-        page.comments_url,
-        params={"expand": "extensions.resolution"},
-    )
-    comments = data.get("results", [])
+    # `comments`: every comment on the page, if already read by get_comments_by_page.
+    # Otherwise, read every page of the page's comments.
+    if comments is None:
+        comments = get_all_results(
+            credentials,
+            page.page_id,
+            page.comments_url,
+            params={"expand": "extensions.resolution"},
+        )
 
     # Initialize counters
     inline_resolved: int = 0
@@ -308,15 +533,46 @@ def extract_data_from_comments_url(
         print(f"Total unaccounted comments on page_id={page.page_id}: {unaccounted}")
 
 
+def get_comments_by_page(
+    credentials: ConfluenceCredentials, page_ids: List[str]
+) -> Dict[str, List[Dict]]:
+    # Every comment on the given pages, by page_id, from a CQL search per
+    # STORIES_PER_COMMENT_SEARCH pages, rather than a request (or more) per page.
+    comments_by_page: Dict[str, List[Dict]] = {page_id: [] for page_id in page_ids}
+    unique_page_ids: List[str] = list(comments_by_page)
+    for i in range(0, len(unique_page_ids), STORIES_PER_COMMENT_SEARCH):
+        chunk: List[str] = unique_page_ids[i : i + STORIES_PER_COMMENT_SEARCH]
+        comments: List[Dict] = get_all_results(
+            credentials,
+            ",".join(chunk),
+            f"{CONFLUENCE_WIKI_URL}/rest/api/content/search",
+            params={
+                "cql": f"type=comment and container in ({','.join(chunk)})",
+                "expand": "container,extensions.resolution",
+                "limit": str(COMMENTS_PER_REQUEST),
+            },
+        )
+        for comment in comments:
+            page_id: str = comment.get("container", {}).get("id", "")
+            if page_id in comments_by_page:
+                comments_by_page[page_id].append(comment)
+    print(
+        f"Read {sum(map(len, comments_by_page.values()))} comments on {len(unique_page_ids)} stories"
+    )
+    return comments_by_page
+
+
 # process_newsletter ##########################################################
 def process_newsletter(
     newsletter_test_link: str, list_sensitive_terms: List[str]
 ) -> Dict[str, str]:
+    from bs4 import BeautifulSoup
+
     print("Processing newsletter itself")
     url: str = newsletter_test_link.replace("e=__test_email__&", "")
     newsletter_dict: Dict[str, str] = {}
     try:
-        response = requests.get(url)
+        response = http_get(url)
         response.raise_for_status()  # Raises HTTPError for 4xx/5xx responses
         html_content = response.content
         soup = BeautifulSoup(html_content, "html.parser")
@@ -349,6 +605,8 @@ def find_draft_terms(lowercase_text: str) -> List[str]:
 def construct_markdown_table(
     config: Config, page_list: List[ConfluencePage], newsletter_dict: Dict[str, str]
 ):
+    import pytz  # type: ignore
+
     output_file: str = f"{config.output_dir}version_check_results.md"
     timestamp = datetime.now(pytz.timezone("America/Los_Angeles")).strftime(
         "%Y_%m_%d %H:%M"
@@ -396,7 +654,7 @@ def construct_markdown_table(
         )
         f.write("| --- | --- | --- | --- | --- | --- | --- | --- | --- | --- |\n")
         for page in page_list:
-            if not page.main_html:
+            if not page.findings:
                 print(
                     f"Warning: skipping page={page.title}, page_id={page.page_id} because html was not extracted."
                 )
@@ -408,9 +666,9 @@ def construct_markdown_table(
                     # Gets an ordered list of the form:
                     # 1. term1: 4
                     # 2. term2: 2
-                    get_ordered_list_str_from_dict(page.main_html.sensitive_terms),
-                    get_ordered_list_str(page.main_html.first_person_phrases),
-                    get_ordered_list_str(page.main_html.double_spaces_after_periods),
+                    get_ordered_list_str_from_dict(page.findings.sensitive_terms),
+                    get_ordered_list_str(page.findings.first_person_phrases),
+                    get_ordered_list_str(page.findings.double_spaces_after_periods),
                 ],
             )
             comments: str
@@ -433,18 +691,18 @@ def construct_markdown_table(
                     [inline_open_comments, footer_comments],
                 )
             link_list: List[str]
-            if page.main_html.linked_urls:
+            if page.findings.linked_urls:
                 link_list = [
                     # Gets an ordered list of the form:
                     # 1. linked url: {'term1': 4, 'term2': 2}
                     get_ordered_list_str_from_nested_dict(
-                        page.main_html.linked_urls.links_with_sensitive_terms
+                        page.findings.linked_urls.links_with_sensitive_terms
                     ),
                     get_ordered_list_str(
-                        page.main_html.linked_urls.e3sm_org_links_not_whitelisted
+                        page.findings.linked_urls.e3sm_org_links_not_whitelisted
                     ),
                     get_ordered_list_str(
-                        page.main_html.linked_urls.other_inaccessible_links
+                        page.findings.linked_urls.other_inaccessible_links
                     ),
                 ]
             else:
@@ -456,12 +714,12 @@ def construct_markdown_table(
             image_summary: str = combine_output_under_one_header(
                 ["Count", "Mentions", "Resolution notes"],
                 [
-                    page.main_html.num_imgs,
-                    get_ordered_list_str(page.main_html.img_mentions),
-                    get_ordered_list_str(page.main_html.img_resolutions),
+                    page.findings.num_imgs,
+                    get_ordered_list_str(page.findings.img_mentions),
+                    get_ordered_list_str(page.findings.img_resolutions),
                 ],
             )
-            acronyms: str = get_ordered_list_str(page.main_html.acronyms)
+            acronyms: str = get_ordered_list_str(page.findings.acronyms)
             review_diff_str: str = get_diff_str(
                 page.page_id, page.reviewed_version, page.current_version
             )
@@ -470,7 +728,7 @@ def construct_markdown_table(
             )
 
             f.write(
-                f"| {story} | {get_ordered_list_str(page.main_html.headers)} | {things_to_fix} | {comments} | {image_summary} | {acronyms} | {links_to_check} | {review_diff_str} | {wordpress_diff_str} | {page.display_wordpress_url} |\n"
+                f"| {story} | {get_ordered_list_str(page.findings.headers)} | {things_to_fix} | {comments} | {image_summary} | {acronyms} | {links_to_check} | {review_diff_str} | {wordpress_diff_str} | {page.display_wordpress_url} |\n"
             )
 
 
@@ -0,0 +1,142 @@
+import heapq
+import itertools
+import threading
+from typing import Any, Callable, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Node states
+PENDING: str = "pending"
+RUNNING: str = "running"
+DONE: str = "done"
+
+
+# Classes #####################################################################
+class PipelineNode(Generic[T]):
+    __slots__ = ("item", "path", "state", "result", "error", "children", "done")
+
+    def __init__(self, item: T, path: Tuple[int, ...]):
+        self.item: T = item
+        # Position in the walk, e.g. (0, 2, 1) is the 2nd child of the 3rd child of the 1st root,
+        # so nodes sort in the order the writer needs them
+        self.path: Tuple[int, ...] = path
+        self.state: str = PENDING
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.children: List["PipelineNode[T]"] = []
+        self.done = threading.Event()
+
+
+class PagePipeline(Generic[T]):
+    """
+    Processes items on `num_workers` threads, while a single writer (the thread that
+    created the pipeline) consumes the results in order, with `wait()` and `release()`.
+
+    `process(item)` returns (result, child items). Children are queued behind their parent,
+    and workers always take the queued node the writer will need first (in preorder),
+    so they work ahead of the writer on a depth-first walk.
+
+    At most `max_in_flight` nodes are started but not yet released by the writer,
+    which bounds memory however far ahead the workers could get. If the writer waits on
+    a node that no worker has started, it processes the node itself, so this can't deadlock.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[T], Tuple[Any, List[T]]],
+        num_workers: int,
+        max_in_flight: int,
+    ):
+        self.process: Callable[[T], Tuple[Any, List[T]]] = process
+        self.max_in_flight: int = max(1, max_in_flight)
+        self.in_flight: int = 0
+        # (path, tie-breaker, node), for nodes not yet started
+        self.queue: List[Tuple[Tuple[int, ...], int, PipelineNode[T]]] = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.closing: bool = False
+        self.threads: List[threading.Thread] = [
+            threading.Thread(target=self.work, daemon=True)
+            for _ in range(max(0, num_workers))
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def add(self, item: T, path: Tuple[int, ...]) -> PipelineNode[T]:
+        node: PipelineNode[T] = PipelineNode(item, path)
+        with self.condition:
+            self.push(node)
+            self.condition.notify()
+        return node
+
+    def push(self, node: PipelineNode[T]):
+        # Call with self.condition held
+        heapq.heappush(self.queue, (node.path, next(self.counter), node))
+
+    def work(self):
+        while True:
+            with self.condition:
+                while not self.closing and not (
+                    self.queue and self.in_flight < self.max_in_flight
+                ):
+                    self.condition.wait()
+                if self.closing:
+                    return
+                node: PipelineNode[T] = heapq.heappop(self.queue)[2]
+                if node.state != PENDING:
+                    continue  # The writer already took it
+                node.state = RUNNING
+                self.in_flight += 1
+            self.run(node)
+
+    def run(self, node: PipelineNode[T]):
+        children: List[T] = []
+        try:
+            node.result, children = self.process(node.item)
+        except BaseException as e:
+            node.error = e
+        with self.condition:
+            node.children = [
+                PipelineNode(child, node.path + (i,))
+                for i, child in enumerate(children)
+            ]
+            for child_node in node.children:
+                self.push(child_node)
+            node.state = DONE
+            self.condition.notify_all()
+        node.done.set()
+
+    def wait(self, node: PipelineNode[T]) -> Any:
+        # Return the node's result, re-raising any exception from processing it
+        with self.condition:
+            run_here: bool = node.state == PENDING
+            if run_here:
+                node.state = RUNNING
+                self.in_flight += 1
+        if run_here:
+            self.run(node)
+        node.done.wait()
+        if node.error:
+            raise node.error
+        return node.result
+
+    def release(self, node: PipelineNode[T]):
+        # The writer is done with this node, so another can start
+        node.result = None
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def close(self):
+        # Stop the workers, once they finish their current node
+        with self.condition:
+            self.closing = True
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join()
+
+    def __enter__(self) -> "PagePipeline[T]":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,16 +1,28 @@
 import csv
+import io
+import json
+import os
 import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Tuple
-
-import requests  # type: ignore
-from bs4 import BeautifulSoup
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from e3sm_comms.page_reviewer.utils_base import (
     Config,
     ConfluencePage,
     map_confluence_to_e3sm,
 )
+from e3sm_comms.page_reviewer.utils_http import (
+    RevalidationCache,
+    get_web_page,
+    write_atomically,
+)
+
+# Column indices in Resource.get_csv_row()
+RESOURCE_ID_COLUMN: int = 0
+LINK_COLUMN: int = 9
+DATE_ADDED_COLUMN: int = 21
 
 
 # Class #######################################################################
@@ -52,7 +64,8 @@ class Resource(object):
             return False
 
     def get_csv_row(self) -> List[str]:
-        self.date_added_to_spreadsheet = datetime.now().strftime("%Y%m%d")
+        if not self.date_added_to_spreadsheet:
+            self.date_added_to_spreadsheet = datetime.now().strftime("%Y%m%d")
         return [
             self.resource_id,
             self.resource_type,
@@ -112,36 +125,198 @@ class Resource(object):
         return bool(self.citation)
 
 
+class ResourceQueue(object):
+    """
+    Reads e3sm.org pages in the background, so the Confluence crawl isn't blocked on them.
+
+    Resource IDs are assigned when pages are submitted (i.e., in traversal order),
+    and rows are written in that same order, no matter which read finishes first.
+    """
+
+    def __init__(self, config: Config):
+        self.config: Config = config
+        self.executor = ThreadPoolExecutor(max_workers=config.max_e3sm_org_workers)
+        # (page.url, page.title, page.current_version, resource, successful_read), in traversal order
+        self.pending: Deque[Tuple[str, str, int, Resource, Future]] = deque()
+        # Bound how far the crawl can run ahead of the writer, to bound memory
+        self.max_pending: int = 10 * config.max_e3sm_org_workers
+        # Set if rows are merged into an existing spreadsheet, rather than appended to a new one
+        self.spreadsheet: Optional[ResourceSpreadsheet] = None
+        # link -> Confluence version of each written row, so a later merge can skip unchanged pages
+        self.versions: Dict[str, int] = {}
+        if config.merge_resource_spreadsheet and (
+            "resource_spreadsheet" in config.requested_output
+        ):
+            self.spreadsheet = ResourceSpreadsheet(config)
+            # New resources get IDs after every existing one
+            config.resource_counter = max(
+                config.resource_counter, self.spreadsheet.get_max_resource_id()
+            )
+
+    def submit(self, page: ConfluencePage):
+        r: Optional[Resource]
+        if self.spreadsheet:
+            r = self.spreadsheet.create_resource(self.config, page)
+            if not r:
+                return
+        else:
+            r = create_resource(self.config, page)
+        future = self.executor.submit(read_page, r, self.config.e3sm_org_cache)
+        self.pending.append((page.url, page.title, page.current_version, r, future))
+        self.write_finished(wait=len(self.pending) > self.max_pending)
+
+    def write_finished(self, wait: bool = False):
+        # Write rows for the longest prefix of pending reads that have finished.
+        # If `wait`, block until at least the oldest pending read finishes.
+        while self.pending and (wait or self.pending[0][4].done()):
+            page_url, page_title, version, r, future = self.pending.popleft()
+            successful_read: bool = future.result()
+            if self.spreadsheet and successful_read:
+                self.spreadsheet.update(r, version)
+            else:
+                write_resource_if_read(
+                    self.config, page_url, page_title, r, successful_read
+                )
+                if successful_read:
+                    self.versions[r.link] = version
+            wait = False
+
+    def close(self):
+        while self.pending:
+            self.write_finished(wait=True)
+        self.executor.shutdown()
+        if self.spreadsheet:
+            self.spreadsheet.write()
+        elif "resource_spreadsheet" in self.config.requested_output:
+            write_atomically(
+                f"{self.config.output_dir}resource_spreadsheet_versions.json",
+                json.dumps(self.versions, indent=2).encode("utf-8"),
+            )
+
+
+class ResourceSpreadsheet(object):
+    """
+    An existing resource_spreadsheet.csv, indexed by link, to merge new results into.
+
+    The Confluence version each row was extracted from is kept alongside, in
+    resource_spreadsheet_versions.json, so unchanged pages don't need to be re-read.
+    """
+
+    def __init__(self, config: Config):
+        self.csv_path: str = f"{config.output_dir}resource_spreadsheet.csv"
+        self.versions_path: str = (
+            f"{config.output_dir}resource_spreadsheet_versions.json"
+        )
+        # Rows in file order; new rows are appended
+        self.rows: List[List[str]] = []
+        self.row_indices: Dict[str, int] = {}  # link -> index in self.rows
+        self.versions: Dict[str, int] = {}  # link -> Confluence version
+        if os.path.exists(self.csv_path):
+            with open(self.csv_path, "r", newline="", encoding="utf-8") as f:
+                for row in csv.reader(f):
+                    if len(row) > LINK_COLUMN:
+                        self.row_indices[row[LINK_COLUMN]] = len(self.rows)
+                    self.rows.append(row)
+        if os.path.exists(self.versions_path):
+            with open(self.versions_path, "r", encoding="utf-8") as f:
+                self.versions = json.load(f)
+        print(f"Merging into {len(self.rows)} existing rows of {self.csv_path}")
+
+    def get_max_resource_id(self) -> int:
+        resource_ids: List[int] = [
+            int(row[RESOURCE_ID_COLUMN])
+            for row in self.rows
+            if row and row[RESOURCE_ID_COLUMN].isdigit()
+        ]
+        return max(resource_ids, default=0)
+
+    def create_resource(
+        self, config: Config, page: ConfluencePage
+    ) -> Optional[Resource]:
+        # Return None if the page is unchanged since its row was written.
+        link: str = map_confluence_to_e3sm(page.url, page.title)
+        if link not in self.row_indices:
+            return create_resource(config, page)
+        if self.versions.get(link) == page.current_version:
+            print("  Resource is unchanged; keeping its existing row.")
+            return None
+        # Keep the existing ID and add date, so the row is updated rather than duplicated
+        row: List[str] = self.rows[self.row_indices[link]]
+        r = Resource(row[RESOURCE_ID_COLUMN])
+        r.link = link
+        if len(row) > DATE_ADDED_COLUMN:
+            r.date_added_to_spreadsheet = row[DATE_ADDED_COLUMN]
+        return r
+
+    def update(self, r: Resource, version: int):
+        if r.link in self.row_indices:
+            self.rows[self.row_indices[r.link]] = r.get_csv_row()
+        else:
+            self.row_indices[r.link] = len(self.rows)
+            self.rows.append(r.get_csv_row())
+        self.versions[r.link] = version
+
+    def write(self):
+        # Write everything at once, so an interrupted run never leaves a half-merged file.
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(self.rows)
+        write_atomically(self.csv_path, buffer.getvalue().encode("utf-8"))
+        write_atomically(
+            self.versions_path, json.dumps(self.versions, indent=2).encode("utf-8")
+        )
+
+
 # Functions: overarching process ##############################################
-def process_resource(config: Config, page: ConfluencePage):
+def process_resource(
+    config: Config,
+    page: ConfluencePage,
+    resource_queue: Optional[ResourceQueue] = None,
+):
+    if resource_queue:
+        resource_queue.submit(page)
+    else:
+        r: Resource = create_resource(config, page)
+        successful_read: bool = read_page(r, config.e3sm_org_cache)
+        write_resource_if_read(config, page.url, page.title, r, successful_read)
+
+
+def create_resource(config: Config, page: ConfluencePage) -> Resource:
     config.resource_counter += 1
     r = Resource(str(config.resource_counter))
     r.link = map_confluence_to_e3sm(page.url, page.title)
-    successful_read: bool = read_page(r)
+    return r
+
+
+def write_resource_if_read(
+    config: Config, page_url: str, page_title: str, r: Resource, successful_read: bool
+):
     if successful_read:
         write_results(config, r)
     else:
         gap = "\n    "  # 4 spaces
         print(
-            f"  Failed to process resource:{gap}page.url={page.url}{gap}page.title={page.title}{gap}r.link={r.link}"
+            f"  Failed to process resource:{gap}page.url={page_url}{gap}page.title={page_title}{gap}r.link={r.link}"
         )
 
 
 # Functions: reading an e3sm.org page #########################################
-def read_page(resource: Resource) -> bool:
+def read_page(resource: Resource, cache: Optional[RevalidationCache] = None) -> bool:
     # Return True if page was read successfully (i.e., the spreadsheet row will be usable).
     # Otherwise, return False.
+    import requests  # type: ignore
+
+    # Imported here, as bs4 is only needed once e3sm.org pages are read
+    from e3sm_comms.page_reviewer.utils_e3sm_org_page import extract_page_info_from_html
+
     e3sm_org_link: str = ""
     if resource.link and resource.link.startswith("https://e3sm.org"):
         e3sm_org_link = resource.link
     if not e3sm_org_link:
         return False
     try:
-        response = requests.get(e3sm_org_link, timeout=10)
-        response.raise_for_status()  # Raises HTTPError for 4xx/5xx responses
-        html_content = response.content
-        soup = BeautifulSoup(html_content, "html.parser")
-        info: Dict[str, Any] = extract_page_info(soup)
+        # Raises HTTPError for 4xx/5xx responses
+        html_content = get_web_page(e3sm_org_link, cache).content
+        info: Dict[str, Any] = extract_page_info_from_html(html_content)
 
         hierarchy_parts: List[str] = info["hierarchy_parts"]
         if hierarchy_parts and hierarchy_parts[-1] == "News":
@@ -177,50 +352,6 @@ def read_page(resource: Resource) -> bool:
         return False
 
 
-def extract_page_info(soup) -> Dict[str, Any]:
-    info: Dict[str, Any] = {
-        "hierarchy_parts": None,
-        "title": None,
-        "publication_date": None,
-        "categories": [],
-        "newsletter_edition": None,
-    }
-
-    # Extract page hierarchy from breadcrumb
-    breadcrumb = soup.find("div", class_="breadcrumb")
-    if breadcrumb:
-        # Get all span texts from breadcrumb links
-        spans = breadcrumb.find_all("span")
-        hierarchy_parts = [span.get_text(strip=True) for span in spans]
-        info["hierarchy_parts"] = hierarchy_parts
-
-    # Extract title
-    title_tag = soup.find("h1", class_="entry-title")
-    if title_tag:
-        info["title"] = title_tag.get_text(strip=True)
-
-    # Extract publication date
-    date_li = soup.find("li", class_="id")
-    if date_li:
-        info["publication_date"] = date_li.get_text(strip=True)
-
-    # Extract categories
-    categories_li = soup.find("li", class_="categories")
-    if categories_li:
-        category_links = categories_li.find_all("a")
-        info["categories"] = [
-            link.get_text(strip=True).lower() for link in category_links
-        ]
-
-    # Extract newsletter edition
-    # Look for links containing "E3SM Floating Points" or similar newsletter text
-    newsletter_link = soup.find("a", href=lambda x: x and "mailchi.mp" in x)
-    if newsletter_link:
-        info["newsletter_edition"] = newsletter_link.get_text(strip=True)
-
-    return info
-
-
 def parse_date(date_str: str) -> Tuple[str, str]:
     """
     Convenience function that returns (yyyymmdd, year).
@@ -0,0 +1,201 @@
+import html
+import re
+from html.entities import name2codepoint
+from typing import Dict, List, Optional, Tuple
+from xml.parsers import expat
+
+from e3sm_comms.page_reviewer.utils_base import METADATA_MARKER, ParsedHTML, split_html
+from e3sm_comms.page_reviewer.utils_confluence_export import (
+    get_resource_url,
+    storage_to_view,
+)
+from e3sm_comms.page_reviewer.utils_newsletter_reviewer import (
+    skip_newsletter_metadata_in_header,
+)
+
+# Elements whose text isn't shown on the page (macro settings, editor hints)
+HIDDEN_ELEMENTS: List[str] = ["ac:parameter", "ac:placeholder"]
+XML_ENTITIES: List[str] = ["amp", "lt", "gt", "quot", "apos"]
+
+
+# Classes #####################################################################
+class StorageFormatParser(object):
+    """
+    Reads a page body in Confluence's storage format (XHTML, plus ac: and ri: macro
+    elements) with expat, in one pass, into the same ParsedHTML fields as the view format:
+    - images: <img>, and <ac:image> of an <ri:attachment> (as its download URL) or <ri:url>
+    - links: <a href>, and <ac:link> to an <ri:url>, <ri:page> or <ri:attachment>
+    - the first table's rows, for extract_confluence_table_to_dict
+    Everything from the element holding METADATA_MARKER onwards goes to `metadata`, as in split_html.
+    With skip_before_hr, everything before the first <hr> is skipped, as in
+    skip_newsletter_metadata_in_header, wherever that <hr> is nested.
+    """
+
+    def __init__(self, page_id: str, skip_before_hr: bool = False):
+        self.page_id: str = page_id
+        self.skip_before_hr: bool = skip_before_hr
+        self.main: ParsedHTML = ParsedHTML()
+        self.metadata: Optional[ParsedHTML] = None
+        self.current: ParsedHTML = self.main
+        # Byte offset of the element holding METADATA_MARKER (-1 if none)
+        self.split_at: int = -1
+        self.text_parts: List[str] = []
+        self.depth: int = 0
+        self.hidden_depth: int = 0  # Number of open HIDDEN_ELEMENTS
+        # Open <p> and <h3> elements: (tag, depth, text so far)
+        self.captures: List[Tuple[str, int, List[str]]] = []
+        # Open <ac:image> and <ac:link> elements: (tag, depth)
+        self.macros: List[Tuple[str, int]] = []
+        # The first table, while it's read: open table depth, current row and cell
+        self.table_depth: int = 0
+        self.row: Optional[List[str]] = None
+        self.cell: Optional[List[str]] = None
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self.start_element
+        self.parser.EndElementHandler = self.end_element
+        self.parser.CharacterDataHandler = self.character_data
+
+    def parse(self, raw_xml: str) -> Tuple[ParsedHTML, Optional[ParsedHTML]]:
+        # The body has several top-level elements, and HTML entities, so isn't XML as is
+        document: str = f"<body>{replace_html_entities(raw_xml)}</body>"
+        # Bodies without an <hr> are read whole
+        self.skipping: bool = self.skip_before_hr and bool(
+            re.search(r"<hr\b", document, flags=re.IGNORECASE)
+        )
+        marker_index: int = document.find(METADATA_MARKER)
+        if marker_index != -1:
+            self.split_at = len(
+                document[: document.rfind("<", 0, marker_index)].encode()
+            )
+        self.parser.Parse(document.encode(), True)
+        self.finish(self.current)
+        return self.main, self.metadata
+
+    def check_split(self):
+        if self.split_at != -1 and self.parser.CurrentByteIndex >= self.split_at:
+            self.split_at = -1
+            # Open paragraphs end here, as split_html cuts the HTML here
+            while self.captures:
+                self.end_capture()
+            self.finish(self.main)
+            self.metadata = self.current = ParsedHTML()
+            self.text_parts = []
+            self.table_depth = 0
+            self.row = self.cell = None
+
+    def start_element(self, tag: str, attrs: Dict[str, str]):
+        self.check_split()
+        self.depth += 1
+        current: ParsedHTML = self.current
+        if tag in HIDDEN_ELEMENTS:
+            self.hidden_depth += 1
+        elif self.skipping:
+            self.skipping = tag.lower() != "hr"
+        elif tag in ["p", "h3"]:
+            self.captures.append((tag, self.depth, []))
+        elif tag == "a" and attrs.get("href"):
+            current.links.append(attrs["href"])
+        elif tag == "img" and attrs.get("src"):
+            current.img_srcs.append(attrs["src"])
+        elif tag in ["ac:image", "ac:link"]:
+            self.macros.append((tag, self.depth))
+        elif (
+            tag.startswith("ri:")
+            and self.macros
+            and self.macros[-1][1] == self.depth - 1
+        ):
+            # The macro's resource (not, e.g., the page an attachment is on)
+            url: str = get_resource_url(tag, attrs, self.page_id)
+            if url and self.macros[-1][0] == "ac:image":
+                current.img_srcs.append(url)
+            elif url:
+                current.links.append(url)
+        elif tag == "table" and not current.table and not self.table_depth:
+            self.table_depth = self.depth
+        elif tag == "tr" and self.table_depth:
+            self.row = []
+        elif tag in ["th", "td"] and self.row is not None:
+            self.cell = []
+
+    def end_element(self, tag: str):
+        current: ParsedHTML = self.current
+        if tag in HIDDEN_ELEMENTS:
+            self.hidden_depth -= 1
+        elif self.captures and self.captures[-1][1] == self.depth:
+            self.end_capture()
+        elif tag in ["ac:image", "ac:link"] and self.macros:
+            self.macros.pop()
+        elif tag in ["th", "td"] and self.row is not None and self.cell is not None:
+            # As BeautifulSoup's stripped_strings
+            self.row.append(" ".join(s.strip() for s in self.cell if s.strip()))
+            self.cell = None
+        elif tag == "tr" and self.row is not None:
+            if len(self.row) >= 2:
+                current.table.setdefault(self.row[0], self.row[1])
+            self.row = None
+        elif tag == "table" and self.table_depth == self.depth:
+            self.table_depth = 0
+        self.depth -= 1
+        self.check_split()
+
+    def character_data(self, data: str):
+        # The split is always at an element, so it's checked for those only
+        if self.hidden_depth or self.skipping:
+            return
+        self.text_parts.append(data)
+        for _, _, parts in self.captures:
+            parts.append(data)
+        if self.cell is not None:
+            self.cell.append(data)
+
+    def end_capture(self):
+        tag, _, parts = self.captures.pop()
+        if tag == "p":
+            self.current.paragraphs.append("".join(parts))
+        else:
+            self.current.headers.append("".join(parts))
+
+    def finish(self, parsed: ParsedHTML):
+        parsed.text = html.unescape("".join(self.text_parts))
+        parsed.text_lowercase = parsed.text.lower()
+        parsed.num_imgs = len(parsed.img_srcs)
+
+
+# Functions ###################################################################
+def split_storage_format(
+    raw_xml: str,
+    page_id: str,
+    skip_before_hr: bool = False,
+    warnings: Optional[List[str]] = None,
+) -> Tuple[ParsedHTML, Optional[ParsedHTML]]:
+    # As split_html, for a body in storage format.
+    # Bodies that aren't well-formed are converted to the view format and parsed as HTML.
+    # The warning is added to `warnings` if given (e.g., in a worker process), or printed.
+    try:
+        return StorageFormatParser(page_id, skip_before_hr).parse(raw_xml)
+    except expat.ExpatError as e:
+        warning: str = (
+            f"Warning: page_id={page_id} body isn't well-formed storage format ({e}), so it was parsed as HTML."
+        )
+        if warnings is None:
+            print(warning)
+        else:
+            warnings.append(warning)
+    raw_html: str = storage_to_view(raw_xml, page_id)
+    if skip_before_hr:
+        raw_html = skip_newsletter_metadata_in_header(raw_html)
+    return split_html(raw_html)
+
+
+def replace_html_entities(raw_xml: str) -> str:
+    # XML only defines XML_ENTITIES, so write the others (e.g., &nbsp;) as character references
+    def replace(match: re.Match) -> str:
+        name: str = match.group(1)
+        if name in XML_ENTITIES:
+            return match.group(0)
+        if name in name2codepoint:
+            return f"&#{name2codepoint[name]};"
+        return f"&amp;{name};"
+
+    return re.sub(r"&([A-Za-z][A-Za-z0-9]*);", replace, raw_xml)
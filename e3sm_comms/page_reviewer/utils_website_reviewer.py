@@ -5,6 +5,9 @@ from e3sm_comms.page_reviewer.utils_base import Config, ConfluencePage, ParsedHT
 
 # These functions are only called in website_reviewer mode ####################
 def extract_confluence_table_to_dict(parsed_html: ParsedHTML) -> Dict[str, str]:
+    if parsed_html.soup is None:
+        # Parsed from storage format, where the table was read while parsing
+        return dict(parsed_html.table)
     table = parsed_html.soup.find("table", class_="confluenceTable")
     result: Dict[str, str] = {}
     if not table:
@@ -30,15 +33,15 @@ def write_results(config: Config, page: ConfluencePage):
 
     if "sensitive_terms" in config.requested_output:
         # Append if sensitive terms were found.
-        if page.main_html and page.main_html.sensitive_terms:
+        if page.findings and page.findings.sensitive_terms:
             with open(
                 f"{config.output_dir}sensitive_terms.txt", "a", encoding="utf-8"
             ) as f:
-                f.write(f"{line_id} -- {page.main_html.sensitive_terms}\n")
+                f.write(f"{line_id} -- {page.findings.sensitive_terms}\n")
 
     if "missing_metadata" in config.requested_output:
         # Append if there is no metadata table.
-        if not page.metadata_html:
+        if not page.has_metadata:
             with open(
                 f"{config.output_dir}missing_metadata.txt", "a", encoding="utf-8"
             ) as f:
@@ -51,3 +54,15 @@ def write_results(config: Config, page: ConfluencePage):
                 f"{config.output_dir}need_to_sync_wordpress.txt", "a", encoding="utf-8"
             ) as f:
                 f.write(line_id + "\n")
+
+
+def write_repeat(config: Config, page: ConfluencePage):
+    # For a page reached again (e.g., a top-level page that is also under another one),
+    # whose results and child pages are already listed
+    if "hierarchical_outline" in config.requested_output:
+        with open(
+            f"{config.output_dir}hierarchical_outline.txt", "a", encoding="utf-8"
+        ) as f:
+            f.write(
+                f"{page.depth * "  "}{page.page_id}: {page.title} -- Repeat, listed above\n"
+            )
@@ -1,9 +1,20 @@
+import argparse
+
 from e3sm_comms.page_reviewer.confluence_page_reviewer import run
 from e3sm_comms.page_reviewer.utils_base import Config
 from e3sm_comms.utils import IO_DIR
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Approximate the resource spreadsheet from Confluence pages."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted run from output_dir/crawl_journal.jsonl",
+    )
+    args = parser.parse_args()
     c = Config("resource")
     c.file_input_confluence_paths = (
         f"{IO_DIR}/input/resource_reviewer/resource_top_levels.txt"
@@ -12,5 +23,6 @@ def main():
     c.requested_output = ["resource_spreadsheet"]
     c.check_links_work = False
     c.scan_links_for_sensitive_terms = False
+    c.resume = args.resume
     c.read_input()
     run(c)
@@ -1,9 +1,27 @@
+import argparse
+
 from e3sm_comms.page_reviewer.confluence_page_reviewer import run
 from e3sm_comms.page_reviewer.utils_base import Config
 from e3sm_comms.utils import IO_DIR
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Review the website's Confluence pages."
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted run from output_dir/crawl_journal.jsonl",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        default=0,
+        metavar="SECONDS",
+        help="after the run, re-review pages modified since the last check, every SECONDS",
+    )
+    args = parser.parse_args()
     c = Config("website")
     c.file_input_confluence_paths = (
         f"{IO_DIR}/input/website_reviewer/confluence_top_level_tabs_20260109.txt"
@@ -19,5 +37,7 @@ def main():
     ]
     c.check_links_work = False
     c.scan_links_for_sensitive_terms = False
+    c.resume = args.resume
+    c.watch_interval_seconds = args.watch
     c.read_input()
     run(c)